@@ -26,6 +26,10 @@ setup(
     install_requires=[
         'requests>=2.31',
     ],
+    extras_require={
+        'fast': ['orjson'],
+        'numpy': ['numpy'],
+    },
     packages=find_packages(),
     include_package_data=False,
     keywords=['naif', 'webgeocalc', 'api'],
@@ -1,14 +1,18 @@
 """Test WGC API base urls."""
 
+import asyncio
 import os
 
 from pytest import fixture, raises
 
 from requests import HTTPError
 
-from webgeocalc import API, Api, ESA_API, JPL_API
-from webgeocalc.errors import (APIError, APIResponseError, KernelSetNotFound,
-                               ResultAttributeError, TooManyKernelSets)
+from webgeocalc import API, Api, AsyncApi, ESA_API, JPL_API
+from webgeocalc.cache import MetadataCache
+from webgeocalc.errors import (APIError, APIResponseError, ItemNotFound,
+                               KernelSetNotFound, ResultAttributeError, TooManyItems,
+                               TooManyKernelSets)
+from webgeocalc.phase import Phase
 from webgeocalc.vars import ESA_URL, JPL_URL
 
 
@@ -257,6 +261,9 @@ def test_api_read_queued(api_queued):
     """Test queued position output from API."""
     _, phase = API.read(api_queued)
     assert phase == 'QUEUED | POSITION: 6'
+    assert phase.phase is Phase.QUEUED
+    assert phase.position == 6
+    assert phase.progress is None
 
 
 def test_api_read_error(api_error):
@@ -269,3 +276,224 @@ def test_api_read_invalid(api_empty_data_response):
     """Test error if response no valid data."""
     with raises(APIResponseError):
         API.read(api_empty_data_response)
+
+
+def test_api_session(requests_mock, api_queued):
+    """Test API pooled session re-use."""
+    api = Api('https://wgc.obspm.fr/webgeocalc/api', pool_size=4)
+
+    session = api.session
+    assert session is api.session
+
+    adapter = session.get_adapter(api.url)
+    assert adapter._pool_connections == 4  # pylint: disable=protected-access
+    assert adapter._pool_maxsize == 4      # pylint: disable=protected-access
+
+    requests_mock.post(api.url + '/calculation/new', json=api_queued)
+    requests_mock.get(api.url + '/calculation/' + api_queued['calculationId'],
+                      json=api_queued)
+
+    assert api.new_calculation({})[0] == api_queued['calculationId']
+    assert api.phase_calculation(api_queued['calculationId'])[0] == \
+        api_queued['calculationId']
+
+    with api:
+        assert api.session is session
+
+    assert api._session is None  # pylint: disable=protected-access
+    assert api.session is not session
+
+
+def test_async_api(requests_mock, solar_system_kernel_set, cassini_kernel_set,
+                   cassini_body, cassini_frame, cassini_instrument, api_queued):
+    """Test asynchronous API requests."""
+    api = AsyncApi('https://wgc.obspm.fr/webgeocalc/api')
+    url = api.api.url
+
+    assert str(api) == url
+    assert repr(api) == f'<AsyncApi> {url}'
+    assert AsyncApi(JPL_API).api is JPL_API
+
+    def items(result_type, *items):
+        return {'status': 'OK', 'resultType': result_type, 'items': list(items)}
+
+    calc_id = api_queued['calculationId']
+    results = {'status': 'OK', 'calculationId': calc_id,
+               'columns': [{'name': 'UTC calendar date', 'outputID': 'DATE'}],
+               'rows': [['2000-01-01 00:00:00.000000 UTC']]}
+
+    requests_mock.get(url + '/', json={'version': '2.8.2'})
+    requests_mock.get(url + '/kernel-sets', json=items(
+        'KernelSetDetails', solar_system_kernel_set, cassini_kernel_set))
+    requests_mock.get(url + '/kernel-set/5/bodies',
+                      json=items('BodyData', cassini_body))
+    requests_mock.get(url + '/kernel-set/5/frames',
+                      json=items('FrameData', cassini_frame))
+    requests_mock.get(url + '/kernel-set/5/instruments',
+                      json=items('InstrumentData', cassini_instrument))
+    requests_mock.post(url + '/calculation/new', json=api_queued)
+    requests_mock.get(url + f'/calculation/{calc_id}', json=api_queued)
+    requests_mock.get(url + f'/calculation/{calc_id}/cancel', json=api_queued)
+    requests_mock.get(url + f'/calculation/{calc_id}/results', json=results)
+
+    async def requests():
+        return await asyncio.gather(
+            api.metadata(),
+            api.kernel_sets(),
+            api.kernel_set('Cassini'),
+            api.bodies(5),
+            api.frames(5),
+            api.instruments(5),
+            api.body(5, 'CASSINI'),
+            api.frame(5, 'KSO'),
+            api.instrument(5, -82898),
+            api.new_calculation({}),
+            api.phase_calculation(calc_id),
+            api.cancel_calculation(calc_id),
+            api.results_calculation(calc_id),
+        )
+
+    out = asyncio.run(requests())
+
+    assert out[0]['version'] == '2.8.2'
+    assert len(out[1]) == 2
+    assert int(out[2]) == 5
+    assert str(out[3][0]) == cassini_body['name']
+    assert str(out[4][0]) == cassini_frame['name']
+    assert str(out[5][0]) == cassini_instrument['name']
+    assert int(out[6]) == cassini_body['id']
+    assert int(out[7]) == cassini_frame['id']
+    assert int(out[8]) == cassini_instrument['id']
+    assert out[9] == out[10] == out[11] == (calc_id, 'QUEUED | POSITION: 6')
+    assert str(out[12][0][0]) == 'UTC calendar date'
+    assert out[12][1] == results['rows']
+
+
+def test_api_disk_cache(requests_mock, tmp_path, monkeypatch,
+                        cassini_kernel_set, cassini_body):
+    """Test API metadata and catalogs disk cache."""
+    url = 'https://wgc.obspm.fr/webgeocalc/api'
+
+    meta = requests_mock.get(url + '/', json={'version': '2.8.2', 'build_id': '1'})
+    kernel_sets = requests_mock.get(url + '/kernel-sets', json={
+        'status': 'OK', 'resultType': 'KernelSetDetails', 'items': [cassini_kernel_set]})
+    bodies = requests_mock.get(url + '/kernel-set/5/bodies', json={
+        'status': 'OK', 'resultType': 'BodyData', 'items': [cassini_body]})
+
+    monkeypatch.setenv('WGC_CACHE_DIR', str(tmp_path))
+    api = Api(url)
+
+    assert isinstance(api.cache, MetadataCache)
+    assert repr(api.cache) == f'<MetadataCache> {tmp_path}'
+
+    assert int(api.kernel_set('Cassini')) == 5
+    assert str(api.bodies('Cassini')[0]) == 'CASSINI'
+    assert str(api.bodies(5)[0]) == 'CASSINI'
+    assert (meta.call_count, kernel_sets.call_count, bodies.call_count) == (1, 1, 1)
+
+    # New API object (eg. new process) with the same cache
+    api = Api(url, cache=str(tmp_path))
+    assert str(api.bodies('Cassini')[0]) == 'CASSINI'
+    assert api['version'] == '2.8.2'
+    assert (meta.call_count, kernel_sets.call_count, bodies.call_count) == (1, 1, 1)
+
+    # Expired API metadata with the same version
+    api = Api(url, cache=MetadataCache(tmp_path, version_ttl=-1))
+    assert str(api.bodies(5)[0]) == 'CASSINI'
+    assert (meta.call_count, kernel_sets.call_count, bodies.call_count) == (2, 1, 1)
+
+    # Explicit refresh
+    api.refresh()
+    assert str(api.bodies(5)[0]) == 'CASSINI'
+    assert (meta.call_count, kernel_sets.call_count, bodies.call_count) == (3, 1, 2)
+
+    # New server version
+    requests_mock.get(url + '/', json={'version': '2.8.3', 'build_id': '1'})
+    api = Api(url, cache=MetadataCache(tmp_path, version_ttl=-1))
+    assert str(api.bodies(5)[0]) == 'CASSINI'
+    assert api['version'] == '2.8.3'
+    assert (kernel_sets.call_count, bodies.call_count) == (1, 3)
+
+    # Expired catalogs
+    api = Api(url, cache=MetadataCache(tmp_path, ttl=-1))
+    assert str(api.bodies(5)[0]) == 'CASSINI'
+    assert (kernel_sets.call_count, bodies.call_count) == (1, 4)
+
+    # In memory cache only
+    monkeypatch.delenv('WGC_CACHE_DIR')
+    api = Api(url)
+    assert api.cache is None
+    api.refresh()
+
+    assert str(api.bodies(5)[0]) == 'CASSINI'
+    assert str(api.bodies(5)[0]) == 'CASSINI'
+    assert bodies.call_count == 5
+
+    api.cache = MetadataCache(tmp_path)
+    api.cache.clear()
+    assert not list(tmp_path.glob('**/*.json'))
+
+
+def test_api_index(requests_mock, solar_system_kernel_set, cassini_kernel_set,
+                   cassini_body, cassini_frame, cassini_instrument):
+    """Test API indexed kernel sets, bodies, frames and instruments lookup."""
+    url = 'https://wgc.obspm.fr/webgeocalc/api'
+
+    def items(result_type, *items):
+        return {'status': 'OK', 'resultType': result_type, 'items': list(items)}
+
+    cassini_archive = dict(cassini_kernel_set, caption='Cassini Huygens archive',
+                           kernelSetId='6')
+    huygens = {'id': -150, 'name': 'CASSINI_HUYGENS'}
+
+    kernel_sets = requests_mock.get(url + '/kernel-sets', json=items(
+        'KernelSetDetails', solar_system_kernel_set, cassini_kernel_set, cassini_archive))
+    bodies = requests_mock.get(url + '/kernel-set/5/bodies', json=items(
+        'BodyData', cassini_body, huygens))
+    requests_mock.get(url + '/kernel-set/5/frames', json=items(
+        'FrameData', cassini_frame))
+    requests_mock.get(url + '/kernel-set/5/instruments', json=items(
+        'InstrumentData', cassini_instrument))
+
+    api = Api(url)
+
+    # Exact name takes precedence over the partial matches
+    assert int(api.kernel_set('Cassini Huygens')) == 5
+    assert int(api.kernel_set('cassini huygens')) == 5
+    assert int(api.kernel_set('archive')) == 6
+    assert int(api.kernel_set(1)) == 1
+    assert api.kernel_set_id('Solar') == 1
+
+    with raises(TooManyKernelSets):
+        _ = api.kernel_set('Cassini')
+
+    with raises(KernelSetNotFound):
+        _ = api.kernel_set('Pluto')
+
+    assert int(api.body('Cassini Huygens', 'CASSINI')) == -82
+    assert int(api.body(5, 'huygens')) == -150
+    assert int(api.body(5, -82)) == -82
+    assert int(api.frame(5, 'CASSINI_KSO')) == -82905
+    assert int(api.instrument(5, 'cirs')) == -82898
+
+    with raises(TooManyItems) as err:
+        _ = api.body(5, 'CASS')
+    assert str(err.value) == ("Too many bodies contains 'CASS' in their names:\n"
+                              " - CASSINI\n - CASSINI_HUYGENS")
+
+    with raises(ItemNotFound) as err:
+        _ = api.frame(5, 'IAU_TITAN')
+    assert str(err.value) == "Frame 'IAU_TITAN' not found"
+
+    with raises(ValueError):
+        _ = api.index('spacecrafts', 5)
+
+    # The indexes are built once and reset with the catalogs
+    index = api.index('bodies', 5)
+    assert api.index('bodies', 'Cassini Huygens') is index
+    assert len(index) == 2
+    assert (kernel_sets.call_count, bodies.call_count) == (1, 1)
+
+    api.refresh()
+    assert api.index('bodies', 5) is not index
+    assert (kernel_sets.call_count, bodies.call_count) == (1, 2)
@@ -0,0 +1,166 @@
+"""Test WGC batch of calculations."""
+
+from pytest import fixture, raises
+
+from webgeocalc import Api, StateVector, batch_timings, run_as_completed, run_many
+from webgeocalc.breaker import CircuitBreaker
+from webgeocalc.errors import (APIError, APIResponseError, CalculationFailed,
+                               CalculationTimeOut, CircuitOpen)
+from webgeocalc.poller import Poller
+from webgeocalc.vars import JPL_URL
+
+
+@fixture
+def results():
+    """Results expected from the API."""
+    return {
+        "status": "OK",
+        "message": "The operation was successful.",
+        "columns": [
+            {
+                "name": "UTC calendar date",
+                "type": "DATE",
+                "outputID": "DATE",
+                "units": ""
+            },
+            {
+                "name": "Distance (km)",
+                "type": "NUMBER",
+                "outputID": "DISTANCE",
+                "units": "km"
+            },
+        ],
+        "rows": [
+            [
+                "2012-10-19 08:24:00.000000 UTC",
+                967899.52452788,
+            ],
+        ]
+    }
+
+
+@fixture
+def mock_api(requests_mock, results):
+    """Mock API phases based on the calculation target."""
+    phases = {
+        'ENCELADUS': 'COMPLETE',
+        'TITAN': 'FAILED',
+        'MIMAS': 'LOADING_KERNELS',
+        'RHEA': 'STARTING',
+    }
+
+    def phase(calculation_id):
+        if calculation_id not in phases:
+            return {"status": "ERROR", "error": {"shortDescription": "Unknown target"}}
+        return {
+            "status": "OK",
+            "calculationId": calculation_id,
+            "result": {"phase": phases[calculation_id]},
+        }
+
+    requests_mock.post(JPL_URL + '/calculation/new',
+                       json=lambda request, _: phase(request.json()['target']))
+
+    for target in phases:
+        requests_mock.get(JPL_URL + f'/calculation/{target}', json=phase(target))
+        requests_mock.get(JPL_URL + f'/calculation/{target}/results', json=results)
+
+    return requests_mock
+
+
+def calcs(*targets, api=''):
+    """List of state vector calculations."""
+    return [
+        StateVector(
+            api=api,
+            kernels=5,
+            times='2012-10-19T08:24:00.000',
+            target=target,
+            observer='CASSINI',
+            reference_frame='CASSINI_ISS_NAC',
+            verbose=False,
+        ) for target in targets
+    ]
+
+
+def test_run_many(mock_api):  # pylint: disable=unused-argument
+    """Test batch run in input order."""
+    out = run_many(calcs('TITAN', 'ENCELADUS', 'MIMAS', 'DIONE'),
+                   max_in_flight=2, timeout=0.01, poller=Poller(interval=0.005))
+
+    assert isinstance(out[0], CalculationFailed)
+    assert out[1]['DATE'] == '2012-10-19 08:24:00.000000 UTC'
+    assert isinstance(out[2], CalculationTimeOut)
+    assert isinstance(out[3], APIError)
+
+    for max_in_flight in (0, -1):
+        with raises(ValueError):
+            _ = run_many(calcs('ENCELADUS'), max_in_flight=max_in_flight)
+
+    with raises(ValueError):
+        _ = list(run_as_completed(calcs('ENCELADUS'), max_in_flight=0))
+
+
+def test_run_as_completed(mock_api):  # pylint: disable=unused-argument
+    """Test batch run as completed."""
+    batch = calcs('ENCELADUS', 'TITAN', 'ENCELADUS')
+    out = list(run_as_completed(iter(batch), max_in_flight=3))
+
+    assert len(out) == 3
+
+    for calc, res in out:
+        assert calc.id in ('ENCELADUS', 'TITAN')
+
+        if calc.id == 'TITAN':
+            assert isinstance(res, CalculationFailed)
+        else:
+            assert res['DISTANCE'] == 967899.52452788
+
+
+def test_batch_timings(mock_api):  # pylint: disable=unused-argument
+    """Test batch timings aggregation."""
+    batch = calcs('ENCELADUS', 'ENCELADUS', 'TITAN')
+    run_many(batch, max_in_flight=3)
+
+    timings = batch_timings(batch)
+
+    assert list(timings) == ['submit', 'queued', 'starting', 'loading_kernels',
+                             'calculating', 'download', 'parse']
+
+    assert timings['submit']['total'] == sum(c.timings['submit'] for c in batch)
+    assert timings['submit']['max'] == max(c.timings['submit'] for c in batch)
+    assert timings['submit']['mean'] == timings['submit']['total'] / 3
+    assert timings['download']['total'] == sum(c.timings['download'] for c in batch[:2])
+    assert timings['queued'] == {'total': 0, 'mean': 0, 'max': 0}
+
+    assert batch_timings(calcs('MIMAS'))['submit'] == {
+        'total': 0, 'mean': None, 'max': None}
+
+
+def test_run_many_circuit_open(mock_api):  # pylint: disable=unused-argument
+    """Test batch submissions paused while the API circuit is open."""
+    api = Api(JPL_URL, breaker=CircuitBreaker(failures=1, reset_timeout=0.05))
+    api.breaker.failure()
+
+    out = run_many(calcs('ENCELADUS', 'ENCELADUS', api=api),
+                   poller=Poller(interval=0.005))
+
+    assert out[0]['DATE'] == out[1]['DATE'] == '2012-10-19 08:24:00.000000 UTC'
+
+    # Outage longer than the calculations time out
+    api.breaker = CircuitBreaker(failures=1, reset_timeout=10)
+    api.breaker.failure()
+
+    out = run_many(calcs('ENCELADUS', 'ENCELADUS', api=api), timeout=0.05)
+
+    assert all(isinstance(res, CircuitOpen) for res in out)
+
+
+def test_run_many_unexpected_response(mock_api):
+    """Test batch with an unexpected phase response."""
+    mock_api.get(JPL_URL + '/calculation/RHEA', json={'status': 'OK', 'weird': 1})
+
+    out = run_many(calcs('RHEA', 'ENCELADUS'), timeout=1, poller=Poller(interval=0.005))
+
+    assert isinstance(out[0], APIResponseError)
+    assert out[1]['DATE'] == '2012-10-19 08:24:00.000000 UTC'
@@ -0,0 +1,120 @@
+"""Test WGC API circuit breaker."""
+
+import time
+
+from pytest import raises
+
+from requests.exceptions import ConnectionError as RequestsConnectionError, HTTPError
+from requests.models import Response
+
+from webgeocalc import Api
+from webgeocalc.breaker import CircuitBreaker, server_failure
+from webgeocalc.errors import CircuitOpen
+
+
+def http_error(status):
+    """HTTP error with a response status code."""
+    response = Response()
+    response.status_code = status
+    return HTTPError(response=response)
+
+
+def test_server_failure():
+    """Test server failures classification."""
+    assert server_failure(RequestsConnectionError())
+    assert server_failure(http_error(503))
+    assert server_failure(http_error(429))
+    assert server_failure(HTTPError())
+    assert not server_failure(http_error(404))
+    assert not server_failure(ValueError())
+
+
+def test_circuit_breaker():
+    """Test circuit breaker states."""
+    with raises(ValueError):
+        _ = CircuitBreaker(failures=0)
+
+    breaker = CircuitBreaker(failures=2, reset_timeout=0.05)
+    assert repr(breaker) == '<CircuitBreaker> closed (0/2 failures)'
+    assert breaker.retry_in == 0
+
+    breaker.failure()
+    breaker.allow()
+    assert breaker.state == 'closed'
+
+    breaker.failure()
+    assert breaker.state == 'open'
+    assert 0 < breaker.retry_in <= 0.05
+
+    with raises(CircuitOpen) as err:
+        breaker.allow('https://wgc.test/api')
+
+    assert err.value.url == 'https://wgc.test/api'
+    assert 0 < err.value.retry_in <= 0.05
+
+    # Half-open: a single probe
+    time.sleep(0.06)
+    assert breaker.state == 'half-open'
+    breaker.allow()
+
+    with raises(CircuitOpen):
+        breaker.allow()
+
+    # Failed probe
+    breaker.failure()
+    assert breaker.state == 'open'
+
+    # Successful probe
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.success()
+    assert breaker.state == 'closed'
+    assert breaker.consecutive == 0
+
+    breaker.failure()
+    breaker.reset()
+    assert breaker.consecutive == 0
+
+
+def test_api_breaker(requests_mock):
+    """Test API requests with a circuit breaker."""
+    assert Api().breaker is None
+    assert Api(breaker=True).breaker.failures == 5
+
+    breaker = CircuitBreaker(failures=2, reset_timeout=0.05)
+    assert Api(breaker=breaker).breaker is breaker
+
+    api = Api('https://wgc.test/api', retry=False, breaker=2)
+    api.breaker.reset_timeout = 0.05
+    url = api.url + '/kernel-sets'
+
+    # Client errors do not open the circuit
+    requests_mock.get(url, status_code=404)
+    for _ in range(3):
+        with raises(HTTPError):
+            api.kernel_sets()
+
+    assert api.breaker.state == 'closed'
+
+    # Server failures
+    requests_mock.get(url, status_code=503)
+    for _ in range(2):
+        with raises(HTTPError):
+            api.kernel_sets()
+
+    assert api.breaker.state == 'open'
+    assert requests_mock.call_count == 5
+
+    # Fail fast
+    with raises(CircuitOpen):
+        api.kernel_sets()
+
+    assert requests_mock.call_count == 5
+
+    # Successful probe
+    requests_mock.get(url, json={'status': 'OK', 'resultType': 'KernelSetDetails',
+                                 'items': []})
+    time.sleep(0.06)
+
+    assert api.kernel_sets() == []
+    assert api.breaker.state == 'closed'
@@ -0,0 +1,141 @@
+"""Test WGC calculation results cache."""
+
+from pytest import fixture
+
+from webgeocalc import StateVector
+from webgeocalc.cache import RESULTS_CACHE, ResultsCache, payload_key
+from webgeocalc.vars import JPL_URL
+
+
+@fixture
+def calc_id():
+    """Calculation id."""
+    return '5d009079-aa9e-4fbd-93c3-58b5a4990a68'
+
+
+@fixture
+def response(calc_id):
+    """Complete calculation response."""
+    return {
+        "status": "OK",
+        "calculationId": calc_id,
+        "result": {"phase": "COMPLETE"},
+    }
+
+
+@fixture
+def results(calc_id):
+    """Results expected from the API."""
+    return {
+        "status": "OK",
+        "calculationId": calc_id,
+        "columns": [
+            {"name": "UTC calendar date", "type": "DATE",
+             "outputID": "DATE", "units": ""},
+            {"name": "Distance (km)", "type": "NUMBER",
+             "outputID": "DISTANCE", "units": "km"},
+        ],
+        "rows": [["2012-10-19 08:24:00.000000 UTC", 967899.52452788]],
+    }
+
+
+def state_vector(**kwargs):
+    """State vector calculation."""
+    return StateVector(
+        kernels=5,
+        times='2012-10-19T08:24:00.000',
+        target='ENCELADUS',
+        observer='CASSINI',
+        reference_frame='CASSINI_ISS_NAC',
+        **kwargs,
+    )
+
+
+def test_payload_key():
+    """Test canonical payload key."""
+    key = payload_key(JPL_URL, {'a': 1, 'b': [1, 2]})
+
+    assert len(key) == 64
+    assert key == payload_key(JPL_URL, {'b': [1, 2], 'a': 1})
+    assert key != payload_key('https://wgc.obspm.fr/webgeocalc/api',
+                              {'a': 1, 'b': [1, 2]})
+    assert key != payload_key(JPL_URL, {'a': 1, 'b': [2, 1]})
+
+
+def test_results_cache_lru():
+    """Test results cache LRU eviction."""
+    cache = ResultsCache(maxsize=5)
+
+    cache.set('a', [{'name': 'A'}, {'name': 'B'}], [[1, 2]])
+    cache.set('b', [{'name': 'A'}, {'name': 'B'}], [[3, 4]])
+    cache.set('a', [{'name': 'A'}, {'name': 'B'}], [[1, 2]])
+
+    assert repr(cache) == '<ResultsCache> 2 results (4/5 values)'
+    assert cache.get('a') == ([{'name': 'A'}, {'name': 'B'}], [[1, 2]])
+
+    # `b` is the least recently used
+    cache.set('c', [{'name': 'A'}, {'name': 'B'}], [[5, 6]])
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert len(cache) == 2
+
+    # Too large to be cached in memory
+    cache.set('d', [{'name': 'A'}], [[1]] * 6)
+    assert 'd' not in cache
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_results_cache_disk(tmp_path):
+    """Test results cache disk tier."""
+    cache = ResultsCache(directory=tmp_path / 'wgc')
+    cache.set('a', [{'name': 'A'}], [[1]])
+
+    assert (tmp_path / 'wgc' / 'a.json').exists()
+
+    # New cache with the same directory
+    cache = ResultsCache(directory=tmp_path / 'wgc')
+    assert len(cache) == 0
+    assert 'a' in cache
+    assert cache.get('a') == ([{'name': 'A'}], [[1]])
+    assert len(cache) == 1
+
+    cache.clear()
+    assert 'a' not in cache
+    assert not list((tmp_path / 'wgc').glob('*.json'))
+
+
+def test_calculation_cache(requests_mock, calc_id, response, results):
+    """Test calculation results served from the cache."""
+    new = requests_mock.post(JPL_URL + '/calculation/new', json=response)
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}/results', json=results)
+
+    cache = ResultsCache()
+
+    # No cache by default
+    calc = state_vector()
+    assert calc.cache is None
+    assert state_vector(cache=True).cache is RESULTS_CACHE
+
+    calc = state_vector(cache=cache)
+    out = calc.run()
+
+    assert new.call_count == 1
+    assert calc.cache_key in cache
+
+    calc = state_vector(cache=cache)
+    assert calc.results == out
+    assert calc.phase == 'COMPLETE'
+
+    calc = state_vector(cache=cache)
+    assert calc.run() == out
+    assert calc.id is None
+    assert new.call_count == 1
+    assert requests_mock.call_count == 2
+
+    assert state_vector(cache=cache).watch().result(timeout=5) == out
+    assert requests_mock.call_count == 2
@@ -1,10 +1,12 @@
 """Test WGC calculation setup."""
 
+import threading
+
 from pytest import fixture, raises
 
 from webgeocalc import Calculation
 from webgeocalc.api import API
-from webgeocalc.calculation import APIs
+from webgeocalc.calculation import APIs, get_api
 from webgeocalc.errors import (CalculationConflictAttr,
                                CalculationIncompatibleAttr,
                                CalculationInvalidAttr, CalculationRequiredAttr,
@@ -102,6 +104,27 @@ def test_calculation_apis_cache(params):
     assert len(APIs) == 4
 
 
+def test_calculation_get_api():
+    """Test shared API objects created once per URL by concurrent threads."""
+    url = 'https://wgc.test/webgeocalc/api'
+    apis = []
+
+    threads = [threading.Thread(target=lambda: apis.append(get_api(url)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(apis) == 8
+    assert all(api is apis[0] for api in apis)
+    assert APIs[url.upper()] is apis[0]
+    assert get_api(API) is API
+    assert get_api('JPL') is APIs['JPL']
+
+    del APIs[url.upper()]
+
+
 def test_calculation_required_err(calc, kernels):
     """Test error if calculation has missing required attributes."""
     with raises(CalculationRequiredAttr):
@@ -1,11 +1,14 @@
 """Test WGC calculation runs."""
 
+import asyncio
+
 from pytest import fixture, raises
 
 from webgeocalc import Calculation, StateVector
 from webgeocalc.errors import (CalculationAlreadySubmitted, CalculationFailed,
                                CalculationNotCompleted, CalculationTimeOut,
                                ResultAttributeError)
+from webgeocalc.phase import Phase
 from webgeocalc.vars import ESA_URL, JPL_URL
 
 
@@ -401,8 +404,18 @@ def test_calculation_run(requests_mock, params, response, results):
     with raises(CalculationNotCompleted):
         _ = calc.results
 
+    # Unknown phase reported with its API name
+    calc.phase = 'CANCELLING'
+    assert calc.phase == 'CANCELLING'
+    assert calc.status.phase is Phase.UNKNOWN
+
+    with raises(CalculationNotCompleted, match="'CANCELLING'"):
+        _ = calc.results
+
     calc.run()
     assert calc.id == response['calculationId']
+    assert calc.status.complete
+    assert calc.status.progress == 0
 
     calc.update()
     assert calc.phase == response['result']['phase']
@@ -417,6 +430,44 @@ def test_calculation_run(requests_mock, params, response, results):
     assert len(out['DATE']) == len(results['rows'])
 
 
+def test_calculation_timings(requests_mock, params, response, results):
+    """Test calculation timings breakdown."""
+    calc_id = response['calculationId']
+    phase = {'status': 'OK', 'calculationId': calc_id}
+
+    requests_mock.post(JPL_URL + '/calculation/new',
+                       json=dict(phase, result={'phase': 'QUEUED', 'position': 1}))
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}', [
+        {'json': dict(phase, result={'phase': 'LOADING_KERNELS'})},
+        {'json': dict(phase, result={'phase': 'CALCULATING'})},
+        {'json': response},
+    ])
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}/results', json=results)
+
+    calc = Calculation(**params)
+    assert calc.timings == {
+        'submit': None, 'queued': 0, 'starting': 0, 'loading_kernels': 0,
+        'calculating': 0, 'download': None, 'parse': None,
+    }
+
+    calc.run(sleep=0.01)
+    timings = calc.timings
+
+    assert timings['submit'] > 0
+    assert timings['queued'] > 0
+    assert timings['starting'] == 0
+    assert timings['loading_kernels'] > 0
+    assert timings['calculating'] > 0
+    assert timings['download'] > 0
+    assert timings['parse'] > 0
+
+    # Stable once complete
+    assert calc.timings['queued'] == timings['queued']
+
+    calc.resubmit()
+    assert calc.timings['download'] is None
+
+
 def test_state_vector_single_time(requests_mock, params_sv, response_sv, results_sv):
     """Run state vector calculation on JPL API."""
     sv = StateVector(**params_sv)
@@ -500,6 +551,63 @@ def test_calculation_cancel(params):
 def test_calculation_timeout(requests_mock, params, loading_kernels):
     """Test error if response exceed timeout."""
     requests_mock.post(JPL_URL + '/calculation/new', json=loading_kernels)
+    requests_mock.get(
+        JPL_URL + '/calculation/' + loading_kernels['calculationId'],
+        json=loading_kernels)
 
     with raises(CalculationTimeOut):
         Calculation(**params).run(timeout=0.001, sleep=0.001)
+
+    # Deadline reached before the submission
+    calls = requests_mock.call_count
+
+    with raises(CalculationTimeOut, match=r'\(0 attempts\)') as err:
+        Calculation(**params).run(timeout=0)
+
+    assert err.value.attempts == 0
+    assert requests_mock.call_count == calls
+
+    with raises(CalculationTimeOut):
+        asyncio.run(Calculation(**params).run_async(timeout=0))
+
+    assert requests_mock.call_count == calls
+
+    # Previous signature: `(timeout, sleep)`
+    err = CalculationTimeOut(30, 2)
+    assert str(err) == 'Calculation time-out after 30 seconds (15 attempts)'
+    assert (err.timeout, err.attempts) == (30, 15)
+
+
+def test_calculation_run_async(requests_mock, params, response, results, loading_kernels):
+    """Run generic calculations in an event loop."""
+    requests_mock.post(JPL_URL + '/calculation/new', json=response)
+    requests_mock.get(
+        JPL_URL + '/calculation/' + response['calculationId'] + '/results', json=results)
+
+    calcs = [Calculation(**params, verbose=False) for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(*[calc.run_async() for calc in calcs])
+
+    for out in asyncio.run(run()):
+        assert len(out['DATE']) == len(results['rows'])
+
+    # Re-run results without API request
+    assert asyncio.run(calcs[0].run_async()) == calcs[0].results
+
+    requests_mock.post(JPL_URL + '/calculation/new', json=loading_kernels)
+    requests_mock.get(
+        JPL_URL + '/calculation/' + loading_kernels['calculationId'],
+        json=loading_kernels)
+
+    with raises(CalculationTimeOut):
+        asyncio.run(Calculation(**params).run_async(timeout=0.001, sleep=0.001))
+
+
+def test_calculation_run_async_failed(requests_mock, params, response):
+    """Test error if calculation failed in an event loop."""
+    response['result']['phase'] = 'FAILED'
+    requests_mock.post(JPL_URL + '/calculation/new', json=response)
+
+    with raises(CalculationFailed):
+        asyncio.run(Calculation(**params).run_async(sleep=0.001))
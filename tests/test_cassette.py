@@ -0,0 +1,152 @@
+"""Test WGC API record and replay cassettes."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pytest import fixture, raises
+
+from webgeocalc import Api
+from webgeocalc.cassette import Cassette, RecordAdapter, ReplayAdapter, get_cassette
+from webgeocalc.errors import InteractionNotFound
+
+
+CALC_ID = '0788aba2-d4e5-4028-9ef1-4867ad5385e0'
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Minimal WebGeoCalc API handler."""
+
+    phases = ['LOADING_KERNELS', 'COMPLETE']
+
+    def reply(self, data):
+        """Send a JSON response."""
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def phase(self, name):
+        """Calculation phase response."""
+        self.reply({'status': 'OK', 'calculationId': CALC_ID, 'result': {'phase': name}})
+
+    def do_GET(self):  # noqa: N802  # pylint: disable=invalid-name
+        """GET requests."""
+        if self.path == '/api/kernel-sets':
+            self.reply({'status': 'OK', 'resultType': 'KernelSetDetails', 'items': [
+                {'caption': 'Solar System Kernels', 'kernelSetId': '1'}]})
+        else:
+            self.phase(self.phases.pop(0))
+
+    def do_POST(self):  # noqa: N802  # pylint: disable=invalid-name
+        """POST requests."""
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.phase('QUEUED')
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        """Silent logs."""
+
+
+@fixture
+def server():
+    """Local API server."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/api'
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_cassette_record_replay(server, tmp_path, monkeypatch):
+    """Test cassette recording and replay."""
+    fname = tmp_path / 'wgc.json'
+
+    with raises(ValueError):
+        _ = Cassette(fname, mode='rewind')
+
+    # Record
+    cassette = Cassette(fname)
+    assert cassette.mode == 'record'
+
+    api = Api(server, cassette=cassette)
+    assert isinstance(api.session.get_adapter(server), RecordAdapter)
+
+    assert int(api.kernel_set('Solar')) == 1
+    assert api.new_calculation({'kernels': [1]}) == (CALC_ID, 'QUEUED')
+    assert api.phase_calculation(CALC_ID) == (CALC_ID, 'LOADING_KERNELS')
+    assert api.phase_calculation(CALC_ID) == (CALC_ID, 'COMPLETE')
+
+    # Non-JSON request body
+    assert api.session.post(server + '/calculation/new', data=b'kernels=1').ok
+
+    assert len(cassette) == 5
+    assert repr(cassette) == f'<Cassette> {fname} (record: 5 interactions)'
+
+    # Appended (one interaction per line)
+    assert len(fname.read_text().splitlines()) == 5 + 2
+
+    interactions = json.loads(fname.read_text())
+    assert interactions[1]['request']['body'] == {'kernels': [1]}
+    assert interactions[4]['request']['body'] == 'kernels=1'
+    assert 'Content-Length' not in interactions[1]['response']['headers']
+    assert all(interaction['elapsed'] > 0 for interaction in interactions)
+
+    # Replay (without server)
+    monkeypatch.setenv('WGC_CASSETTE', str(fname))
+    api = Api(server)
+
+    assert api.cassette.mode == 'replay'
+    assert isinstance(api.session.get_adapter(server), ReplayAdapter)
+
+    assert int(api.kernel_set('Solar')) == 1
+    assert api.new_calculation({'kernels': [1]}) == (CALC_ID, 'QUEUED')
+    assert api.phase_calculation(CALC_ID) == (CALC_ID, 'LOADING_KERNELS')
+    assert api.phase_calculation(CALC_ID) == (CALC_ID, 'COMPLETE')
+    assert api.phase_calculation(CALC_ID) == (CALC_ID, 'COMPLETE')  # last repeated
+    assert api.session.post(server + '/calculation/new', data='kernels=1').ok
+
+    with raises(InteractionNotFound):
+        api.new_calculation({'kernels': [5]})
+
+
+def test_cassette_shared(server, tmp_path):
+    """Test cassette shared by the APIs recording in the same file."""
+    fname = tmp_path / 'wgc.json'
+
+    apis = [Api(server, cassette=fname), Api(server, cassette=str(fname))]
+    assert apis[0].cassette is apis[1].cassette
+    assert get_cassette(tmp_path / '.' / 'wgc.json') is apis[0].cassette
+
+    for api in apis + apis[:1]:
+        assert api.new_calculation({'kernels': [1]}) == (CALC_ID, 'QUEUED')
+
+    assert len(json.loads(fname.read_text())) == 3
+
+
+def test_cassette_latency(tmp_path):
+    """Test cassette simulated latency."""
+    fname = tmp_path / 'wgc.json'
+    url = 'http://127.0.0.1:1/api'
+    fname.write_text(json.dumps([{
+        'request': {'method': 'GET', 'url': url + f'/calculation/{CALC_ID}',
+                    'body': None},
+        'response': {'status': 200, 'reason': 'OK', 'headers': {}, 'body': json.dumps(
+            {'status': 'OK', 'calculationId': CALC_ID, 'result': {'phase': 'COMPLETE'}})},
+        'elapsed': 0.05,
+    }]))
+
+    cassette = Cassette(fname, mode='replay')
+    assert cassette.delay(cassette.interactions[0]) == 0
+
+    for latency, expected in [(0.02, 0.02), ('recorded', 0.05)]:
+        api = Api(url, cassette=Cassette(fname, latency=latency))
+
+        start = time.perf_counter()
+        assert api.phase_calculation(CALC_ID) == (CALC_ID, 'COMPLETE')
+        assert time.perf_counter() - start >= expected
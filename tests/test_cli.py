@@ -60,6 +60,38 @@ def test_cli_bodies(capsys):
     assert captured.out == ' - 67P/CHURYUMOV-GERASIMENKO (1969 R1): (id: 1000012)\n'
 
 
+def test_cli_search_names(capsys, requests_mock):
+    """Test CLI ``--name`` filters with names and ids."""
+    url = 'https://wgc.obspm.fr/webgeocalc/api'
+
+    def items(result_type, *names):
+        return {'status': 'OK', 'resultType': result_type, 'items': [
+            {'id': -i, 'name': name} for i, name in enumerate(names, start=1)
+        ]}
+
+    requests_mock.get(url + '/kernel-set/5/bodies', json=items(
+        'BodyData', 'CASSINI', 'CASSINI_HUYGENS', 'TITAN'))
+    requests_mock.get(url + '/kernel-set/5/frames', json=items(
+        'FrameData', 'CASSINI_KSO', 'IAU_TITAN'))
+    requests_mock.get(url + '/kernel-set/5/instruments', json=items(
+        'InstrumentData', 'CASSINI_ISS_WAC', 'CASSINI_VIMS_IR'))
+
+    cli_bodies(f'5 --api {url} --name cassini -3 huygens'.split())
+    captured = capsys.readouterr()
+    assert captured.out == (' - CASSINI: (id: -1)\n'
+                            ' - CASSINI_HUYGENS: (id: -2)\n'
+                            ' - TITAN: (id: -3)\n')
+
+    cli_frames(f'5 --api {url} --name Titan'.split())
+    captured = capsys.readouterr()
+    assert captured.out == ' - IAU_TITAN: (id: -2)\n'
+
+    cli_instruments(f'5 --api {url} --name ISS -2'.split())
+    captured = capsys.readouterr()
+    assert captured.out == (' - CASSINI_ISS_WAC: (id: -1)\n'
+                            ' - CASSINI_VIMS_IR: (id: -2)\n')
+
+
 def test_cli_frames(capsys):
     """Test GET frames with CLI."""
     argv = ''.split()
@@ -0,0 +1,193 @@
+"""Test WGC columnar results."""
+
+import sys
+
+from pytest import fixture, importorskip, raises
+
+from webgeocalc import Api
+from webgeocalc.calculation import Calculation
+from webgeocalc.columns import ColumnarResults, as_columns, column_array, results_array
+from webgeocalc.errors import CalculationNotCompleted
+from webgeocalc.types import ColumnResult
+
+
+URL = 'https://wgc.test/api'
+CALC_ID = '0788aba2-d4e5-4028-9ef1-4867ad5385e0'
+
+COLUMNS = [
+    ColumnResult({'name': 'UTC calendar date', 'type': 'DATE', 'units': '',
+                  'outputID': 'DATE'}),
+    ColumnResult({'name': 'Distance', 'type': 'NUMBER', 'units': 'km',
+                  'outputID': 'DISTANCE'}),
+    ColumnResult({'name': 'Count', 'type': 'NUMBER', 'units': '', 'outputID': 'COUNT'}),
+    ColumnResult({'name': 'Body', 'type': 'STRING', 'outputID': 'BODY'}),
+]
+
+ROWS = [
+    ['2012-10-19 08:24:00.000000 UTC', 764142.63776247, 1, 'TITAN'],
+    ['2012-10-19 09:00:00.500000 UTC', 764265.12137156, 2, 'RHEA'],
+]
+
+
+@fixture
+def np():
+    """Import NumPy (optional)."""
+    return importorskip('numpy')
+
+
+@fixture
+def calc(requests_mock):
+    """Complete calculation (with mocked results)."""
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', json={
+        'status': 'OK',
+        'columns': [dict(column.items()) for column in COLUMNS],
+        'rows': ROWS,
+    })
+
+    calculation = Calculation(
+        api=Api(URL, retry=False),
+        calculation_type='TIME_CONVERSION',
+        kernels=1,
+        times='2000-01-01',
+        verbose=False,
+    )
+    calculation.id = CALC_ID
+    return calculation
+
+
+def test_columnar_results():
+    """Test lazy columnar results view."""
+    view = ColumnarResults(COLUMNS, ROWS)
+
+    assert len(view) == 4
+    assert list(view) == ['DATE', 'DISTANCE', 'COUNT', 'BODY']
+    assert repr(view) == '<ColumnarResults> 2 rows: DATE, DISTANCE, COUNT, BODY'
+
+    # Transposed on the first access only
+    assert view['COUNT'] == [1, 2]
+    assert view['COUNT'] is view.column('COUNT')
+    assert list(view._data) == ['COUNT']  # pylint: disable=protected-access
+    assert view.elapsed > 0
+
+    elapsed = view.elapsed
+    assert view['COUNT'] == [1, 2]
+    assert view.elapsed == elapsed
+
+    # Built once and shared
+    data = view.to_dict()
+    assert data['COUNT'] is view['COUNT']
+    assert view.to_dict() is data
+
+    with raises(KeyError):
+        _ = view['WRONG']
+
+    assert view == {'DATE': [ROWS[0][0], ROWS[1][0]],
+                    'DISTANCE': [ROWS[0][1], ROWS[1][1]],
+                    'COUNT': [1, 2], 'BODY': ['TITAN', 'RHEA']}
+
+    # Released rows
+    assert list(view.iter_rows()) == ROWS
+    view.release()
+    assert view.rows is None
+    assert list(view.iter_rows()) == ROWS
+    view.release()
+
+    # Single row
+    view = ColumnarResults(COLUMNS, ROWS[:1])
+    assert view['BODY'] == 'TITAN'
+    assert view.to_dict() == {'DATE': ROWS[0][0], 'DISTANCE': ROWS[0][1],
+                              'COUNT': 1, 'BODY': 'TITAN'}
+    assert view.column('BODY') == ['TITAN']
+
+
+def test_calculation_columnar(calc, requests_mock):
+    """Test calculation cached columnar results."""
+    with raises(CalculationNotCompleted):
+        _ = calc.column('DATE')
+
+    calc.phase = 'COMPLETE'
+
+    assert calc.timings['parse'] is None
+    assert calc.column('COUNT') == [1, 2]
+    assert calc.columnar is not None
+
+    results = calc.results
+    assert results['BODY'] == ['TITAN', 'RHEA']
+    assert calc.results == results
+
+    # Parsed once
+    parse = calc.timings['parse']
+    assert parse > 0
+    _ = calc.results
+    assert calc.timings['parse'] == parse
+
+    # Shared (not copied) on each access
+    assert calc.results is results
+    assert results['COUNT'] is calc.column('COUNT')
+    assert calc.values == ROWS
+
+    # Release the row-major values
+    calc.release_values = True
+    assert calc.results == results
+    assert calc.values is None
+    assert calc.run() == results
+    assert [row['BODY'] for row in calc.stream_results()] == ['TITAN', 'RHEA']
+    assert requests_mock.call_count == 1
+
+
+def test_column_array(np):
+    """Test typed column arrays."""
+    dates = column_array(COLUMNS[0], [row[0] for row in ROWS])
+    assert dates.dtype == np.dtype('datetime64[us]')
+    assert dates.dtype.metadata == {'units': '', 'scale': 'UTC'}
+    assert dates[1] == np.datetime64('2012-10-19T09:00:00.500')
+
+    distances = column_array(COLUMNS[1], [764142.63776247, None, 2])
+    assert distances.dtype == np.float64
+    assert distances.dtype.metadata == {'units': 'km'}
+    assert np.isnan(distances[1])
+
+    assert column_array(COLUMNS[2], [1, 2]).dtype == np.int64
+    assert column_array(COLUMNS[2], [True, False]).dtype == np.float64
+    assert column_array(COLUMNS[3], ['TITAN']).dtype.kind == 'U'
+
+    # Unsupported dates formats
+    julian = column_array(COLUMNS[0], ['2456219.850000 JD TDB'])
+    assert julian.dtype.kind == 'U'
+
+
+def test_as_columns(np):  # pylint: disable=unused-argument
+    """Test columnar results."""
+    data = as_columns(COLUMNS, ROWS)
+
+    assert list(data) == ['DATE', 'DISTANCE', 'COUNT', 'BODY']
+    assert data['COUNT'].tolist() == [1, 2]
+    assert data['BODY'].tolist() == ['TITAN', 'RHEA']
+
+    array = results_array(COLUMNS, ROWS)
+    assert array.dtype.names == ('DATE', 'DISTANCE', 'COUNT', 'BODY')
+    assert array['DISTANCE'][0] == 764142.63776247
+    assert array[1]['BODY'] == 'RHEA'
+
+    assert len(results_array(COLUMNS, [])) == 0
+
+
+def test_as_columns_without_numpy(monkeypatch):
+    """Test columnar results without NumPy."""
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+
+    with raises(ImportError):
+        _ = as_columns(COLUMNS, ROWS)
+
+
+def test_calculation_as_columns(np, calc,  # pylint: disable=unused-argument
+                                requests_mock):
+    """Test calculation columnar NumPy results."""
+    with raises(CalculationNotCompleted):
+        _ = calc.as_columns()
+
+    calc.phase = 'COMPLETE'
+
+    assert calc.as_columns()['DISTANCE'].tolist() == [764142.63776247, 764265.12137156]
+    assert calc.results_array()['COUNT'].tolist() == [1, 2]
+    assert requests_mock.call_count == 1
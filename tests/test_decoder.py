@@ -0,0 +1,207 @@
+"""Test WGC JSON decoders and streaming results parser."""
+
+import json
+import sys
+
+from pytest import raises
+
+from requests.exceptions import JSONDecodeError
+
+from webgeocalc import Api, MultiApi, run_many
+from webgeocalc.breaker import CircuitBreaker
+from webgeocalc.calculation import Calculation
+from webgeocalc.decoder import ResultsParser, get_decoder, stream_results
+from webgeocalc.errors import APIError, APIResponseError, CalculationNotCompleted
+from webgeocalc.poller import Poller
+
+
+URL = 'https://wgc.test/api'
+CALC_ID = '0788aba2-d4e5-4028-9ef1-4867ad5385e0'
+
+RESULTS = {
+    'status': 'OK',
+    'calculationId': CALC_ID,
+    'columns': [
+        {'name': 'UTC calendar date', 'type': 'DATE', 'units': '', 'outputID': 'DATE'},
+        {'name': 'Distance', 'type': 'NUMBER', 'units': 'km', 'outputID': 'DISTANCE'},
+    ],
+    'rows': [[f'2012-10-{day:02d} 00:00:00.000000 UTC', 764142.63776247 + day]
+             for day in range(1, 32)],
+}
+
+
+def chunked(content, size):
+    """Split a content in chunks."""
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+def test_get_decoder(monkeypatch):
+    """Test JSON decoders selection."""
+    def loads(content):
+        return content
+
+    assert get_decoder(loads) is loads
+    assert get_decoder('json') is json.loads
+
+    monkeypatch.setenv('WGC_JSON_DECODER', 'json')
+    assert get_decoder() is json.loads
+
+    monkeypatch.delenv('WGC_JSON_DECODER')
+    assert get_decoder()(b'{"a": [1, 2.5]}') == {'a': [1, 2.5]}
+
+    with raises(ValueError):
+        _ = get_decoder('simplejson')
+
+    # Without orjson
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+    assert get_decoder() is json.loads
+
+    with raises(ImportError):
+        _ = get_decoder('orjson')
+
+
+def test_stream_results():
+    """Test streaming results parser."""
+    content = json.dumps(RESULTS, indent=2).encode()
+
+    for size in (1, 7, 64, len(content)):
+        for decoder in ('json', None):
+            fields, rows = stream_results(chunked(content, size), decoder=decoder)
+            assert fields == {k: v for k, v in RESULTS.items() if k != 'rows'}
+            assert list(rows) == RESULTS['rows']
+
+    # Multi-bytes characters and numbers split between chunks
+    content = ('{"count": 125, "columns": [{"name": "Ångström"}], '
+               '"rows": [[1.25e3, -7], [true, null]]}')
+    fields, rows = stream_results(chunked(content.encode(), 1))
+    assert fields == {'count': 125, 'columns': [{'name': 'Ångström'}]}
+    assert list(rows) == [[1250.0, -7], [True, None]]
+
+    # Rows before columns
+    content = b'{"rows": [[1], [2]], "columns": [{"outputID": "A"}]}'
+    fields, rows = stream_results([content])
+    assert fields == {'columns': [{'outputID': 'A'}]}
+    assert list(rows) == [[1], [2]]
+
+    # No rows
+    fields, rows = stream_results([b'{"status": "ERROR", "error": {}}'])
+    assert fields == {'status': 'ERROR', 'error': {}}
+    assert not list(rows)
+
+    parser = ResultsParser([b'{"status": "OK", "rows": []}'])
+    assert parser.fields_until('rows')
+    assert repr(parser) == "<ResultsParser> fields: ['status']"
+
+
+def test_stream_results_invalid():
+    """Test streaming results parser on invalid responses."""
+    with raises(ValueError):
+        _ = stream_results([b'[]'])
+
+    with raises(ValueError):
+        _ = stream_results([b'{"status": "OK"'])
+
+    _, rows = stream_results([b'{"columns": [], "rows": [[1], [2'])
+    with raises(ValueError):
+        _ = list(rows)
+
+
+def test_api_stream_results(requests_mock):
+    """Test API streaming results."""
+    api = Api(URL, decoder='json', retry=False)
+    assert api.decoder is json.loads
+
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', json=RESULTS)
+
+    columns, rows = api.stream_results(CALC_ID, chunk_size=64)
+    assert [column.outputID for column in columns] == ['DATE', 'DISTANCE']
+    assert list(rows) == RESULTS['rows']
+
+    # Multiple APIs
+    columns, rows = MultiApi(api).stream_results(CALC_ID)
+    assert len(list(rows)) == 31
+
+    # Errors
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', json={
+        'status': 'ERROR',
+        'error': {'shortDescription': 'Calculation not found'},
+    })
+
+    with raises(APIError):
+        _ = api.stream_results(CALC_ID)
+
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', json={'status': 'OK'})
+
+    with raises(APIResponseError):
+        _ = api.stream_results(CALC_ID)
+
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', json={'rows': []})
+
+    with raises(APIResponseError):
+        _ = api.stream_results(CALC_ID)
+
+
+def test_api_invalid_json(requests_mock):
+    """Test API invalid JSON responses."""
+    requests_mock.get(URL + '/kernel-sets', text='<html>proxy error</html>')
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', text='<html>')
+
+    for decoder in ('json', None):
+        api = Api(URL, decoder=decoder, breaker=CircuitBreaker(failures=1))
+
+        with raises(JSONDecodeError) as err:
+            api.kernel_sets()
+
+        assert isinstance(err.value, IOError)
+        assert err.value.response.status_code == 200
+        assert api.breaker.state == 'open'
+
+    with raises(JSONDecodeError):
+        _ = Api(URL).stream_results(CALC_ID)
+
+
+def test_run_many_invalid_json(requests_mock):
+    """Test batch with an invalid JSON phase response."""
+    requests_mock.post(URL + '/calculation/new', json={
+        'status': 'OK', 'calculationId': CALC_ID, 'result': {'phase': 'STARTING'}})
+    requests_mock.get(URL + f'/calculation/{CALC_ID}', text='<html>proxy error</html>')
+
+    calc = Calculation(
+        api=Api(URL, retry=False),
+        calculation_type='TIME_CONVERSION',
+        kernels=1,
+        times='2000-01-01',
+        verbose=False,
+    )
+
+    out = run_many([calc], timeout=1, poller=Poller(interval=0.005))
+    assert isinstance(out[0], JSONDecodeError)
+
+
+def test_calculation_stream_results(requests_mock):
+    """Test calculation streaming results."""
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', json=RESULTS)
+
+    calc = Calculation(
+        api=Api(URL, retry=False),
+        calculation_type='TIME_CONVERSION',
+        kernels=1,
+        times='2000-01-01',
+        verbose=False,
+    )
+
+    with raises(CalculationNotCompleted):
+        _ = calc.stream_results()
+
+    calc.id, calc.phase = CALC_ID, 'COMPLETE'
+
+    rows = list(calc.stream_results())
+    assert len(rows) == 31
+    assert rows[0] == {'DATE': '2012-10-01 00:00:00.000000 UTC',
+                       'DISTANCE': 764143.63776247}
+    assert calc.values is None
+
+    # Already downloaded results
+    calc.values = [['2000-01-01', 1.0]]
+    assert list(calc.stream_results()) == [{'DATE': '2000-01-01', 'DISTANCE': 1.0}]
+    assert requests_mock.call_count == 1
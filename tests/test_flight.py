@@ -0,0 +1,322 @@
+"""Test WGC single-flight calculations registry and lazy caches."""
+
+import threading
+
+from pytest import raises
+
+from webgeocalc import Api, StateVector, run_many
+from webgeocalc.flight import OnceCache, SingleFlight
+from webgeocalc.phase import CalculationPhase
+
+
+def test_single_flight_submit():
+    """Test identical submissions coalescing."""
+    flights = SingleFlight()
+    submitted = []
+
+    def submit():
+        submitted.append(1)
+        return f'calc-{len(submitted)}', CalculationPhase('QUEUED', position=3)
+
+    assert flights.submit('key', submit) == ('calc-1', 'QUEUED | POSITION: 3')
+    assert flights.submit('key', submit) == ('calc-1', 'QUEUED | POSITION: 3')
+    assert flights.submit('other', submit) == ('calc-2', 'QUEUED | POSITION: 3')
+
+    assert len(submitted) == 2
+    assert len(flights) == 2
+    assert 'key' in flights
+    assert repr(flights) == '<SingleFlight> 2 calculation(s) in flight'
+
+    # Shared results downloaded once
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return ['DATE'], [['2000-01-01']]
+
+    assert flights.results('calc-1', fetch) == (['DATE'], [['2000-01-01']])
+    assert 'key' not in flights  # Complete calculation
+    assert len(flights) == 2
+
+    assert flights.results('calc-1', fetch) == (['DATE'], [['2000-01-01']])
+    assert len(flights) == 1
+    assert len(fetched) == 1
+
+    # Released calculation
+    assert flights.results('calc-1', fetch) == (['DATE'], [['2000-01-01']])
+    assert len(fetched) == 2
+
+    assert flights.submit('key', submit) == ('calc-3', 'QUEUED | POSITION: 3')
+
+
+def test_single_flight_abandoned():
+    """Test calculations abandoned by their callers."""
+    flights = SingleFlight(ttl=60)
+
+    def submit():
+        return 'calc-1', CalculationPhase('STARTING')
+
+    def fetch():
+        return ['DATE'], [['2000-01-01']]
+
+    # The second caller gives up (eg. timeout) and never fetch its results
+    flights.submit('key', submit)
+    flights.submit('key', submit)
+    flights.results('calc-1', fetch)
+
+    # Not attached to the complete calculation
+    assert flights.submit('key', lambda: ('calc-2', CalculationPhase('STARTING'))) \
+        == ('calc-2', 'STARTING')
+    assert len(flights) == 2
+
+    # Abandoned calculations expired
+    for flight in flights._ids.values():  # pylint: disable=protected-access
+        flight.created -= 120
+
+    assert flights.submit('key', lambda: ('calc-3', CalculationPhase('STARTING'))) \
+        == ('calc-3', 'STARTING')
+    assert len(flights) == 1
+    assert 'key' in flights
+
+
+def test_single_flight_concurrent():
+    """Test concurrent identical submissions."""
+    flights = SingleFlight()
+    submitted = []
+    started, release = threading.Event(), threading.Event()
+
+    def submit():
+        submitted.append(1)
+        started.set()
+        release.wait(5)
+        return 'calc-1', CalculationPhase('STARTING')
+
+    out = []
+    threads = [
+        threading.Thread(target=lambda: out.append(flights.submit('key', submit)))
+        for _ in range(4)
+    ]
+
+    threads[0].start()
+    started.wait(5)
+
+    for thread in threads[1:]:
+        thread.start()
+
+    release.set()
+
+    for thread in threads:
+        thread.join(5)
+
+    assert len(submitted) == 1
+    assert out == [('calc-1', 'STARTING')] * 4
+
+
+def test_single_flight_failed():
+    """Test failed submissions and calculations."""
+    flights = SingleFlight()
+
+    def error():
+        raise IOError('Connection error')
+
+    with raises(IOError):
+        flights.submit('key', error)
+
+    assert 'key' not in flights
+
+    flights.submit('key', lambda: ('calc-1', CalculationPhase('STARTING')))
+    flights.submit('key', lambda: ('calc-2', CalculationPhase('STARTING')))
+
+    flights.phase('unknown', CalculationPhase('FAILED'))
+    flights.phase('calc-1', CalculationPhase('CALCULATING'))
+    assert 'key' in flights
+
+    flights.phase('calc-1', CalculationPhase('FAILED'))
+    assert 'key' not in flights
+    assert not flights
+
+    # The leader submission failed while a follower was waiting
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise IOError('Connection error')
+
+    def leader():
+        with raises(IOError):
+            flights.submit('key', failing)
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    started.wait(5)
+
+    out = []
+    follower = threading.Thread(target=lambda: out.append(
+        flights.submit('key', lambda: ('calc-3', CalculationPhase('STARTING')))))
+    follower.start()
+
+    release.set()
+    thread.join(5)
+    follower.join(5)
+
+    assert out == [('calc-3', 'STARTING')]
+
+
+def test_single_flight_cancel():
+    """Test shared calculation cancellation."""
+    flights = SingleFlight()
+    cancelled = []
+
+    def cancel():
+        cancelled.append(1)
+        return 'calc-1', CalculationPhase('CANCELLED')
+
+    assert flights.cancel('calc-1', cancel) == ('calc-1', 'CANCELLED')
+
+    flights.submit('key', lambda: ('calc-1', CalculationPhase('STARTING')))
+    flights.submit('key', lambda: ('calc-1', CalculationPhase('STARTING')))
+
+    # Only detached while another caller is attached
+    assert flights.cancel('calc-1', cancel) == ('calc-1', 'CANCELLED')
+    assert len(cancelled) == 1
+    assert 'key' in flights
+
+    assert flights.cancel('calc-1', cancel) == ('calc-1', 'CANCELLED')
+    assert len(cancelled) == 2
+    assert 'key' not in flights
+
+
+def test_api_coalesce(requests_mock):
+    """Test identical calculations coalescing on the API."""
+    url = 'https://wgc.obspm.fr/webgeocalc/api'
+    calc_id = '0788aba2-d4e5-4028-9ef1-4867ad5385e0'
+
+    def phase(name):
+        return {'status': 'OK', 'calculationId': calc_id, 'result': {'phase': name}}
+
+    new = requests_mock.post(url + '/calculation/new', json=phase('LOADING_KERNELS'))
+    requests_mock.get(url + f'/calculation/{calc_id}', json=phase('COMPLETE'))
+    cancel = requests_mock.get(url + f'/calculation/{calc_id}/cancel',
+                               json=phase('CANCELLED'))
+    results = requests_mock.get(url + f'/calculation/{calc_id}/results', json={
+        'status': 'OK',
+        'columns': [{'name': 'Distance (km)', 'outputID': 'DISTANCE'}],
+        'rows': [[967899.52452788]],
+    })
+
+    api = Api(url, coalesce=True)
+    assert Api(url).flights is None
+
+    def calc(target):
+        return StateVector(api=api, kernels=5, times='2012-10-19T08:24:00.000',
+                           target=target, observer='CASSINI',
+                           reference_frame='CASSINI_ISS_NAC', verbose=False)
+
+    calcs = [calc('ENCELADUS') for _ in range(3)]
+    for c in calcs:
+        c.submit()
+
+    out = run_many(calcs, timeout=5)
+
+    assert out == [{'DISTANCE': 967899.52452788}] * 3
+    assert (new.call_count, results.call_count) == (1, 1)
+    assert not api.flights
+
+    # Identical calculations cancelled
+    calcs = [calc('TITAN'), calc('TITAN')]
+    for c in calcs:
+        c.submit()
+
+    assert new.call_count == 2
+
+    calcs[0].cancel()
+    assert calcs[0].phase == 'CANCELLED'
+    assert cancel.call_count == 0
+
+    calcs[1].cancel()
+    assert calcs[1].phase == 'CANCELLED'
+    assert cancel.call_count == 1
+    assert not api.flights
+
+
+def test_once_cache():
+    """Test lazy cache single-flight loading."""
+    cache = OnceCache()
+    loads = []
+    started, release = threading.Event(), threading.Event()
+
+    def load():
+        loads.append(1)
+        started.set()
+        release.wait(5)
+        return ['Solar System Kernels']
+
+    out = []
+    threads = [
+        threading.Thread(target=lambda: out.append(cache.get('/kernel-sets', load)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+
+    started.wait(5)
+    release.set()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len(out) == 8
+    assert all(value is out[0] for value in out)
+
+    assert '/kernel-sets' in cache
+    assert len(cache) == 1
+    assert repr(cache) == '<OnceCache> 1 item(s)'
+
+    # Failed loading is not cached
+    def fail():
+        raise IOError('Unavailable')
+
+    with raises(IOError):
+        cache.get('/', fail)
+
+    assert '/' not in cache
+    assert cache.get('/', lambda: {'version': '2.8.2'}) == {'version': '2.8.2'}
+
+    # Values loaded during a clear are not cached
+    def clear():
+        cache.clear()
+        return 'outdated'
+
+    assert cache.get('/bodies', clear) == 'outdated'
+    assert '/bodies' not in cache
+    assert len(cache) == 0
+
+
+def test_api_concurrent_catalogs(requests_mock):
+    """Test API catalogs downloaded once by concurrent threads."""
+    api = Api('https://wgc.test/api')
+    release = threading.Event()
+
+    def kernel_sets(*_):
+        release.wait(5)
+        return {'status': 'OK', 'resultType': 'KernelSetDetails', 'items': [
+            {'caption': 'Solar System Kernels', 'kernelSetId': '1'}]}
+
+    mock = requests_mock.get(api.url + '/kernel-sets', json=kernel_sets)
+
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(api.kernel_set(1)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+
+    release.set()
+
+    for thread in threads:
+        thread.join()
+
+    assert mock.call_count == 1
+    assert len(out) == 8
+    assert all(int(kernel_set) == 1 for kernel_set in out)
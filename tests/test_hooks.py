@@ -0,0 +1,208 @@
+"""Test WGC API and calculations hooks."""
+
+import json
+
+from pytest import fixture, raises, warns
+
+from requests import HTTPError
+
+from webgeocalc import Api, Calculation
+from webgeocalc.cache import ResultsCache
+from webgeocalc.hooks import CALCULATION_HOOKS, Hooks, SpanExporter
+from webgeocalc.phase import Phase
+from webgeocalc.retry import Retry
+
+
+URL = 'https://wgc.obspm.fr/webgeocalc/api'
+CALC_ID = '0788aba2-d4e5-4028-9ef1-4867ad5385e0'
+
+
+@fixture
+def params():
+    """Calculation input parameters."""
+    return {
+        'api': Api(URL, retry=Retry(backoff=0, jitter=0)),
+        'calculation_type': 'TIME_CONVERSION',
+        'kernels': 1,
+        'times': '2000-01-01',
+        'verbose': False,
+    }
+
+
+@fixture
+def mock_api(requests_mock):
+    """Mock calculation API responses."""
+    def phase(name):
+        return {'status': 'OK', 'calculationId': CALC_ID, 'result': {'phase': name}}
+
+    requests_mock.post(URL + '/calculation/new', json=phase('QUEUED'))
+    requests_mock.get(URL + f'/calculation/{CALC_ID}', [
+        {'status_code': 503},
+        {'json': phase('LOADING_KERNELS')},
+        {'json': phase('COMPLETE')},
+    ])
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', json={
+        'status': 'OK',
+        'columns': [{'name': 'UTC calendar date', 'outputID': 'DATE'}],
+        'rows': [['2000-01-01 00:00:00.000000 UTC']],
+    })
+    return requests_mock
+
+
+def test_hooks():
+    """Test hooks registry."""
+    hooks = Hooks('request', 'response')
+    assert not hooks
+    assert repr(hooks) == '<Hooks> request: 0, response: 0'
+
+    calls = []
+    callback = hooks.on('request', calls.append)
+
+    @hooks.on('response')
+    def on_response(info):
+        calls.append(info['event'])
+
+    assert hooks
+    assert repr(hooks) == '<Hooks> request: 1, response: 1'
+
+    hooks.emit('request', url='/')
+    hooks.emit('response', url='/')
+    assert calls == [{'url': '/', 'event': 'request'}, 'response']
+
+    hooks.off('request', callback)
+    hooks.off('request', callback)
+    hooks.off('response', on_response)
+    assert not hooks
+
+    with raises(ValueError):
+        hooks.on('phase', print)
+
+    # Failing hook
+    hooks.on('request', lambda info: 1 / 0)
+
+    with warns(RuntimeWarning, match="failed on 'request': division by zero"):
+        hooks.emit('request', url='/')
+
+
+def test_api_hooks(requests_mock):
+    """Test API requests hooks."""
+    phase = {'status': 'OK', 'calculationId': CALC_ID, 'result': {'phase': 'COMPLETE'}}
+
+    requests_mock.post(URL + '/calculation/new', json=phase)
+    requests_mock.get(URL + '/kernel-sets', json={
+        'status': 'OK', 'resultType': 'KernelSetDetails', 'items': []})
+    requests_mock.get(URL + f'/calculation/{CALC_ID}', status_code=404)
+
+    events = []
+    api = Api(URL, on_request=events.append, on_response=events.append,
+              on_error=events.append)
+
+    assert repr(api.hooks) == '<Hooks> request: 1, response: 1, error: 1'
+
+    api.new_calculation({'kernels': [1]})
+    api.kernel_sets()
+
+    with raises(HTTPError):
+        api.phase_calculation(CALC_ID)
+
+    assert [(e['event'], e['endpoint']) for e in events] == [
+        ('request', '/calculation/new'),
+        ('response', '/calculation/new'),
+        ('request', '/kernel-sets'),
+        ('response', '/kernel-sets'),
+        ('request', '/calculation/{id}'),
+        ('error', '/calculation/{id}'),
+    ]
+
+    request, response, kernel_sets, error = events[0], events[1], events[3], events[5]
+
+    assert request['api'] is api
+    assert request['method'] == 'POST'
+    assert request['url'] == '/calculation/new'
+    assert request['payload_size'] == len('{"kernels": [1]}')
+    assert request['attempt'] == 0
+
+    assert response['status'] == 200
+    assert response['size'] > 0
+    assert response['elapsed'] >= 0
+    assert response['result_type'] is None
+    assert kernel_sets['result_type'] == 'KernelSetDetails'
+
+    assert error['status'] == 404
+    assert isinstance(error['error'], HTTPError)
+    assert events[4]['payload_size'] == 0
+
+
+def test_calculation_hooks(params, mock_api):  # pylint: disable=unused-argument
+    """Test calculation lifecycle hooks."""
+    events = []
+    hooks = Hooks('submit', 'phase', 'results')
+    for event in hooks.events:
+        hooks.on(event, events.append)
+
+    calc = Calculation(hooks=hooks, **params)
+    assert calc.hooks is hooks
+    assert Calculation(**params).hooks is CALCULATION_HOOKS
+
+    calc.run(timeout=5, sleep=0.01)
+
+    assert [e['event'] for e in events] == [
+        'phase', 'submit', 'phase', 'phase', 'results']
+    assert all(e['calculation'] is calc for e in events)
+    assert all(e['elapsed'] >= 0 for e in events)
+
+    assert events[0]['previous'] is Phase.NOT_SUBMITTED
+    assert events[0]['phase'] is Phase.QUEUED
+    assert events[1]['id'] == CALC_ID
+    assert not events[1]['cached']
+    assert events[2]['previous'] is Phase.QUEUED
+    assert events[3]['phase'] is Phase.COMPLETE
+    assert events[4]['rows'] == 1
+    assert not events[4]['cached']
+
+    # Results loaded from the cache
+    cache = ResultsCache()
+    calc = Calculation(hooks=hooks, cache=cache, **params)
+    cache.set(calc.cache_key, [{'name': 'UTC calendar date', 'outputID': 'DATE'}],
+              [['2000-01-01 00:00:00.000000 UTC']])
+
+    events.clear()
+    calc.submit()
+
+    assert [e['event'] for e in events] == ['phase', 'results', 'submit']
+    assert events[1]['cached']
+    assert events[2]['cached']
+
+
+def test_span_exporter(tmp_path, params, mock_api):  # pylint: disable=unused-argument
+    """Test JSON lines spans exporter."""
+    fname = tmp_path / 'spans.jsonl'
+    exporter = SpanExporter(fname)
+    assert repr(exporter) == f'<SpanExporter> {fname}'
+
+    hooks = Hooks('submit', 'phase', 'results')
+    exporter.attach(params['api'].hooks, hooks)
+
+    Calculation(hooks=hooks, **params).run(timeout=5, sleep=0.01)
+
+    spans = [json.loads(line) for line in fname.read_text().splitlines()]
+
+    assert [(span['kind'], span['name']) for span in spans] == [
+        ('request', 'POST /calculation/new'),
+        ('calculation', 'NOT SUBMITTED'),
+        ('calculation', 'submit'),
+        ('request', 'GET /calculation/{id}'),
+        ('request', 'GET /calculation/{id}'),
+        ('calculation', 'QUEUED'),
+        ('request', 'GET /calculation/{id}'),
+        ('calculation', 'LOADING_KERNELS'),
+        ('request', 'GET /calculation/{id}/results'),
+        ('calculation', 'results'),
+    ]
+
+    assert spans[3]['status'] == 503
+    assert 'HTTPError' in spans[3]['error']
+    assert spans[4]['attempt'] == 1
+    assert spans[8]['result_type'] is None
+    assert all(span['duration'] >= 0 and span['start'] > 0 for span in spans)
+    assert all(isinstance(span['thread'], int) for span in spans)
@@ -0,0 +1,61 @@
+"""Test API items lookup index."""
+
+from pytest import fixture
+
+from webgeocalc.index import Index
+from webgeocalc.types import BodyData
+
+
+@fixture
+def bodies():
+    """List of bodies."""
+    return [
+        BodyData({'id': 606, 'name': 'TITAN'}),
+        BodyData({'id': -82, 'name': 'CASSINI'}),
+        BodyData({'id': 602, 'name': 'ENCELADUS'}),
+        BodyData({'id': -150, 'name': 'CASSINI_HUYGENS'}),
+        BodyData({'id': -82, 'name': 'Cassini'}),
+    ]
+
+
+def test_index(bodies):
+    """Test index construction."""
+    index = Index(bodies)
+
+    assert len(index) == 5
+    assert repr(index) == '<Index> 5 items'
+
+    assert index.ids[606] == [0]
+    assert index.names['CASSINI'] == [1]
+    assert index.lower_names['cassini'] == [1, 4]
+
+
+def test_index_search(bodies):
+    """Test index search by id or partial name."""
+    index = Index(bodies)
+
+    assert index.search(606) == [bodies[0]]
+    assert index.search(-82) == [bodies[1], bodies[4]]
+    assert not index.search(0)
+
+    assert index.search('titan') == [bodies[0]]
+    assert index.search('CASS') == [bodies[1], bodies[3], bodies[4]]
+    assert index.search('CASS') == [bodies[1], bodies[3], bodies[4]]  # memoized
+    assert not index.search('PLUTO')
+
+    # The memoized results are not altered by the caller
+    index.search('titan').clear()
+    assert index.search('titan') == [bodies[0]]
+
+
+def test_index_find(bodies):
+    """Test index find by id, exact name or partial name."""
+    index = Index(bodies)
+
+    assert index.find(602) == [bodies[2]]
+    assert index.find('CASSINI') == [bodies[1]]
+    assert index.find('Cassini') == [bodies[4]]
+    assert index.find('cassini') == [bodies[1], bodies[4]]
+    assert index.find('huygens') == [bodies[3]]
+    assert index.find('enc') == [bodies[2]]
+    assert not index.find('PLUTO')
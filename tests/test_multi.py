@@ -0,0 +1,253 @@
+"""Test WGC multiple APIs load balancing and failover."""
+
+from pytest import fixture, raises
+
+from requests.exceptions import HTTPError
+
+from webgeocalc import Api, MultiApi, StateVector
+from webgeocalc.breaker import CircuitBreaker
+from webgeocalc.errors import APIError, APIUnavailable
+
+
+JPL = 'https://jpl.test/webgeocalc/api'
+ESA = 'https://esa.test/webgeocalc/api'
+
+
+def kernel_sets(*kernel_sets):
+    """Kernel sets API response."""
+    return {'status': 'OK', 'resultType': 'KernelSetDetails', 'items': [
+        {'caption': caption, 'kernelSetId': str(kernel_set_id)}
+        for caption, kernel_set_id in kernel_sets
+    ]}
+
+
+def phase(calculation_id, name, position=None):
+    """Calculation phase API response."""
+    result = {'phase': name}
+    if position is not None:
+        result['position'] = position
+    return {'status': 'OK', 'calculationId': calculation_id, 'result': result}
+
+
+@fixture
+def mock_apis(requests_mock):
+    """Mock JPL-like and ESA-like APIs with different kernel sets ids."""
+    requests_mock.get(JPL + '/kernel-sets', json=kernel_sets(
+        ('Solar System Kernels', 1), ('Cassini Huygens', 5)))
+    requests_mock.get(ESA + '/kernel-sets', json=kernel_sets(
+        ('Cassini Huygens', 12), ('Rosetta', 30)))
+
+    requests_mock.post(JPL + '/calculation/new', json=phase('jpl-1', 'QUEUED', 10))
+    requests_mock.post(ESA + '/calculation/new', json=phase('esa-1', 'STARTING'))
+
+    for url, calculation_id in ((JPL, 'jpl-1'), (ESA, 'esa-1')):
+        requests_mock.get(f'{url}/calculation/{calculation_id}',
+                          json=phase(calculation_id, 'COMPLETE'))
+        requests_mock.get(f'{url}/calculation/{calculation_id}/cancel',
+                          json=phase(calculation_id, 'CANCELLED'))
+        requests_mock.get(f'{url}/calculation/{calculation_id}/results', json={
+            'status': 'OK', 'calculationId': calculation_id,
+            'columns': [{'name': 'Server', 'outputID': 'SERVER'}],
+            'rows': [[url]],
+        })
+
+    return requests_mock
+
+
+def test_multi_api(mock_apis):
+    """Test multiple APIs load balancing and kernel sets mapping."""
+    with raises(ValueError):
+        _ = MultiApi()
+
+    api = MultiApi(Api(JPL, retry=False), ESA)
+
+    assert str(api) == f'{JPL}, {ESA}'
+    assert repr(api) == f'<MultiApi> {JPL}, {ESA}'
+    assert api.url == JPL
+    assert int(api.kernel_set('Cassini')) == 5
+
+    payload = {'kernels': [{'type': 'KERNEL_SET', 'id': 5},
+                           {'type': 'KERNEL', 'path': 'pds/test.bsp'}]}
+
+    # First submission on the first API
+    assert api.new_calculation(payload)[0] == 'jpl-1'
+    assert api.status()[JPL]['queue'] == 10
+    assert api.status()[JPL]['in_flight'] == 1
+
+    # Next submission on the least loaded API, with its own kernel set id
+    assert api.new_calculation(payload)[0] == 'esa-1'
+    assert mock_apis.last_request.json() == {
+        'kernels': [{'type': 'KERNEL_SET', 'id': 12},
+                    {'type': 'KERNEL', 'path': 'pds/test.bsp'}]}
+
+    # Calculations requests routed to their API
+    assert api.phase_calculation('esa-1')[1] == 'COMPLETE'
+    _, rows = api.results_calculation('esa-1')
+    assert rows == [[ESA]]
+    assert api.status()[ESA]['in_flight'] == 0
+
+    assert api.cancel_calculation('jpl-1')[1] == 'CANCELLED'
+    assert api.status()[JPL]['in_flight'] == 0
+
+    # Kernel set not available on the second API
+    assert api.new_calculation({'kernels': [{'type': 'KERNEL_SET', 'id': 1}]}
+                               )[0] == 'jpl-1'
+
+    with api:
+        pass
+
+
+def test_multi_api_failover(mock_apis):
+    """Test multiple APIs failover."""
+    api = MultiApi(Api(JPL, retry=False), Api(ESA, retry=False), cooldown=60)
+    payload = {'kernels': [{'type': 'KERNEL_SET', 'id': 5}]}
+
+    mock_apis.post(JPL + '/calculation/new', status_code=503)
+
+    assert api.new_calculation(payload)[0] == 'esa-1'
+    assert not api.status()[JPL]['healthy']
+    assert api.status()[ESA]['healthy']
+
+    # Unhealthy API skipped during its cool down period
+    assert api.new_calculation({'kernels': []})[0] == 'esa-1'
+    assert mock_apis.call_count == 5  # 1 failure + 2 kernel sets + 2 submissions
+
+    with raises(APIUnavailable):
+        _ = api.new_calculation({'kernels': [{'type': 'KERNEL_SET', 'id': 1}]})
+
+    # Open circuit
+    api.apis[1].breaker = CircuitBreaker(failures=1)
+    api.apis[1].breaker.failure()
+
+    with raises(APIUnavailable):
+        _ = api.new_calculation(payload)
+
+    api.apis[1].breaker = None
+
+    # Client errors are not retried on the other APIs
+    mock_apis.post(ESA + '/calculation/new', status_code=400)
+
+    with raises(HTTPError):
+        _ = api.new_calculation(payload)
+
+    assert api.status()[ESA]['healthy']
+
+
+def test_multi_api_calculation(mock_apis):
+    """Test calculation submitted on multiple APIs."""
+    api = MultiApi(JPL, ESA)
+    mock_apis.post(JPL + '/calculation/new', json=phase('jpl-1', 'STARTING'))
+
+    calc = StateVector(
+        api=api,
+        kernels='Cassini Huygens',
+        times='2012-10-19T08:24:00.000',
+        target='TITAN',
+        observer='CASSINI',
+        reference_frame='CASSINI_ISS_NAC',
+        verbose=False,
+    )
+
+    assert calc.api is api
+    assert calc.payload['kernels'] == [{'type': 'KERNEL_SET', 'id': 5}]
+    assert calc.run() == {'SERVER': JPL}
+
+
+def test_multi_api_routes(mock_apis):
+    """Test calculations routes kept on transient failures."""
+    api = MultiApi(Api(JPL, retry=False), Api(ESA, retry=False))
+    mock_apis.post(JPL + '/calculation/new', json=phase('jpl-1', 'STARTING'))
+
+    with raises(AttributeError):
+        _ = api._private  # pylint: disable=protected-access
+
+    mock_apis.get(JPL + '/', json={'version': '2.2.0'})
+    assert api['version'] == '2.2.0'
+
+    # Payload without kernels
+    assert api.new_calculation({'times': []})[0] == 'jpl-1'
+    assert api.new_calculation({'times': []})[0] == 'esa-1'
+
+    # Transient failure: the results are downloaded again from the same API
+    mock_apis.get(ESA + '/calculation/esa-1/results', [
+        {'status_code': 502},
+        {'json': {'status': 'OK', 'columns': [], 'rows': [[ESA]]}},
+    ])
+
+    with raises(HTTPError):
+        _ = api.results_calculation('esa-1')
+
+    assert api.status()[ESA]['in_flight'] == 1
+    assert api.results_calculation('esa-1')[1] == [[ESA]]
+    assert api.status()[ESA]['in_flight'] == 0
+
+    # Terminal failure
+    mock_apis.get(JPL + '/calculation/jpl-1/cancel', json={
+        'status': 'ERROR', 'error': {'shortDescription': 'Unknown calculation'}})
+
+    with raises(APIError):
+        _ = api.cancel_calculation('jpl-1')
+
+    assert api.status()[JPL]['in_flight'] == 0
+
+    # Failed calculation
+    mock_apis.get(JPL + '/calculation/jpl-1', json=phase('jpl-1', 'FAILED'))
+    mock_apis.get(ESA + '/calculation/esa-1', json=phase('esa-1', 'FAILED'))
+
+    calculation_id, _ = api.new_calculation({'times': []})
+    assert api.phase_calculation(calculation_id)[1] == 'FAILED'
+    assert all(status['in_flight'] == 0 for status in api.status().values())
+
+
+def test_multi_api_routes_released(mock_apis):  # pylint: disable=unused-argument
+    """Test calculations routes of complete and abandoned calculations."""
+    api = MultiApi(Api(ESA, retry=False), ttl=60)
+
+    # Complete: not in flight anymore, but its results are still routed
+    assert api.new_calculation({'times': []})[0] == 'esa-1'
+    assert api.phase_calculation('esa-1')[1] == 'COMPLETE'
+    assert api.status()[ESA]['in_flight'] == 0
+    assert api.phase_calculation('esa-1')[1] == 'COMPLETE'
+    assert api.status()[ESA]['in_flight'] == 0
+    assert api.results_calculation('esa-1')[1] == [[ESA]]
+
+    # Abandoned (eg. timed out): released after its ttl
+    api.new_calculation({'times': []})
+    assert api.status()[ESA]['in_flight'] == 1
+
+    for route in api._routes.values():  # pylint: disable=protected-access
+        route.created -= 120
+
+    api.new_calculation({'times': []})
+    assert api.status()[ESA]['in_flight'] == 1
+    assert len(api._routes) == 1  # pylint: disable=protected-access
+
+
+def test_multi_api_ambiguous_kernel_set(mock_apis):
+    """Test kernel set caption matching several kernel sets on an API."""
+    mock_apis.get(ESA + '/kernel-sets', json=kernel_sets(
+        ('Cassini Huygens', 12), ('Cassini Huygens', 13)))
+
+    api = MultiApi(Api(JPL, retry=False), Api(ESA, retry=False))
+    assert len(api.kernel_sets()) == 2
+    api.apis[0].breaker = CircuitBreaker(failures=1)
+    api.apis[0].breaker.failure()
+
+    with raises(APIUnavailable):
+        _ = api.new_calculation({'kernels': [{'type': 'KERNEL_SET', 'id': 5}]})
+
+
+def test_multi_api_partial_kernel_set(mock_apis):
+    """Test kernel set caption only partially matched on an API."""
+    mock_apis.get(ESA + '/kernel-sets', json=kernel_sets(
+        ('Solar System Kernels (legacy 2015)', 9)))
+
+    api = MultiApi(Api(JPL, retry=False), Api(ESA, retry=False))
+    assert len(api.kernel_sets()) == 2
+    api.apis[0].breaker = CircuitBreaker(failures=1)
+    api.apis[0].breaker.failure()
+
+    with raises(APIUnavailable):
+        _ = api.new_calculation({'kernels': [{'type': 'KERNEL_SET', 'id': 1}]})
+
+    assert mock_apis.call_count == 2  # Kernel sets only (not submitted)
@@ -0,0 +1,79 @@
+"""Test WGC calculation phases."""
+
+import time
+
+from webgeocalc.phase import CalculationPhase, CalculationStatus, Phase
+
+
+def test_phase():
+    """Test phase enum."""
+    assert Phase('COMPLETE') is Phase.COMPLETE
+    assert Phase.COMPLETE == 'COMPLETE'
+    assert str(Phase.NOT_SUBMITTED) == 'NOT SUBMITTED'
+    assert Phase('FOO') is Phase.UNKNOWN
+
+    assert Phase.CANCELLED.failed
+    assert not Phase.CALCULATING.failed
+
+
+def test_calculation_phase():
+    """Test API calculation phase."""
+    phase = CalculationPhase.from_result({'phase': 'QUEUED', 'position': 6})
+
+    assert phase == 'QUEUED | POSITION: 6'
+    assert repr(phase) == '<CalculationPhase> QUEUED | POSITION: 6'
+    assert phase.phase is Phase.QUEUED
+    assert phase.position == 6
+    assert phase.progress is None
+
+    phase = CalculationPhase.from_result({'phase': 'CALCULATING', 'progress': 42})
+
+    assert phase == 'CALCULATING'
+    assert phase.position is None
+    assert phase.progress == 42
+
+    # Unknown phase (raw API name kept)
+    phase = CalculationPhase('CANCELLING')
+
+    assert phase == 'CANCELLING'
+    assert phase.phase is Phase.UNKNOWN
+    assert phase.raw == 'CANCELLING'
+    assert CalculationPhase(Phase.UNKNOWN) == 'UNKNOWN'
+
+
+def test_calculation_status():
+    """Test calculation status transitions."""
+    status = CalculationStatus()
+
+    assert str(status) == 'NOT SUBMITTED'
+    assert repr(status) == '<CalculationStatus> NOT SUBMITTED'
+    assert not status.complete
+    assert not status.failed
+
+    status.update(CalculationPhase('QUEUED', position=2))
+    status.update(CalculationPhase('QUEUED', position=1))
+
+    assert str(status) == 'QUEUED | POSITION: 1'
+    assert status.position == 1
+
+    time.sleep(0.01)
+    status.update('CALCULATING')
+    status.update(CalculationPhase('COMPLETE', progress=100))
+
+    assert status.complete
+    assert status.progress == 100
+    assert [phase for phase, _ in status.transitions] == [
+        Phase.NOT_SUBMITTED, Phase.QUEUED, Phase.CALCULATING, Phase.COMPLETE,
+    ]
+
+    assert status.duration('QUEUED') >= 0.01
+    assert status.duration(Phase.COMPLETE) >= 0
+    assert status.duration('FAILED') == 0
+
+    status.update('CANCELLING')
+    assert str(status) == 'CANCELLING'
+    assert status.phase is Phase.UNKNOWN
+
+    status.update('EXPIRED')
+    assert status.failed
+    assert str(status) == 'EXPIRED'
@@ -0,0 +1,202 @@
+"""Test WGC shared calculations poller."""
+
+import time
+
+from pytest import fixture, raises
+
+from webgeocalc import Api, Calculation
+from webgeocalc.breaker import CircuitBreaker
+from webgeocalc.errors import (APIResponseError, CalculationFailed, CalculationTimeOut,
+                               CircuitOpen)
+from webgeocalc.poller import POLLER, Poller
+from webgeocalc.vars import JPL_URL
+
+
+@fixture
+def params():
+    """Input parameters for generic calculation."""
+    return {
+        "calculation_type": "STATE_VECTOR",
+        "kernels": 5,
+        "times": "2012-10-19T08:24:00.000",
+        "target": "ENCELADUS",
+        "observer": "CASSINI",
+        "reference_frame": "CASSINI_ISS_NAC",
+        "verbose": False,
+    }
+
+
+@fixture
+def calc_id():
+    """Calculation id."""
+    return '5d009079-aa9e-4fbd-93c3-58b5a4990a68'
+
+
+def phase(calc_id, value):
+    """API phase response."""
+    return {
+        "status": "OK",
+        "calculationId": calc_id,
+        "result": {"phase": value},
+    }
+
+
+def wait_stopped(poller):
+    """Wait for the poller thread to stop."""
+    for _ in range(100):
+        if poller._thread is None:  # pylint: disable=protected-access
+            break
+        time.sleep(0.01)
+
+    assert poller._thread is None  # pylint: disable=protected-access
+
+
+@fixture
+def results(calc_id):
+    """Results expected from the API."""
+    return {
+        "status": "OK",
+        "calculationId": calc_id,
+        "columns": [{"name": "UTC calendar date", "outputID": "DATE"}],
+        "rows": [["2012-10-19 08:24:00.000000 UTC"]],
+    }
+
+
+def test_poller_watch(requests_mock, params, calc_id, results):
+    """Test calculations watched by a shared poller."""
+    poller = Poller(interval=0.001, workers=2)
+    assert repr(poller) == '<Poller> 0 calculation(s) in flight'
+
+    requests_mock.post(JPL_URL + '/calculation/new',
+                       json=phase(calc_id, 'LOADING_KERNELS'))
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}', [
+        {'json': phase(calc_id, 'CALCULATING')},
+        {'json': phase(calc_id, 'COMPLETE')},
+    ])
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}/results', json=results)
+
+    done = []
+    calc = Calculation(**params)
+    future = calc.watch(poller=poller, callback=done.append)
+
+    assert calc.id == calc_id
+    assert future.result(timeout=5) == {'DATE': '2012-10-19 08:24:00.000000 UTC'}
+    assert done == [future]
+
+    # The poller thread stops when no calculation is in flight
+    for _ in range(100):
+        if poller._thread is None:  # pylint: disable=protected-access
+            break
+        time.sleep(0.01)
+
+    assert len(poller) == 0
+
+
+def test_poller_errors(requests_mock, params, calc_id):
+    """Test calculations failures in the shared poller."""
+    requests_mock.post(JPL_URL + '/calculation/new', json=phase(calc_id, 'STARTING'))
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}', [
+        {'json': phase(calc_id, 'FAILED')},
+        {'json': phase(calc_id, 'STARTING')},
+        {'status_code': 500},
+    ])
+
+    poller = Poller(interval=0.001)
+
+    with raises(CalculationFailed):
+        Calculation(**params).watch(poller=poller).result(timeout=5)
+
+    with raises(CalculationTimeOut):
+        Calculation(**params).watch(timeout=0, poller=poller).result(timeout=5)
+
+    with raises(IOError):
+        Calculation(**params).watch(poller=poller).result(timeout=5)
+
+
+def test_poller_unexpected_errors(requests_mock, params, calc_id, results):
+    """Test unexpected errors in the shared poller."""
+    requests_mock.post(JPL_URL + '/calculation/new', json=phase(calc_id, 'STARTING'))
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}', [
+        {'json': {'status': 'OK', 'weird': 1}},
+        {'json': phase(calc_id, 'COMPLETE')},
+    ])
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}/results', json=results)
+
+    poller = Poller(interval=0.001)
+
+    with raises(APIResponseError):
+        Calculation(**params).watch(poller=poller).result(timeout=5)
+
+    # The poller still updates the next calculations
+    future = Calculation(**params).watch(poller=poller)
+    assert future.result(timeout=5) == {'DATE': '2012-10-19 08:24:00.000000 UTC'}
+
+    # Crashed polling thread
+    def crash():
+        raise RuntimeError('crash')
+
+    wait_stopped(poller)
+    poller._rounds = crash  # pylint: disable=protected-access
+
+    with raises(RuntimeError):
+        Calculation(**params).watch(poller=poller).result(timeout=5)
+
+    wait_stopped(poller)
+    assert len(poller) == 0
+
+
+def test_poller_circuit_open(requests_mock, params, calc_id, results):
+    """Test calculations updates deferred while the API circuit is open."""
+    requests_mock.post(JPL_URL + '/calculation/new', json=phase(calc_id, 'STARTING'))
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}',
+                      json=phase(calc_id, 'COMPLETE'))
+    requests_mock.get(JPL_URL + f'/calculation/{calc_id}/results', json=results)
+
+    poller = Poller(interval=0.001)
+    api = Api(JPL_URL, breaker=CircuitBreaker(failures=1, reset_timeout=0.05))
+
+    calc = Calculation(api=api, **params)
+    calc.submit()
+    api.breaker.failure()
+
+    future = calc.watch(poller=poller)
+    assert future.result(timeout=5) == {'DATE': '2012-10-19 08:24:00.000000 UTC'}
+    assert api.breaker.state == 'closed'
+
+    # Outage longer than the calculation time out
+    api.breaker = CircuitBreaker(failures=1, reset_timeout=10)
+
+    calc = Calculation(api=api, **params)
+    calc.submit()
+    api.breaker.failure()
+
+    with raises(CircuitOpen):
+        calc.watch(timeout=0.05, poller=poller).result(timeout=5)
+
+    # Half-open circuit with a probe already in flight
+    api.breaker = CircuitBreaker(failures=1, reset_timeout=0)
+    api.breaker.failure()
+    api.breaker.allow()
+
+    rejected = []
+    allow = api.breaker.allow
+
+    def count(url=''):
+        try:
+            allow(url)
+        except CircuitOpen:
+            rejected.append(url)
+            raise
+
+    api.breaker.allow = count
+
+    with raises(CircuitOpen) as err:
+        calc.watch(timeout=0.25, poller=poller).result(timeout=5)
+
+    assert err.value.retry_in == 0
+    assert len(rejected) <= 5
+
+
+def test_process_poller():
+    """Test process-wide poller."""
+    assert isinstance(POLLER, Poller)
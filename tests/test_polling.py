@@ -0,0 +1,50 @@
+"""Test WGC calculation polling policy."""
+
+from pytest import approx, raises
+
+from webgeocalc.errors import CalculationTimeOut
+from webgeocalc.phase import CalculationPhase
+from webgeocalc.polling import Polling
+
+
+def test_polling_backoff():
+    """Test adaptive polling delays."""
+    polling = Polling(timeout=60, sleep=1, initial=0.1, factor=2, jitter=0)
+
+    assert repr(polling).startswith('<Polling> 0 attempt(s) (')
+
+    # Fast polls after submission, then exponential backoff up to `sleep`
+    delays = [polling.delay(CalculationPhase('LOADING_KERNELS')) for _ in range(6)]
+    assert delays == approx([0.1, 0.2, 0.4, 0.8, 1, 1])
+
+    # Backoff restart on phase change
+    assert polling.delay(CalculationPhase('CALCULATING')) == approx(0.1)
+    assert polling.attempts == 7
+
+
+def test_polling_queued():
+    """Test polling delays scaled on the queue position."""
+    polling = Polling(timeout=60, sleep=1, jitter=0, per_position=0.5, max_queued=5)
+
+    assert polling.delay(CalculationPhase('QUEUED', position=6)) == approx(3)
+    assert polling.delay(CalculationPhase('QUEUED', position=2)) == approx(1)
+    assert polling.delay(CalculationPhase('QUEUED', position=30)) == approx(5)
+    assert polling.delay(CalculationPhase('QUEUED')) == approx(0.8)
+
+
+def test_polling_jitter():
+    """Test polling delays jitter."""
+    polling = Polling(initial=1, jitter=0.5)
+
+    for _ in range(10):
+        assert 0.5 <= polling.delay(CalculationPhase('STARTING')) <= 1.5
+
+
+def test_polling_deadline():
+    """Test polling deadline."""
+    polling = Polling(timeout=0.5, sleep=10, initial=10, jitter=0)
+
+    assert polling.delay(CalculationPhase('STARTING')) <= 0.5
+
+    with raises(CalculationTimeOut):
+        Polling(timeout=0).delay(CalculationPhase('STARTING'))
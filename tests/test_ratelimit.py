@@ -0,0 +1,94 @@
+"""Test WGC API requests rate limiter."""
+
+import threading
+import time
+
+from pytest import raises
+
+from webgeocalc import Api
+from webgeocalc.ratelimit import RateLimiter
+
+
+URL = 'https://wgc.obspm.fr/webgeocalc/api'
+
+
+class CountingRateLimiter(RateLimiter):
+    """Rate limiter counting the acquired tokens."""
+
+    def __init__(self, rate, burst=1):
+        super().__init__(rate, burst=burst)
+        self.count = 0
+
+    def acquire(self):
+        """Count and wait for a token."""
+        self.count += 1
+        return super().acquire()
+
+
+def test_rate_limiter():
+    """Test token bucket rate limiter."""
+    limiter = RateLimiter(100, burst=2)
+    assert repr(limiter) == '<RateLimiter> 100 req/s (burst: 2)'
+
+    # Burst
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+
+    # Reserved tokens
+    assert 0 < limiter.reserve() <= 0.01
+    assert 0.005 < limiter.reserve() <= 0.02
+
+    time.sleep(0.05)
+    assert limiter.reserve() == 0
+
+    with raises(ValueError):
+        _ = RateLimiter(0)
+
+
+def test_rate_limiter_threads():
+    """Test rate limiter shared by threads."""
+    limiter = RateLimiter(200)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(10)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join(5)
+
+    # 1 token available at start, then 1 token every 5 ms
+    assert time.monotonic() - start >= 9 / 200
+
+
+def test_api_rate_limits(requests_mock):
+    """Test API submissions and polling rate limits."""
+    calc_id = '0788aba2-d4e5-4028-9ef1-4867ad5385e0'
+    phase = {'status': 'OK', 'calculationId': calc_id, 'result': {'phase': 'COMPLETE'}}
+
+    requests_mock.get(URL + '/', json={'version': '2.8.2'})
+    requests_mock.post(URL + '/calculation/new', json=phase)
+    requests_mock.get(URL + f'/calculation/{calc_id}', json=phase)
+
+    api = Api(URL)
+    assert api.submit_limiter is None
+    assert api.poll_limiter is None
+
+    assert repr(Api(URL, poll_rate=2000).poll_limiter) == \
+        '<RateLimiter> 2000 req/s (burst: 1)'
+
+    submit, poll = CountingRateLimiter(1000), CountingRateLimiter(1000)
+    api = Api(URL, submit_rate=submit, poll_rate=poll)
+
+    assert api.submit_limiter is submit
+    assert api.poll_limiter is poll
+
+    for _ in range(3):
+        api.new_calculation({})
+        api.phase_calculation(calc_id)
+        _ = api.metadata
+
+    # Each endpoint consumes its own budget (the metadata are not limited)
+    assert submit.count == 3
+    assert poll.count == 3
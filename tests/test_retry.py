@@ -0,0 +1,134 @@
+"""Test WGC API requests retry policy."""
+
+from email.utils import formatdate
+
+from pytest import approx, fixture, raises
+
+from requests import HTTPError
+from requests.exceptions import ConnectTimeout, ReadTimeout
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from webgeocalc import Api
+from webgeocalc.retry import RETRY, Retry
+
+
+URL = 'https://wgc.obspm.fr/webgeocalc/api'
+
+
+class Response:  # pylint: disable=too-few-public-methods
+    """Fake API response."""
+
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {} if retry_after is None else {'Retry-After': retry_after}
+
+
+@fixture
+def phase():
+    """Calculation phase API response."""
+    return {
+        'status': 'OK',
+        'calculationId': '0788aba2-d4e5-4028-9ef1-4867ad5385e0',
+        'result': {'phase': 'COMPLETE'},
+    }
+
+
+def test_retry_retryable():
+    """Test retryable failures."""
+    retry = Retry(total=2)
+
+    assert repr(retry) == '<Retry> total: 2'
+    assert repr(RETRY) == '<Retry> total: 3'
+
+    # Idempotent requests
+    assert retry.retryable('GET', 0, response=Response(503))
+    assert retry.retryable('get', 1, response=Response(429))
+    assert not retry.retryable('GET', 2, response=Response(503))
+    assert not retry.retryable('GET', 0, response=Response(500))
+    assert retry.retryable('GET', 0, error=RequestsConnectionError())
+    assert retry.retryable('GET', 0, error=ReadTimeout())
+
+    # Non-idempotent requests
+    assert retry.retryable('POST', 0, response=Response(429))
+    assert not retry.retryable('POST', 0, response=Response(503))
+    assert not retry.retryable('POST', 0, error=ReadTimeout())
+    assert not retry.retryable('POST', 0, error=RequestsConnectionError())
+    assert retry.retryable('POST', 0, error=ConnectTimeout())
+
+    not_connected = MaxRetryError(None, URL, NewConnectionError(None, 'Refused'))
+    assert retry.retryable('POST', 0, error=RequestsConnectionError(not_connected))
+    assert not retry.retryable('POST', 2, error=RequestsConnectionError(not_connected))
+
+    assert not Retry(total=0).retryable('GET', 0, response=Response(503))
+
+
+def test_retry_delay():
+    """Test retry exponential backoff and Retry-After delays."""
+    retry = Retry(backoff=0.5, factor=2, max_backoff=3, jitter=0)
+
+    assert retry.delay(0) == 0.5
+    assert retry.delay(1) == 1
+    assert retry.delay(2) == 2
+    assert retry.delay(3) == 3
+
+    assert 0.9 <= Retry(backoff=1, jitter=0.1).delay(0) <= 1.1
+
+    assert retry.delay(0, response=Response(503)) == 0.5
+    assert retry.delay(0, response=Response(503, '2')) == 2
+    assert retry.delay(0, response=Response(503, '120')) == 3
+    assert retry.delay(0, response=Response(503, 'soon')) == 0.5
+
+    assert Retry.retry_after(None) is None
+    assert Retry.retry_after(Response(503, '-1')) == 0
+    assert Retry.retry_after(Response(503, formatdate(0))) == 0
+    assert Retry.retry_after(Response(503, formatdate(usegmt=True))) == approx(0, abs=1)
+
+
+def test_api_retry(requests_mock, phase):
+    """Test API requests retries."""
+    api = Api(URL, retry=Retry(backoff=0, jitter=0))
+
+    mock = requests_mock.get(URL + '/calculation/0788', [
+        {'status_code': 503},
+        {'status_code': 429, 'headers': {'Retry-After': '0'}},
+        {'exc': RequestsConnectionError},
+        {'json': phase},
+    ])
+    assert api.phase_calculation('0788') == (phase['calculationId'], 'COMPLETE')
+    assert mock.call_count == 4
+
+    # Too many failures
+    mock = requests_mock.get(URL + '/calculation/0788', status_code=502)
+    with raises(HTTPError):
+        api.phase_calculation('0788')
+    assert mock.call_count == 4
+
+    # Submissions are not retried if they may have been received
+    mock = requests_mock.post(URL + '/calculation/new', [
+        {'status_code': 429},
+        {'status_code': 503},
+    ])
+    with raises(HTTPError):
+        api.new_calculation({})
+    assert mock.call_count == 2
+
+    mock = requests_mock.post(URL + '/calculation/new', exc=ReadTimeout)
+    with raises(ReadTimeout):
+        api.new_calculation({})
+    assert mock.call_count == 1
+
+
+def test_api_retry_disabled(requests_mock):
+    """Test API without retries."""
+    assert Api(URL).retry is RETRY
+    assert Api(URL, retry=True).retry is RETRY
+
+    api = Api(URL, retry=False)
+    assert api.retry.total == 0
+
+    mock = requests_mock.get(URL + '/calculation/0788', status_code=503)
+    with raises(HTTPError):
+        api.phase_calculation('0788')
+    assert mock.call_count == 1
@@ -0,0 +1,98 @@
+"""Test WGC API requests statistics."""
+
+from pytest import raises
+
+from requests import HTTPError
+
+from webgeocalc import Api
+from webgeocalc.retry import Retry
+from webgeocalc.stats import ApiStats, EndpointStats, endpoint
+
+
+URL = 'https://wgc.obspm.fr/webgeocalc/api'
+CALC_ID = '0788aba2-d4e5-4028-9ef1-4867ad5385e0'
+
+
+def test_endpoint():
+    """Test API endpoints normalization."""
+    assert endpoint('/') == '/'
+    assert endpoint('/kernel-sets') == '/kernel-sets'
+    assert endpoint('/kernel-set/5/bodies') == '/kernel-set/{id}/bodies'
+    assert endpoint('/calculation/new') == '/calculation/new'
+    assert endpoint(f'/calculation/{CALC_ID}') == '/calculation/{id}'
+    assert endpoint(f'/calculation/{CALC_ID}/results') == '/calculation/{id}/results'
+    assert endpoint(f'/calculation/{CALC_ID}/cancel') == '/calculation/{id}/cancel'
+
+
+def test_endpoint_stats():
+    """Test endpoint statistics."""
+    stats = EndpointStats()
+    assert repr(stats) == '<EndpointStats> 0 request(s)'
+    assert stats.as_dict()['latency']['mean'] is None
+
+    stats.record(0.2, nbytes=100)
+    stats.record(0.02, nbytes=50, retry=True)
+    stats.record(120, error=True)
+
+    assert repr(stats) == '<EndpointStats> 3 request(s)'
+
+    summary = stats.as_dict()
+    assert summary['count'] == 3
+    assert summary['errors'] == 1
+    assert summary['retries'] == 1
+    assert summary['bytes'] == 150
+    assert summary['latency']['total'] == 120.22
+    assert summary['latency']['mean'] == 120.22 / 3
+    assert summary['latency']['min'] == 0.02
+    assert summary['latency']['max'] == 120
+    assert summary['histogram'][0.05] == 1
+    assert summary['histogram'][0.25] == 1
+    assert summary['histogram'][float('inf')] == 1
+    assert sum(summary['histogram'].values()) == 3
+
+
+def test_api_stats(requests_mock):
+    """Test API requests statistics."""
+    phase = {'status': 'OK', 'calculationId': CALC_ID, 'result': {'phase': 'COMPLETE'}}
+
+    requests_mock.get(URL + '/kernel-sets', json={
+        'status': 'OK', 'resultType': 'KernelSetDetails', 'items': []})
+    requests_mock.post(URL + '/calculation/new', json=phase)
+    requests_mock.get(URL + f'/calculation/{CALC_ID}', [
+        {'status_code': 503},
+        {'json': phase},
+    ])
+    requests_mock.get(URL + f'/calculation/{CALC_ID}/results', status_code=404)
+
+    api = Api(URL, retry=Retry(backoff=0, jitter=0))
+    stats = api._stats  # pylint: disable=protected-access
+    assert isinstance(stats, ApiStats)
+    assert repr(stats) == '<ApiStats> 0 endpoint(s)'
+    assert not api.stats()
+
+    api.kernel_sets()
+    api.kernel_sets()  # cached in memory
+    api.new_calculation({})
+    api.phase_calculation(CALC_ID)
+
+    with raises(HTTPError):
+        api.results_calculation(CALC_ID)
+
+    stats = api.stats()
+    assert list(stats) == ['/kernel-sets', '/calculation/new',
+                           '/calculation/{id}', '/calculation/{id}/results']
+
+    assert stats['/kernel-sets']['count'] == 1
+    assert stats['/calculation/new']['count'] == 1
+    assert stats['/calculation/new']['bytes'] > 0
+
+    assert stats['/calculation/{id}']['count'] == 2
+    assert stats['/calculation/{id}']['errors'] == 1
+    assert stats['/calculation/{id}']['retries'] == 1
+
+    assert stats['/calculation/{id}/results']['count'] == 1
+    assert stats['/calculation/{id}/results']['errors'] == 1
+    assert stats['/calculation/{id}/results']['retries'] == 0
+
+    api.reset_stats()
+    assert not api.stats()
@@ -0,0 +1,105 @@
+"""Test WGC local API stand-in server."""
+
+from pytest import fixture, raises
+
+from requests.exceptions import HTTPError
+
+from webgeocalc import Api, StateVector, run_many
+from webgeocalc.errors import APIError, CalculationFailed
+from webgeocalc.poller import Poller
+from webgeocalc.testing import LocalServer
+
+
+@fixture
+def server():
+    """Local API server."""
+    with LocalServer(workers=4, phase_duration=0.001, rows=3, seed=1) as local:
+        yield local
+
+
+def calcs(api, n):
+    """List of state vector calculations."""
+    return [
+        StateVector(
+            api=api,
+            kernels=5,
+            times='2012-10-19T08:24:00.000',
+            target='TITAN',
+            observer='CASSINI',
+            reference_frame='CASSINI_ISS_NAC',
+            verbose=False,
+        ) for _ in range(n)
+    ]
+
+
+def test_local_server_catalogs(server):
+    """Test local server metadata and catalogs."""
+    api = Api(server.url)
+
+    assert repr(server) == f'<LocalServer> {server.url}'
+    assert api['version'] == 'local'
+
+    assert int(api.kernel_set('Cassini')) == 5
+    assert int(api.body(5, 'TITAN')) == 606
+    assert int(api.frame(5, 'IAU_TITAN')) == 10044
+    assert int(api.instrument(5, 'CASSINI_ISS_NAC')) == -82360
+
+    assert api.session.get(server.url + '/unknown').status_code == 404
+
+    with raises(HTTPError):
+        _ = api.phase_calculation('unknown')
+
+
+def test_local_server_run(server):
+    """Test local server calculations run."""
+    api = Api(server.url)
+    out = run_many(calcs(api, 20), max_in_flight=8, poller=Poller(interval=0.001))
+
+    assert len(server.calculations) == 20
+    assert all(res['DATE'] == ['2000-01-01 00:00:00.000000 UTC',
+                               '2000-01-01 00:00:01.000000 UTC',
+                               '2000-01-01 00:00:02.000000 UTC'] for res in out)
+
+    # Failed calculations
+    server.failure_rate = 1
+    calc, = calcs(api, 1)
+
+    with raises(CalculationFailed):
+        calc.run(sleep=0.001)
+
+
+def test_local_server_queue():
+    """Test local server queue depth and cancellation."""
+    with LocalServer(workers=1, max_queue=2, phase_duration=10) as server:
+        api = Api(server.url, retry=False)
+        first, second, third, fourth = calcs(api, 4)
+
+        first.submit()
+        second.submit()
+        third.submit()
+
+        assert first.phase == 'STARTING'
+        assert second.phase == 'QUEUED | POSITION: 1'
+        assert third.status.position == 2
+
+        with raises(HTTPError):
+            fourth.submit()
+
+        with raises(APIError):
+            _ = api.results_calculation(first.id)
+
+        first.cancel()
+        assert first.phase == 'CANCELLED'
+
+
+def test_local_server_errors():
+    """Test local server transient errors."""
+    with LocalServer(error_rate=1, latency=0.001) as server:
+        api = Api(server.url, retry=False)
+
+        with raises(HTTPError):
+            _ = api.kernel_sets()
+
+        assert server.requests == 1
+
+    server.stop()
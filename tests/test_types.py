@@ -1,11 +1,86 @@
 """Test WGC type results."""
 
+import pickle
+
 import pytest
 
-from webgeocalc.types import ResultTypeError, get_type
+from webgeocalc.errors import ResultAttributeError
+from webgeocalc.types import (BodyData, ColumnResult, FrameData, KernelSetDetails,
+                              ResultItems, ResultTypeError, get_type)
 
 
 def test_type_err():
     """Test error unknown type results."""
     with pytest.raises(ResultTypeError):
         get_type('WRONG_TYPE')
+
+
+def test_compact_types():
+    """Test compact result types."""
+    frame = FrameData({'id': -82905, 'name': 'CASSINI_KSO',
+                       'centerBodyID': 699, 'frameClass': 5})
+
+    assert not hasattr(frame, '__dict__')
+    assert frame.centerBodyID == 699
+    assert int(frame) == -82905
+    assert 'kso' in frame
+    assert -82905 in frame
+    assert repr(frame) == '<FrameData> CASSINI_KSO (id: -82905)'
+
+    # Shared keys order
+    other = FrameData({'id': 1, 'name': 'J2000', 'centerBodyID': 0, 'frameClass': 1})
+    assert other.keys() is frame.keys()
+
+    # Extra and missing JSON fields
+    column = ColumnResult({'outputID': 'DATE', 'name': 'UTC calendar date',
+                           'format': 'CALENDAR'})
+
+    assert str(column) == 'UTC calendar date'
+    assert column.format == 'CALENDAR'
+    assert column.keys() == ('outputID', 'name', 'format')
+    assert column.values() == ('DATE', 'UTC calendar date', 'CALENDAR')
+    assert dict(column.items()) == {'outputID': 'DATE', 'name': 'UTC calendar date',
+                                    'format': 'CALENDAR'}
+
+    with pytest.raises(ResultAttributeError):
+        _ = column.units
+
+    with pytest.raises(ResultAttributeError):
+        _ = FrameData({'id': 1, 'name': 'J2000'}).wrong_attr
+
+    # Pickle
+    assert pickle.loads(pickle.dumps(column)).items() == column.items()
+
+
+def test_result_items():
+    """Test lazy items sequence."""
+    items = ResultItems(BodyData, [
+        {'id': 606, 'name': 'TITAN'},
+        {'id': -82, 'name': 'CASSINI'},
+        {'id': 602, 'name': 'ENCELADUS'},
+    ])
+
+    assert len(items) == 3
+    assert items._items == [None, None, None]  # pylint: disable=protected-access
+
+    # Find on the raw JSON items
+    assert items.find('titan') == [items[0]]
+    assert items.find(-82) == [items[1]]
+    assert not items.find('PLUTO')
+    assert items._items[2] is None  # pylint: disable=protected-access
+
+    # Items created once
+    assert items[-1] is items[2]
+    assert str(items[2]) == 'ENCELADUS'
+    assert [str(item) for item in items[:2]] == ['TITAN', 'CASSINI']
+
+    assert items == list(items)
+    assert items != 'TITAN'
+    assert repr(items) == ('[<BodyData> TITAN (id: 606), <BodyData> CASSINI (id: -82), '
+                           '<BodyData> ENCELADUS (id: 602)]')
+
+    kernel_sets = ResultItems(KernelSetDetails, [
+        {'caption': 'Cassini Huygens', 'kernelSetId': '5'},
+    ])
+    assert kernel_sets.find(5) == kernel_sets.find('Cassini') == [kernel_sets[0]]
+    assert int(kernel_sets[0]) == 5
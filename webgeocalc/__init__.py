@@ -1,6 +1,7 @@
 """WebGeoCalc module."""
 
-from .api import API, Api, ESA_API, JPL_API
+from .api import API, Api, AsyncApi, ESA_API, JPL_API
+from .batch import batch_timings, run_as_completed, run_many
 from .calculation import Calculation
 from .calculation_types import (AngularSeparation, AngularSize, FrameTransformation,
                                 GFAngularSeparationSearch,
@@ -12,14 +13,17 @@ from .calculation_types import (AngularSeparation, AngularSize, FrameTransformat
                                 OsculatingElements, PhaseAngle, PointingDirection,
                                 StateVector, SubObserverPoint, SubSolarPoint,
                                 SurfaceInterceptPoint, TangentPoint, TimeConversion)
+from .multi import MultiApi
 from .version import __version__
 
 
 __all__ = [
     'Api',
     'API',
+    'AsyncApi',
     'JPL_API',
     'ESA_API',
+    'MultiApi',
     'Calculation',
     'StateVector',
     'AngularSeparation',
@@ -45,5 +49,8 @@ __all__ = [
     'GFPhaseAngleSearch',
     'GFIlluminationAnglesSearch',
     'TimeConversion',
+    'run_many',
+    'run_as_completed',
+    'batch_timings',
     '__version__',
 ]
@@ -1,11 +1,27 @@
 """WebGeoCalc API module."""
 
+import asyncio
+import json as jsonlib
 import os
+import threading
+import time
 
 import requests
-
-from .errors import APIError, APIResponseError, KernelSetNotFound, TooManyKernelSets
-from .types import ColumnResult, KernelSetDetails, get_type
+from requests.adapters import HTTPAdapter
+
+from .breaker import CircuitBreaker, server_failure
+from .cache import MetadataCache, payload_key
+from .cassette import get_cassette
+from .decoder import get_decoder, stream_results
+from .errors import (APIError, APIResponseError, ItemNotFound, KernelSetNotFound,
+                     TooManyItems, TooManyKernelSets)
+from .flight import OnceCache, SingleFlight
+from .hooks import Hooks
+from .phase import CalculationPhase
+from .ratelimit import RateLimiter
+from .retry import RETRY, Retry
+from .stats import ApiStats, endpoint
+from .types import ColumnResult, KernelSetDetails, ResultItems, get_type
 from .vars import ESA_URL, JPL_URL
 
 
@@ -19,13 +35,97 @@ class Api:
         Use ``WGC_URL`` global environment variable if present.
         If not, fallback on :py:obj:`JPL_URL`:
         ``https://wgc2.jpl.nasa.gov:8443/webgeocalc/api``
+    pool_size: int, optional
+        Maximum number of keep-alive connections kept open
+        with the API server (default: ``10``).
+        All the requests made by this API object share the
+        same connection pool.
+    cache: str or webgeocalc.cache.MetadataCache, optional
+        Disk cache (or its directory) of the API metadata and catalogs
+        (kernel sets, bodies, frames and instruments).
+        Use ``WGC_CACHE_DIR`` global environment variable if present.
+        If not, the catalogs are only cached in memory.
+    coalesce: bool, optional
+        Coalesce the identical calculations in flight (disabled by default).
+        The identical payloads submitted while a calculation is still
+        in flight are attached to the same calculation ``id``
+        and share its results (see: :py:class:`~webgeocalc.flight.SingleFlight`).
+    retry: bool or webgeocalc.retry.Retry, optional
+        Retry policy of the transient API failures (connection errors,
+        ``429``, ``502``, ``503`` and ``504`` responses).
+        By default, the shared :py:obj:`webgeocalc.retry.RETRY` policy is used.
+        Use ``False`` to disable the retries.
+    submit_rate: float or webgeocalc.ratelimit.RateLimiter, optional
+        Maximum number of calculations submitted per second
+        (``POST: /calculation/new``). Not limited by default.
+    poll_rate: float or webgeocalc.ratelimit.RateLimiter, optional
+        Maximum number of calculation phase, results and cancellation
+        requests per second (``GET: /calculation/{id}/...``).
+        Not limited by default.
+    on_request: callable, optional
+        Hook called before each HTTP request (see: :py:attr:`hooks`).
+    on_response: callable, optional
+        Hook called after each successful HTTP request.
+    on_error: callable, optional
+        Hook called after each failed HTTP request.
+    cassette: str or webgeocalc.cassette.Cassette, optional
+        Record or replay the API exchanges in a cassette file
+        (see: :py:class:`~webgeocalc.cassette.Cassette`).
+        Use ``WGC_CASSETTE`` global environment variable if present
+        (in ``auto`` mode). The APIs using the same file share the same
+        cassette (see: :py:func:`~webgeocalc.cassette.get_cassette`).
+    breaker: bool, int or webgeocalc.breaker.CircuitBreaker, optional
+        Circuit breaker failing fast all the requests with a
+        :py:class:`~webgeocalc.errors.CircuitOpen` error after
+        consecutive server failures (or their number), until the API
+        responds again (see: :py:class:`~webgeocalc.breaker.CircuitBreaker`).
+        Disabled by default.
+    decoder: str or callable, optional
+        JSON decoder of the API responses (``json``, ``orjson`` or a function).
+        Use ``WGC_JSON_DECODER`` global environment variable if present.
+        By default, ``orjson`` is used if installed
+        (see: :py:func:`webgeocalc.decoder.get_decoder`).
 
     """
 
-    def __init__(self, url=''):
+    def __init__(self, url='', pool_size=10, cache=None, coalesce=False, retry=None,
+                 submit_rate=None, poll_rate=None,
+                 on_request=None, on_response=None, on_error=None, cassette=None,
+                 breaker=None, decoder=None):
         self.url = str(url) if url != '' else os.environ.get('WGC_URL', JPL_URL)
-        self._kernel_sets = None
-        self._meta = None
+        self.pool_size = pool_size
+
+        if cache is None:
+            cache = os.environ.get('WGC_CACHE_DIR') or None
+
+        self.cache = MetadataCache(cache) if isinstance(cache, (str, os.PathLike)) \
+            else cache
+
+        if cassette is None:
+            cassette = os.environ.get('WGC_CASSETTE') or None
+
+        self.cassette = get_cassette(cassette) \
+            if isinstance(cassette, (str, os.PathLike)) else cassette
+
+        self.flights = SingleFlight() if coalesce else None
+        self.retry = retry if isinstance(retry, Retry) else \
+            RETRY if retry in (None, True) else Retry(total=0)
+        self.submit_limiter = self._rate_limiter(submit_rate)
+        self.poll_limiter = self._rate_limiter(poll_rate)
+        self.breaker = breaker if isinstance(breaker, CircuitBreaker) else \
+            CircuitBreaker() if breaker is True else \
+            CircuitBreaker(failures=breaker) if breaker else None
+        self.decoder = get_decoder(decoder)
+        self._stats = ApiStats()
+
+        self.hooks = Hooks('request', 'response', 'error', request=on_request,
+                           response=on_response, error=on_error)
+
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._catalogs = OnceCache()
+        self._indexes = OnceCache()
+        self._meta = OnceCache()
 
     def __str__(self):
         return self.url
@@ -38,6 +138,307 @@ class Api:
             return self.metadata[key]
         raise KeyError(key)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def session(self):
+        """API HTTP session with a keep-alive connection pool.
+
+        The session is created on first use and re-used by all the
+        requests sent to the API (``GET`` and ``POST``).
+        If a :py:attr:`cassette` is provided, the exchanges are
+        recorded in (or replayed from) the cassette.
+
+        """
+        session = self._session
+        if session is not None:
+            return session
+
+        with self._session_lock:
+            if self._session is None:
+                adapter = HTTPAdapter(pool_connections=self.pool_size,
+                                      pool_maxsize=self.pool_size) \
+                    if self.cassette is None else self.cassette.adapter(self.pool_size)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def close(self):
+        """Close the API session and release its pooled connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _rate_limiter(rate):
+        """Rate limiter from a rate (if provided)."""
+        if rate is None or isinstance(rate, RateLimiter):
+            return rate
+        return RateLimiter(rate)
+
+    def _limiter(self, url):
+        """Rate limiter of an API endpoint."""
+        if url == '/calculation/new':
+            return self.submit_limiter
+
+        if url.startswith('/calculation/'):
+            return self.poll_limiter
+
+        return None
+
+    def _send(self, method, url, **kwargs):
+        """Send a single HTTP request.
+
+        Returns
+        -------
+        (requests.Response, requests.exceptions.RequestException, float)
+            Response (``None`` if not received), error (``None`` if
+            successful) and elapsed time (in seconds).
+
+        """
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.url + url, timeout=60, **kwargs)
+        except requests.exceptions.RequestException as err:
+            return None, err, time.perf_counter() - start
+
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as err:
+            return response, err, time.perf_counter() - start
+
+        return response, None, time.perf_counter() - start
+
+    def _decode(self, response):
+        """Decode a JSON response with the :py:attr:`decoder`.
+
+        Returns
+        -------
+        (dict, requests.exceptions.JSONDecodeError)
+            Decoded JSON (``None`` if invalid) and decoding error
+            (``None`` if successful).
+
+        """
+        try:
+            return self.decoder(response.content), None
+        except ValueError as err:
+            # Invalid content (eg. HTML proxy error page): request error
+            return None, requests.exceptions.JSONDecodeError(
+                str(err), response.text, getattr(err, 'pos', 0), response=response)
+
+    @staticmethod
+    def _size(response, streamed=False):
+        """Response size (in bytes, announced by the server if streamed)."""
+        if response is None:
+            return 0
+        if streamed:
+            return int(response.headers.get('Content-Length', 0))
+        return len(response.content)
+
+    def _record(self, url, attempt, error, elapsed, nbytes):
+        """Record a request outcome in the statistics and the circuit breaker."""
+        self._stats.record(url, elapsed, error=error is not None, retry=attempt > 0,
+                           nbytes=nbytes)
+
+        if self.breaker is not None:
+            if error is not None and server_failure(error):
+                self.breaker.failure()
+            else:
+                self.breaker.success()
+
+    def _emit(self, event, method, url, attempt, **info):
+        """Call the API hooks of a request event."""
+        self.hooks.emit(event, api=self, method=method, url=url,
+                        endpoint=endpoint(url), attempt=attempt, **info)
+
+    def _request(self, method, url, stream=False, **kwargs):
+        """Send a request to the API and get its JSON response.
+
+        The transient failures are retried according to the :py:attr:`retry` policy
+        and the calculation requests are throttled by the :py:attr:`submit_limiter`
+        and :py:attr:`poll_limiter` (if any). The :py:attr:`hooks` are called
+        on each ``request``, ``response`` and ``error`` (including the retries).
+        The JSON content is decoded with the :py:attr:`decoder`, or not read
+        at all if ``stream`` is enabled (the response itself is returned).
+
+        Raises
+        ------
+        requests.response.HTMLError
+            If HTML error is thrown by the API (HTML code not equal 200)
+        requests.exceptions.JSONDecodeError
+            If the response content is not valid JSON.
+        CircuitOpen
+            If the :py:attr:`breaker` circuit is open.
+
+        """
+        limiter = self._limiter(url)
+
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                self.breaker.allow(self.url)
+
+            if limiter is not None:
+                limiter.acquire()
+
+            if self.hooks:
+                payload = kwargs.get('json')
+                self._emit('request', method, url, attempt, payload_size=0
+                           if payload is None else len(jsonlib.dumps(payload)))
+
+            response, error, elapsed = self._send(method, url, stream=stream, **kwargs)
+            status = None if response is None else response.status_code
+            nbytes = self._size(response, streamed=stream and error is None)
+
+            json = response
+            if error is None and not stream:
+                json, error = self._decode(response)
+
+            self._record(url, attempt, error, elapsed, nbytes)
+
+            if error is None:
+
+                if self.hooks:
+                    self._emit('response', method, url, attempt, elapsed=elapsed,
+                               status=status, size=nbytes,
+                               result_type=json.get('resultType')
+                               if isinstance(json, dict) else None)
+                return json
+
+            if self.hooks:
+                self._emit('error', method, url, attempt, elapsed=elapsed,
+                           status=status, error=error)
+
+            if not self.retry.retryable(method, attempt, response=response, error=error):
+                raise error
+
+            delay = self.retry.delay(attempt, response=response)
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self):
+        """Requests statistics of each API endpoint.
+
+        Each HTTP request sent to the API (including the retries)
+        is recorded. The calculations and kernel sets ids are replaced
+        by ``{id}`` in the endpoints names.
+
+        Returns
+        -------
+        dict
+            Number of requests, errors, retries, response bytes, latency
+            summary and latency histogram (in seconds) of each endpoint.
+
+        Example
+        -------
+        >>> API.stats()  # doctest: +SKIP
+        {'/calculation/new': {'count': 1, 'errors': 0, 'retries': 0, 'bytes': 161,
+                              'latency': {'total': 0.521, 'mean': 0.521, ...},
+                              'histogram': {0.05: 0, ..., 1: 1, ...}},
+         '/calculation/{id}': {...},
+         '/calculation/{id}/results': {...}}
+
+        """
+        return self._stats.as_dict()
+
+    def reset_stats(self):
+        """Reset the requests statistics."""
+        self._stats.reset()
+
+    def _get_cached(self, url):
+        """GET request on the API with the disk cache (if enabled)."""
+        if self.cache is not None:
+            json = self.cache.get(self.url, url)
+            if json is not None:
+                return json
+
+        json = self._request('GET', url)
+
+        if self.cache is not None:
+            self.cache.set(self.url, url, json)
+
+        return json
+
+    def _load_catalog(self, url):
+        """Load an API catalog."""
+        if self.cache is not None:
+            _ = self.metadata  # Invalidate the disk cache if the API changed
+
+        return self.read(self._get_cached(url))
+
+    def _catalog(self, url):
+        """Cached API catalog (downloaded once, even by concurrent threads)."""
+        return self._catalogs.get(url, lambda: self._load_catalog(url))
+
+    def _index(self, url):
+        """Cached API catalog lookup index."""
+        return self._indexes.get(url, lambda: self._catalog(url).lookup)
+
+    def index(self, catalog, kernel_set=None):
+        """Get the lookup index of an API catalog.
+
+        The index is built once per catalog and maps the items ``id``,
+        ``name`` and lowercase ``name`` to the items.
+
+        Parameters
+        ----------
+        catalog: str
+            Catalog name: ``kernel-sets``, ``bodies``, ``frames`` or ``instruments``.
+        kernel_set: str, int or :obj:`webgeocalc.types.KernelSetDetails`, optional
+            Kernel sets ``name``, ``id`` or `object`
+            (required for ``bodies``, ``frames`` and ``instruments``).
+
+        Returns
+        -------
+        :obj:`webgeocalc.index.Index`
+            Catalog lookup index.
+
+        Raises
+        ------
+        ValueError
+            If the catalog is unknown.
+
+        """
+        if catalog == 'kernel-sets':
+            return self._index('/kernel-sets')
+
+        if catalog not in ('bodies', 'frames', 'instruments'):
+            raise ValueError(f"Unknown catalog: '{catalog}'")
+
+        kernel_set_id = self.kernel_set_id(kernel_set)
+        return self._index(f'/kernel-set/{kernel_set_id}/{catalog}')
+
+    def _find(self, catalog, kernel_set, name, kind):
+        """Find a single item in a kernel set catalog."""
+        items = self.index(catalog, kernel_set).find(name)
+
+        if len(items) == 1:
+            return items[0]
+
+        if len(items) > 1:
+            raise TooManyItems(name, items, kind=catalog)
+
+        raise ItemNotFound(name, kind=kind)
+
+    def refresh(self):
+        """Clear the API metadata and catalogs caches (in memory and on disk).
+
+        The next requests will be downloaded again from the API.
+
+        """
+        self._meta.clear()
+        self._catalogs.clear()
+        self._indexes.clear()
+
+        if self.cache is not None:
+            self.cache.clear(self.url)
+
     def get(self, url):
         """Generic GET request on the API.
 
@@ -62,11 +463,7 @@ class Api:
         [<KernelSetDetails> Solar System Kernels (id: 1), ...]
 
         """
-        response = requests.get(self.url + url, timeout=60)
-        if response.ok:
-            return self.read(response.json())
-
-        return response.raise_for_status()
+        return self.read(self._request('GET', url))
 
     def post(self, url, payload):
         """Generic POST request on the API.
@@ -95,11 +492,7 @@ class Api:
         ('0788aba2-d4e5-4028-9ef1-4867ad5385e0', 'COMPLETE')
 
         """
-        response = requests.post(self.url + url, json=payload, timeout=60)
-        if response.ok:
-            return self.read(response.json())
-
-        return response.raise_for_status()
+        return self.read(self._request('POST', url, json=payload))
 
     @staticmethod
     def read(json):
@@ -119,10 +512,12 @@ class Api:
             return type will be:
 
             [`Result objects`: :obj:`webgeocalc.types.ResultType`]
+            (lazy sequence: :obj:`webgeocalc.types.ResultItems`)
 
             If response contents ``result``, then return type will be:
 
-            (`Calculation id`: str, `Phase`: str)
+            (`Calculation id`: str,
+             `Phase`: :obj:`webgeocalc.phase.CalculationPhase`)
 
             If the response contents ``columns`` and ``rows``, then
             return type will be:
@@ -150,14 +545,10 @@ class Api:
 
         if 'resultType' in keys and 'items' in json:
             dtype = get_type(json['resultType'])
-            return [dtype(item) for item in json['items']]
+            return ResultItems(dtype, json['items'])
 
         if 'result' in keys:
-            phase = json['result']['phase']
-            if phase == 'QUEUED':
-                phase += f' | POSITION: {json["result"]["position"]}'
-
-            return json['calculationId'], phase
+            return json['calculationId'], CalculationPhase.from_result(json['result'])
 
         if 'columns' in keys and 'rows' in keys:
             cols = [ColumnResult(col) for col in json['columns']]
@@ -175,10 +566,13 @@ class Api:
         [:obj:`webgeocalc.types.KernelSetDetails`]
             List of kernel sets.
 
+        Note
+        ----
+        The list is cached in memory (and on disk if the :py:attr:`cache`
+        is enabled). See: :py:func:`refresh`.
+
         """
-        if self._kernel_sets is None:
-            self._kernel_sets = self.get('/kernel-sets')
-        return self._kernel_sets
+        return self._catalog('/kernel-sets')
 
     def kernel_set(self, kernel_set):
         """Get kernel set by ``caption`` name or kernel set ``id``.
@@ -193,8 +587,13 @@ class Api:
         :obj:`webgeocalc.types.KernelSetDetails`
             Kernel set details object.
 
+        Note
+        ----
+        An exact ``caption`` match takes precedence over the partial
+        (case-insensitive) matches.
+
         """
-        kernel_sets = list(filter(lambda x: kernel_set in x, self.kernel_sets()))
+        kernel_sets = self.index('kernel-sets').find(kernel_set)
         if len(kernel_sets) == 1:
             return kernel_sets[0]
 
@@ -244,9 +643,14 @@ class Api:
         [:obj:`webgeocalc.types.BodyData`]
             List of bodies in the requested kernel set.
 
+        Note
+        ----
+        The list is cached in memory (and on disk if the :py:attr:`cache`
+        is enabled). See: :py:func:`refresh`.
+
         """
         kernel_set_id = self.kernel_set_id(kernel_set)
-        return self.get(f'/kernel-set/{kernel_set_id}/bodies')
+        return self._catalog(f'/kernel-set/{kernel_set_id}/bodies')
 
     def frames(self, kernel_set):
         """Get list of frames available in a kernel set.
@@ -263,9 +667,14 @@ class Api:
         [:obj:`webgeocalc.types.FrameData`]
             List of frames in the requested kernel set.
 
+        Note
+        ----
+        The list is cached in memory (and on disk if the :py:attr:`cache`
+        is enabled). See: :py:func:`refresh`.
+
         """
         kernel_set_id = self.kernel_set_id(kernel_set)
-        return self.get(f'/kernel-set/{kernel_set_id}/frames')
+        return self._catalog(f'/kernel-set/{kernel_set_id}/frames')
 
     def instruments(self, kernel_set):
         """Get list of instruments available in a kernel set.
@@ -282,9 +691,89 @@ class Api:
         [:obj:`webgeocalc.types.InstrumentData`]
             List of instruments in the requested kernel set.
 
+        Note
+        ----
+        The list is cached in memory (and on disk if the :py:attr:`cache`
+        is enabled). See: :py:func:`refresh`.
+
         """
         kernel_set_id = self.kernel_set_id(kernel_set)
-        return self.get(f'/kernel-set/{kernel_set_id}/instruments')
+        return self._catalog(f'/kernel-set/{kernel_set_id}/instruments')
+
+    def body(self, kernel_set, body):
+        """Get a body in a kernel set by ``name`` or ``id``.
+
+        Parameters
+        ----------
+        kernel_set: str, int or :obj:`webgeocalc.types.KernelSetDetails`
+            Kernel sets ``name``, ``id`` or `object`.
+        body: str or int
+            Body ``name`` or ``id``.
+
+        Returns
+        -------
+        :obj:`webgeocalc.types.BodyData`
+            Body data object.
+
+        Raises
+        ------
+        ItemNotFound
+            If no body matches.
+        TooManyItems
+            If more than one body matches.
+
+        """
+        return self._find('bodies', kernel_set, body, 'Body')
+
+    def frame(self, kernel_set, frame):
+        """Get a frame in a kernel set by ``name`` or ``id``.
+
+        Parameters
+        ----------
+        kernel_set: str, int or :obj:`webgeocalc.types.KernelSetDetails`
+            Kernel sets ``name``, ``id`` or `object`.
+        frame: str or int
+            Frame ``name`` or ``id``.
+
+        Returns
+        -------
+        :obj:`webgeocalc.types.FrameData`
+            Frame data object.
+
+        Raises
+        ------
+        ItemNotFound
+            If no frame matches.
+        TooManyItems
+            If more than one frame matches.
+
+        """
+        return self._find('frames', kernel_set, frame, 'Frame')
+
+    def instrument(self, kernel_set, instrument):
+        """Get an instrument in a kernel set by ``name`` or ``id``.
+
+        Parameters
+        ----------
+        kernel_set: str, int or :obj:`webgeocalc.types.KernelSetDetails`
+            Kernel sets ``name``, ``id`` or `object`.
+        instrument: str or int
+            Instrument ``name`` or ``id``.
+
+        Returns
+        -------
+        :obj:`webgeocalc.types.InstrumentData`
+            Instrument data object.
+
+        Raises
+        ------
+        ItemNotFound
+            If no instrument matches.
+        TooManyItems
+            If more than one instrument matches.
+
+        """
+        return self._find('instruments', kernel_set, instrument, 'Instrument')
 
     def new_calculation(self, payload):
         """Starts a new calculation.
@@ -308,8 +797,18 @@ class Api:
         >>> API.calculation_new(calculation_payload)  # doctest: +SKIP
         ('0788aba2-d4e5-4028-9ef1-4867ad5385e0', 'LOADING_KERNELS')
 
+        Note
+        ----
+        If :py:attr:`flights` coalescing is enabled, an identical payload
+        already in flight is not submitted again, its calculation ``id``
+        is returned instead.
+
         """
-        return self.post('/calculation/new', payload)
+        if self.flights is None:
+            return self.post('/calculation/new', payload)
+
+        return self.flights.submit(payload_key(self.url, payload),
+                                   lambda: self.post('/calculation/new', payload))
 
     def phase_calculation(self, calculation_id):
         """Gets the phase of a calculation.
@@ -334,7 +833,12 @@ class Api:
         ('0788aba2-d4e5-4028-9ef1-4867ad5385e0', 'COMPLETE')
 
         """
-        return self.get(f'/calculation/{calculation_id}')
+        calculation_id, phase = self.get(f'/calculation/{calculation_id}')
+
+        if self.flights is not None:
+            self.flights.phase(calculation_id, phase)
+
+        return calculation_id, phase
 
     def cancel_calculation(self, calculation_id):
         """Cancels a previously requested calculation, should this not be completed, or its results..
@@ -362,7 +866,11 @@ class Api:
         ('0788aba2-d4e5-4028-9ef1-4867ad5385e0', 'CANCELLED')
 
         """
-        return self.get(f'/calculation/{calculation_id}/cancel')
+        if self.flights is None:
+            return self.get(f'/calculation/{calculation_id}/cancel')
+
+        return self.flights.cancel(
+            calculation_id, lambda: self.get(f'/calculation/{calculation_id}/cancel'))
 
     def results_calculation(self, calculation_id):
         """Gets the results of a complete calculation.
@@ -387,14 +895,169 @@ class Api:
         ([<ColumnResult> UTC calendar date, ...], [['2000-01-01 00:00:00.000000 UTC', ...], [...]])
 
         """
-        return self.get(f'/calculation/{calculation_id}/results')
+        if self.flights is None:
+            return self.get(f'/calculation/{calculation_id}/results')
+
+        return self.flights.results(
+            calculation_id, lambda: self.get(f'/calculation/{calculation_id}/results'))
+
+    def stream_results(self, calculation_id, chunk_size=65536):
+        """Stream the results of a complete calculation.
+
+        ``GET: /calculation/{id}/results``
+
+        The response is parsed incrementally: the rows are decoded as they
+        are downloaded and are never all held in memory at once
+        (see: :py:func:`webgeocalc.decoder.stream_results`).
+        The results are not shared by the coalesced calculations.
+
+        Parameters
+        ----------
+        calculation_id: str
+            Calculation id.
+        chunk_size: int, optional
+            Size (in bytes) of the downloaded chunks.
+
+        Returns
+        -------
+        ([:obj:`webgeocalc.types.ColumnResult`], iterator)
+            Tuple of calculation results: ``(columns, rows)``.
+            The rows are yielded as they are downloaded.
+
+        Raises
+        ------
+        APIError
+            If the API status is not ``OK``.
+        APIResponseError
+            If the response does not contain any ``columns``.
+        requests.exceptions.JSONDecodeError
+            If the response content is not valid JSON.
+
+        Example
+        -------
+        >>> columns, rows = API.stream_results('0788aba2-d4e5-4028-9ef1-4867ad5385e0')  # noqa: E501  # doctest: +SKIP
+        >>> for row in rows:  # doctest: +SKIP
+        ...     print(row)
+        ['2000-01-01 00:00:00.000000 UTC', ...]
+
+        """
+        response = self._request('GET', f'/calculation/{calculation_id}/results',
+                                 stream=True)
+
+        try:
+            fields, rows = stream_results(response.iter_content(chunk_size),
+                                          decoder=self.decoder)
+        except ValueError as err:
+            response.close()
+            raise requests.exceptions.JSONDecodeError(
+                str(err), '', 0, response=response) from err
+
+        if 'columns' not in fields:
+            response.close()
+            self.read(fields)
+            raise APIResponseError(fields)
+
+        def _rows():
+            try:
+                yield from rows
+            finally:
+                response.close()
+
+        return [ColumnResult(col) for col in fields['columns']], _rows()
 
     @property
     def metadata(self):
         """API metadata."""
-        if self._meta is None:
-            self._meta = self.get('/')
-        return dict(self._meta)
+        return dict(self._meta.get('/', lambda: self.read(self._get_cached('/'))))
+
+
+class AsyncApi:
+    """Asynchronous WebGeoCalc API object.
+
+    Mirror the :py:class:`Api` requests as coroutines to drive
+    many calculations concurrently from a single event loop.
+
+    The HTTP requests are still sent with the pooled session
+    of the wrapped :py:class:`Api` but they are off-loaded on the
+    event loop default executor, the loop itself is never blocked.
+
+    Parameters
+    ----------
+    api: str, webgeocalc.Api or webgeocalc.multi.MultiApi, optional
+        Wrapped API object or its root URL (see :py:class:`Api`).
+
+    Example
+    -------
+    >>> async_api = AsyncApi(JPL_API)
+    >>> await async_api.kernel_sets()  # doctest: +SKIP
+    [<KernelSetDetails> Solar System Kernels (id: 1), ...]
+
+    """
+
+    def __init__(self, api=''):
+        self.api = Api(api) if isinstance(api, str) else api
+
+    def __str__(self):
+        return str(self.api)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self}'
+
+    async def _call(self, method, *args):
+        """Run a blocking API method in the event loop executor."""
+        return await asyncio.to_thread(getattr(self.api, method), *args)
+
+    async def metadata(self):
+        """API metadata. See: :py:attr:`Api.metadata`."""
+        return await asyncio.to_thread(lambda: self.api.metadata)
+
+    async def kernel_sets(self):
+        """Get list of all kernel sets. See: :py:func:`Api.kernel_sets`."""
+        return await self._call('kernel_sets')
+
+    async def kernel_set(self, kernel_set):
+        """Get kernel set by name or id. See: :py:func:`Api.kernel_set`."""
+        return await self._call('kernel_set', kernel_set)
+
+    async def bodies(self, kernel_set):
+        """Get list of bodies in a kernel set. See: :py:func:`Api.bodies`."""
+        return await self._call('bodies', kernel_set)
+
+    async def frames(self, kernel_set):
+        """Get list of frames in a kernel set. See: :py:func:`Api.frames`."""
+        return await self._call('frames', kernel_set)
+
+    async def instruments(self, kernel_set):
+        """Get list of instruments in a kernel set. See: :py:func:`Api.instruments`."""
+        return await self._call('instruments', kernel_set)
+
+    async def body(self, kernel_set, body):
+        """Get a body in a kernel set. See: :py:func:`Api.body`."""
+        return await self._call('body', kernel_set, body)
+
+    async def frame(self, kernel_set, frame):
+        """Get a frame in a kernel set. See: :py:func:`Api.frame`."""
+        return await self._call('frame', kernel_set, frame)
+
+    async def instrument(self, kernel_set, instrument):
+        """Get an instrument in a kernel set. See: :py:func:`Api.instrument`."""
+        return await self._call('instrument', kernel_set, instrument)
+
+    async def new_calculation(self, payload):
+        """Starts a new calculation. See: :py:func:`Api.new_calculation`."""
+        return await self._call('new_calculation', payload)
+
+    async def phase_calculation(self, calculation_id):
+        """Gets the phase of a calculation. See: :py:func:`Api.phase_calculation`."""
+        return await self._call('phase_calculation', calculation_id)
+
+    async def cancel_calculation(self, calculation_id):
+        """Cancels a calculation. See: :py:func:`Api.cancel_calculation`."""
+        return await self._call('cancel_calculation', calculation_id)
+
+    async def results_calculation(self, calculation_id):
+        """Gets the results of a calculation. See: :py:func:`Api.results_calculation`."""
+        return await self._call('results_calculation', calculation_id)
 
 
 # Export default API object
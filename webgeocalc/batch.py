@@ -0,0 +1,171 @@
+"""Webgeocalc batch of calculations."""
+
+import time
+from collections import deque
+from concurrent import futures
+
+from .errors import CircuitOpen
+from .poller import POLLER
+
+
+def _failed(err):
+    """Future holding a calculation failure."""
+    future = futures.Future()
+    future.set_exception(err)
+    return future
+
+
+def _watch(calculation, timeout, poller):
+    """Watch a calculation and catch its submission failure."""
+    try:
+        return poller.watch(calculation, timeout=timeout)
+    except CircuitOpen:
+        raise
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        return _failed(err)
+
+
+def _result(future):
+    """Calculation results or its failure."""
+    err = future.exception()
+    return future.result() if err is None else err
+
+
+def _run_batch(calculations, max_in_flight, timeout, poller):
+    """Run batch of calculations and yield their indexes as they complete."""
+    if max_in_flight < 1:
+        raise ValueError(f'Max calculations in flight must be positive: {max_in_flight}')
+
+    poller = POLLER if poller is None else poller
+    pending = deque(enumerate(calculations))
+    jobs = {}
+    deadline = None
+
+    while pending or jobs:
+        pause = None
+        while pending and len(jobs) < max_in_flight:
+            try:
+                job = _watch(pending[0][1], timeout, poller)
+                deadline = None
+            except CircuitOpen as err:
+                # API outage: pause the submissions (up to the time out)
+                now = time.monotonic()
+                deadline = deadline or now + timeout
+                if now < deadline:
+                    pause = min(max(err.retry_in, 0.1), deadline - now)
+                    break
+                job = _failed(err)
+
+            jobs[job] = pending.popleft()
+
+        if not jobs:
+            time.sleep(pause)
+            continue
+
+        done, _ = futures.wait(jobs, timeout=pause, return_when=futures.FIRST_COMPLETED)
+
+        for job in done:
+            yield *jobs.pop(job), _result(job)
+
+
+def run_as_completed(calculations, max_in_flight=10, timeout=30, poller=None):
+    """Run concurrently a batch of calculations and yield them as they complete.
+
+    The calculations are submitted in the caller thread and their phases
+    are updated by a shared background :py:class:`~webgeocalc.poller.Poller`.
+    While the circuit breaker of the API is open, the submissions are
+    paused (up to ``timeout``) instead of failing the whole batch.
+
+    Parameters
+    ----------
+    calculations: [webgeocalc.Calculation]
+        List of calculations to run.
+    max_in_flight: int, optional
+        Maximum number of calculations submitted to the API at once.
+    timeout: int, optional
+        Time out (in seconds) of each calculation.
+    poller: webgeocalc.poller.Poller, optional
+        Custom calculations poller (the process-wide one by default).
+
+    Yields
+    ------
+    (webgeocalc.Calculation, dict or Exception)
+        Calculation and its results. If the calculation failed,
+        the error (eg. :py:class:`~webgeocalc.errors.CalculationFailed`,
+        :py:class:`~webgeocalc.errors.CalculationTimeOut` or an unexpected
+        API response error) is returned instead of its results and the rest
+        of the batch continues.
+
+    Raises
+    ------
+    ValueError
+        If ``max_in_flight`` is lower than 1.
+
+    """
+    for _, calculation, result in _run_batch(calculations, max_in_flight,
+                                             timeout, poller):
+        yield calculation, result
+
+
+def run_many(calculations, max_in_flight=10, timeout=30, poller=None):
+    """Run concurrently a batch of calculations.
+
+    See: :py:func:`run_as_completed`.
+
+    Returns
+    -------
+    [dict or Exception]
+        Calculations results (or errors) in the input order.
+
+    Example
+    -------
+    >>> run_many([calc_1, calc_2], max_in_flight=2)  # doctest: +SKIP
+    [{'DATE': ..., ...}, CalculationFailed("Calculation failed phase: 'FAILED'")]
+
+    """
+    calculations = list(calculations)
+    results = [None] * len(calculations)
+
+    for i, _, result in _run_batch(calculations, max_in_flight, timeout, poller):
+        results[i] = result
+
+    return results
+
+
+def batch_timings(calculations):
+    """Aggregate the timings breakdown of a batch of calculations.
+
+    See: :py:attr:`webgeocalc.calculation.Calculation.timings`.
+
+    Parameters
+    ----------
+    calculations: [webgeocalc.Calculation]
+        Batch of calculations.
+
+    Returns
+    -------
+    dict
+        Total, mean and maximum durations (in seconds) of each timing
+        (the timings not recorded are ignored).
+
+    Example
+    -------
+    >>> batch_timings([calc_1, calc_2])  # doctest: +SKIP
+    {'submit': {'total': 0.82, 'mean': 0.41, 'max': 0.45},
+     'queued': {'total': 6.2, 'mean': 3.1, 'max': 3.5}, ...}
+
+    """
+    durations = {}
+    for calculation in calculations:
+        for key, duration in calculation.timings.items():
+            durations.setdefault(key, [])
+            if duration is not None:
+                durations[key].append(duration)
+
+    return {
+        key: {
+            'total': sum(values),
+            'mean': sum(values) / len(values) if values else None,
+            'max': max(values, default=None),
+        } for key, values in durations.items()
+    }
@@ -0,0 +1,139 @@
+"""Webgeocalc API circuit breaker."""
+
+import threading
+import time
+
+import requests
+
+from .errors import CircuitOpen
+
+
+def server_failure(error):
+    """Check if a request error reveals a server failure.
+
+    The connection errors, the time outs, the ``429`` and the ``5XX``
+    responses are server failures. The other HTTP errors (``4XX``)
+    are client errors, the server is still responding.
+
+    Parameters
+    ----------
+    error: requests.exceptions.RequestException
+        Request error.
+
+    Returns
+    -------
+    bool
+        Server failure.
+
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is None or error.response.status_code == 429 \
+            or error.response.status_code >= 500
+
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+class CircuitBreaker:
+    """API circuit breaker.
+
+    The circuit is ``closed`` while the API responds. It opens after
+    :py:attr:`failures` consecutive server failures (see: :py:func:`server_failure`)
+    and then fails fast every request with a
+    :py:class:`~webgeocalc.errors.CircuitOpen` error, without sending it.
+    After :py:attr:`reset_timeout` seconds, the circuit is ``half-open``:
+    up to :py:attr:`probes` requests are sent to probe the API.
+    A successful probe closes the circuit, a failed one opens it again.
+
+    Parameters
+    ----------
+    failures: int, optional
+        Number of consecutive failures opening the circuit.
+    reset_timeout: float, optional
+        Delay (in seconds) before probing an open circuit.
+    probes: int, optional
+        Maximum number of concurrent requests in the ``half-open`` state.
+
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failures=5, reset_timeout=30, probes=1):
+        if failures < 1:
+            raise ValueError(f'Failures threshold must be positive: {failures}')
+
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.probes = max(probes, 1)
+        self.consecutive = 0
+        self._opened = None
+        self._probing = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}> {self.state} '
+                f'({self.consecutive}/{self.failures} failures)')
+
+    @property
+    def state(self):
+        """Current circuit state: ``closed``, ``open`` or ``half-open``."""
+        if self._opened is None:
+            return self.CLOSED
+        if time.monotonic() < self._opened + self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def retry_in(self):
+        """Delay (in seconds) before the circuit is probed again."""
+        if self._opened is None:
+            return 0
+        return max(self._opened + self.reset_timeout - time.monotonic(), 0)
+
+    def allow(self, url=''):
+        """Check if a request can be sent.
+
+        Parameters
+        ----------
+        url: str, optional
+            API URL (reported in the error).
+
+        Raises
+        ------
+        CircuitOpen
+            If the circuit is open (or if enough probes are already
+            in flight in the ``half-open`` state).
+
+        """
+        with self._lock:
+            state = self.state
+
+            if state == self.CLOSED:
+                return
+
+            if state == self.HALF_OPEN and self._probing < self.probes:
+                self._probing += 1
+                return
+
+            raise CircuitOpen(url, self.retry_in)
+
+    def success(self):
+        """Record a successful request (the circuit is closed)."""
+        with self._lock:
+            self.consecutive = 0
+            self._opened = None
+            self._probing = 0
+
+    def failure(self):
+        """Record a failed request (the circuit may open)."""
+        with self._lock:
+            self.consecutive += 1
+            self._probing = max(self._probing - 1, 0)
+
+            if self._opened is not None or self.consecutive >= self.failures:
+                self._opened = time.monotonic()
+
+    def reset(self):
+        """Close the circuit."""
+        self.success()
@@ -0,0 +1,271 @@
+"""Webgeocalc results and metadata caches."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def _write_json(fname, data):
+    """Write atomically a JSON file."""
+    fname.parent.mkdir(parents=True, exist_ok=True)
+    tmp = fname.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    tmp.write_text(json.dumps(data), encoding='utf-8')
+    tmp.replace(fname)
+
+
+def payload_key(url, payload):
+    """Content-addressed key of a calculation.
+
+    Parameters
+    ----------
+    url: str
+        API root URL.
+    payload: dict
+        Calculation payload.
+
+    Returns
+    -------
+    str
+        SHA-256 hash of the canonical (sorted and compact) JSON
+        representation of the API URL and the payload.
+
+    """
+    canonical = json.dumps({'api': str(url), 'payload': payload},
+                           sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultsCache:
+    """Calculation results cache.
+
+    The results (``columns`` and ``rows``) are stored in a memory LRU
+    tier and (optionally) in a disk tier, with their :py:func:`payload_key`.
+
+    Parameters
+    ----------
+    maxsize: int, optional
+        Maximum number of values (rows times columns) kept in memory.
+        The least recently used results are evicted first.
+    directory: str or pathlib.Path, optional
+        Disk tier directory (disabled if not provided).
+        The results stored on disk are never evicted.
+
+    """
+
+    def __init__(self, maxsize=1_000_000, directory=None):
+        self.maxsize = maxsize
+        self.directory = None if directory is None else Path(directory).expanduser()
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}> {len(self)} results '
+                f'({self.size}/{self.maxsize} values)')
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        if key in self._data:
+            return True
+        fname = self._file(key)
+        return fname is not None and fname.exists()
+
+    def _file(self, key):
+        """Disk tier file."""
+        if self.directory is None:
+            return None
+        return self.directory / f'{key}.json'
+
+    @staticmethod
+    def _sizeof(columns, rows):
+        """Number of values in the results."""
+        return max(len(columns) * len(rows), 1)
+
+    def get(self, key):
+        """Get calculation results from the cache.
+
+        Parameters
+        ----------
+        key: str
+            Calculation key (see: :py:func:`payload_key`).
+
+        Returns
+        -------
+        ([dict], list) or None
+            Results JSON ``columns`` and ``rows`` (``None`` if not cached).
+
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+
+        fname = self._file(key)
+        if fname is None or not fname.exists():
+            return None
+
+        results = json.loads(fname.read_text(encoding='utf-8'))
+        columns, rows = results['columns'], results['rows']
+        self._store(key, columns, rows)
+        return columns, rows
+
+    def set(self, key, columns, rows):
+        """Store calculation results in the cache.
+
+        Parameters
+        ----------
+        key: str
+            Calculation key (see: :py:func:`payload_key`).
+        columns: [dict or webgeocalc.types.ColumnResult]
+            Results columns.
+        rows: list
+            Results rows.
+
+        """
+        columns = [dict(column.items()) for column in columns]
+        self._store(key, columns, rows)
+
+        fname = self._file(key)
+        if fname is not None:
+            _write_json(fname, {'columns': columns, 'rows': rows})
+
+    def _store(self, key, columns, rows):
+        """Store results in the memory tier and evict the LRU results."""
+        size = self._sizeof(columns, rows)
+        if size > self.maxsize:
+            return
+
+        with self._lock:
+            if key in self._data:
+                self.size -= self._sizeof(*self._data.pop(key))
+
+            self._data[key] = (columns, rows)
+            self.size += size
+
+            while self.size > self.maxsize:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= self._sizeof(*evicted)
+
+    def clear(self):
+        """Clear the memory and the disk tiers."""
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+        if self.directory is not None and self.directory.exists():
+            for fname in self.directory.glob('*.json'):
+                fname.unlink()
+
+
+class MetadataCache:
+    """API metadata and catalogs disk cache.
+
+    Store the raw JSON responses of the API catalog endpoints
+    (``/kernel-sets`` and ``/kernel-set/{id}/bodies|frames|instruments``)
+    and of the API metadata (``/``) on disk, scoped per API URL.
+
+    The API metadata expire after ``version_ttl`` seconds. When they are
+    downloaded again, all the cached catalogs of the API are invalidated
+    if the server reports a new ``version`` or ``build_id``.
+
+    Parameters
+    ----------
+    directory: str or pathlib.Path
+        Cache directory.
+    ttl: float, optional
+        Time to live (in seconds) of the catalogs (default: 1 week).
+    version_ttl: float, optional
+        Time to live (in seconds) of the API metadata (default: 1 hour).
+
+    """
+
+    def __init__(self, directory, ttl=604_800, version_ttl=3_600):
+        self.directory = Path(directory).expanduser()
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self.directory}'
+
+    def _scope(self, url):
+        """API cache sub-directory."""
+        return self.directory / hashlib.sha256(str(url).encode('utf-8')).hexdigest()[:16]
+
+    def _file(self, url, endpoint):
+        """Endpoint cache file."""
+        name = endpoint.strip('/').replace('/', '_') or 'metadata'
+        return self._scope(url) / f'{name}.json'
+
+    def get(self, url, endpoint, ttl=None):
+        """Get a cached API JSON response.
+
+        Parameters
+        ----------
+        url: str
+            API root URL.
+        endpoint: str
+            API endpoint (eg. ``/kernel-sets``).
+        ttl: float, optional
+            Custom time to live (in seconds). By default, :py:attr:`version_ttl`
+            is used for the metadata and :py:attr:`ttl` for the catalogs.
+
+        Returns
+        -------
+        dict or None
+            Cached API JSON response (``None`` if missing or expired).
+
+        """
+        fname = self._file(url, endpoint)
+        if not fname.exists():
+            return None
+
+        if ttl is None:
+            ttl = self.version_ttl if endpoint == '/' else self.ttl
+
+        cached = json.loads(fname.read_text(encoding='utf-8'))
+        if time.time() - cached['time'] > ttl:
+            return None
+
+        return cached['json']
+
+    def set(self, url, endpoint, data):
+        """Store an API JSON response.
+
+        If the API metadata changed (``version`` or ``build_id``),
+        all the previous responses cached for this API are invalidated.
+
+        Parameters
+        ----------
+        url: str
+            API root URL.
+        endpoint: str
+            API endpoint (eg. ``/kernel-sets``).
+        data: dict
+            API JSON response.
+
+        """
+        if endpoint == '/':
+            previous = self.get(url, '/', ttl=float('inf'))
+            keys = ('version', 'build_id')
+            if previous is not None and any(previous.get(k) != data.get(k) for k in keys):
+                self.clear(url)
+
+        _write_json(self._file(url, endpoint), {'time': time.time(), 'json': data})
+
+    def clear(self, url=None):
+        """Clear the cached responses of an API (or all of them)."""
+        directory = self.directory if url is None else self._scope(url)
+
+        if directory.exists():
+            for fname in directory.glob('**/*.json'):
+                fname.unlink()
+
+
+# Shared results cache
+RESULTS_CACHE = ResultsCache()
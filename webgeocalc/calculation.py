@@ -1,18 +1,27 @@
 """Webgeocalc Calculations."""
 
+import asyncio
+import threading
 import time
 
 from .api import API, Api, ESA_API, JPL_API
+from .cache import RESULTS_CACHE, payload_key
+from .columns import ColumnarResults, as_columns, results_array
 from .decorator import parameter
 from .direction import Direction
 from .errors import (CalculationAlreadySubmitted, CalculationConflictAttr,
                      CalculationFailed, CalculationIncompatibleAttr,
                      CalculationInvalidAttr, CalculationInvalidValue,
                      CalculationNotCompleted, CalculationRequiredAttr,
-                     CalculationTimeOut, CalculationUndefinedAttr)
+                     CalculationUndefinedAttr)
+from .hooks import CALCULATION_HOOKS
+from .multi import MultiApi
 from .payload import Payload
-from .types import KernelSetDetails
-from .vars import CALCULATION_FAILED_PHASES, VALID_PARAMETERS
+from .phase import CalculationStatus, Phase
+from .poller import POLLER
+from .polling import Polling
+from .types import ColumnResult, KernelSetDetails
+from .vars import VALID_PARAMETERS
 
 
 APIs = {
@@ -21,6 +30,34 @@ APIs = {
     'ESA': ESA_API,
 }
 
+_APIS_LOCK = threading.Lock()
+
+
+def get_api(api=''):
+    """Get the shared API object of an URL (created once per URL).
+
+    Parameters
+    ----------
+    api: str, webgeocalc.Api or webgeocalc.multi.MultiApi, optional
+        API URL or keyword (``JPL`` and ``ESA``). The custom
+        API objects are returned as they are.
+
+    Returns
+    -------
+    webgeocalc.Api or webgeocalc.multi.MultiApi
+        API object, shared by all the calculations (and threads)
+        using the same URL.
+
+    """
+    if isinstance(api, (Api, MultiApi)):
+        return api
+
+    api_key = str(api).upper()
+    with _APIS_LOCK:
+        if api_key not in APIs:
+            APIs[api_key] = Api(api)
+        return APIs[api_key]
+
 
 class Calculation(Payload):
     """Webgeocalc calculation object.
@@ -35,7 +72,9 @@ class Calculation(Payload):
         or :py:obj:`JPL_API` (if not).
         Keyword are also accepted (``JPL`` and ``ESA``).
         Custom 3-rd party endpoints can be used
-        (with their ``URL`` or as a custom :py:class:`webgeocalc.api.Api`).
+        (with their ``URL`` or as a custom :py:class:`webgeocalc.api.Api`),
+        as well as multiple endpoints (:py:class:`webgeocalc.multi.MultiApi`).
+        The API objects are shared by URL (see: :py:func:`get_api`).
     time_system: str, optional
         See: :py:attr:`time_system`
     time_format: str, optional
@@ -43,6 +82,18 @@ class Calculation(Payload):
     verbose: bool, optional
         Verbose calculation phase during :py:func:`submit`, :py:func:`update`
         and :py:func:`run`.
+    cache: bool or webgeocalc.cache.ResultsCache, optional
+        Results cache (disabled by default). If ``True``, the shared
+        :py:obj:`webgeocalc.cache.RESULTS_CACHE` is used.
+        When the results of an identical payload (on the same API)
+        are in the cache, they are returned without any API request.
+    hooks: webgeocalc.hooks.Hooks, optional
+        Calculation lifecycle hooks (``submit``, ``phase`` and ``results`` events).
+        By default, the hooks shared by all the calculations are used
+        (:py:obj:`webgeocalc.hooks.CALCULATION_HOOKS`).
+    release_values: bool, optional
+        Release the row-major :py:attr:`values` once the :py:attr:`results`
+        are converted to columns (to halve the memory of large results).
 
     Other Parameters
     ----------------
@@ -210,7 +261,8 @@ class Calculation(Payload):
     """
 
     def __init__(self, api='', time_system='UTC',
-                 time_format='CALENDAR', verbose=True, **kwargs):
+                 time_format='CALENDAR', verbose=True, cache=None, hooks=None,
+                 release_values=False, **kwargs):
         # Add default parameters to kwargs
         kwargs['time_system'] = time_system
         kwargs['time_format'] = time_format
@@ -218,17 +270,19 @@ class Calculation(Payload):
         # Init other parameters
         self.__kernels = []
         self.id = None
-        self.phase = 'NOT SUBMITTED'
+        self.status = CalculationStatus()
         self.columns = None
         self.values = None
+        self.columnar = None
+        self.release_values = release_values
         self.verbose = verbose
+        self.cache = RESULTS_CACHE if cache is True else None if cache is False else cache
+        self.hooks = CALCULATION_HOOKS if hooks is None else hooks
+        self.request_timings = dict.fromkeys(('submit', 'download'))
 
-        # Select API (with caching)
-        api_key = str(api).upper()
-        if api_key not in APIs:
-            APIs[api_key] = api if isinstance(api, Api) else Api(api)
-
-        self.api = APIs[api_key]
+        # Select API (shared by URL). Custom `Api` objects are used
+        # as they are (with their own options).
+        self.api = get_api(api)
 
         # Check required parameters
         if 'kernels' not in kwargs and 'kernel_paths' not in kwargs:
@@ -250,9 +304,96 @@ class Calculation(Payload):
             f' - {k}: {v}' for k, v in self.payload.items()
         ])
 
+    @property
+    def phase(self):
+        """Calculation phase.
+
+        Phase name with its queue position (eg. ``'QUEUED | POSITION: 6'``).
+        The structured phase enum, queue position, progress and
+        phase transitions timestamps are available in :py:attr:`status`
+        (:py:class:`~webgeocalc.phase.CalculationStatus`).
+
+        """
+        return str(self.status)
+
+    @phase.setter
+    def phase(self, phase):
+        previous = self.status.phase
+        self.status.update(phase)
+
+        if self.status.phase is not previous and self.hooks:
+            start, end = (t for _, t in self.status.transitions[-2:])
+            self.hooks.emit('phase', calculation=self, id=self.id, previous=previous,
+                            phase=self.status.phase, elapsed=end - start)
+
+    @property
+    def timings(self):
+        """Calculation timings breakdown (in seconds).
+
+        - ``submit``: submission request latency
+        - ``queued``: time spent ``QUEUED`` on the server
+        - ``starting``: time spent ``STARTING``
+        - ``loading_kernels``: time spent ``LOADING_KERNELS``
+        - ``calculating``: time spent ``CALCULATING``
+        - ``download``: results request latency (including the JSON decoding)
+        - ``parse``: results columns transposition time (see: :py:attr:`columnar`)
+
+        The requests timings are ``None`` until the requests are sent.
+        The phases durations are measured (with a monotonic clock) between
+        the phase updates, their accuracy depends on the polling frequency.
+
+        Example
+        -------
+        >>> calc.timings  # doctest: +SKIP
+        {'submit': 0.412, 'queued': 3.105, 'starting': 0.101,
+         'loading_kernels': 1.618, 'calculating': 0.203,
+         'download': 0.377, 'parse': 0.002}
+
+        """
+        return {
+            'submit': self.request_timings['submit'],
+            'queued': self.status.duration(Phase.QUEUED),
+            'starting': self.status.duration(Phase.STARTING),
+            'loading_kernels': self.status.duration(Phase.LOADING_KERNELS),
+            'calculating': self.status.duration(Phase.CALCULATING),
+            'download': self.request_timings['download'],
+            'parse': None if self.columnar is None else self.columnar.elapsed,
+        }
+
+    @property
+    def cache_key(self):
+        """Calculation results cache key.
+
+        See: :py:func:`webgeocalc.cache.payload_key`.
+
+        """
+        return payload_key(self.api.url, self.payload)
+
+    def _load_cache(self):
+        """Load the calculation results from the cache (if any)."""
+        if self.cache is None:
+            return False
+
+        cached = self.cache.get(self.cache_key)
+        if cached is None:
+            return False
+
+        columns, self.values = cached
+        self.columns = [ColumnResult(column) for column in columns]
+        self.columnar = None
+        self.phase = 'COMPLETE'
+
+        if self.hooks:
+            self.hooks.emit('results', calculation=self, id=self.id, elapsed=0,
+                            rows=len(self.values), cached=True)
+        return True
+
     def submit(self):
         """Submit calculation parameters and get calculation ``id`` and ``phase``.
 
+        If the calculation results are already in the :py:attr:`cache`,
+        the calculation is not submitted and its phase is set to ``COMPLETE``.
+
         Raises
         ------
         CalculationAlreadySubmitted
@@ -271,7 +412,22 @@ class Calculation(Payload):
         if self.id is not None:
             raise CalculationAlreadySubmitted(self.id)
 
+        start = time.perf_counter()
+
+        if self._load_cache():
+            if self.hooks:
+                self.hooks.emit('submit', calculation=self, id=self.id, cached=True,
+                                elapsed=time.perf_counter() - start)
+            if self.verbose:
+                print(f'[Calculation cache] Phase: {self.phase} (key: {self.cache_key})')
+            return
+
         self.id, self.phase = self.api.new_calculation(self.payload)
+        self.request_timings['submit'] = time.perf_counter() - start
+
+        if self.hooks:
+            self.hooks.emit('submit', calculation=self, id=self.id, cached=False,
+                            elapsed=self.request_timings['submit'])
 
         if self.verbose:
             print(f'[Calculation submit] Phase: {self.phase} (id: {self.id})')
@@ -282,6 +438,8 @@ class Calculation(Payload):
         See: :py:func:`submit`.
         """
         self.id = None
+        self.status = CalculationStatus()
+        self.request_timings = dict.fromkeys(('submit', 'download'))
         self.submit()
 
     def cancel(self):
@@ -317,6 +475,30 @@ class Calculation(Payload):
             if self.verbose:
                 print(f'[Calculation update] Phase: {self.phase} (id: {self.id})')
 
+    def _loaded(self):
+        """Check if the calculation results are already loaded."""
+        return self.columns is not None and (
+            self.values is not None or self.columnar is not None)
+
+    def _load_results(self):
+        """Download the calculation results (if not already loaded)."""
+        if not self.status.complete and not self._load_cache():
+            raise CalculationNotCompleted(self.phase)
+
+        if not self._loaded():
+            start = time.perf_counter()
+            self.columns, self.values = self.api.results_calculation(self.id)
+            self.columnar = None
+            self.request_timings['download'] = time.perf_counter() - start
+
+            if self.hooks:
+                self.hooks.emit('results', calculation=self, id=self.id, cached=False,
+                                rows=len(self.values),
+                                elapsed=self.request_timings['download'])
+
+            if self.cache is not None:
+                self.cache.set(self.cache_key, self.columns, self.values)
+
     @property
     def results(self):
         """Gets the results of a calculation, if its phase is `COMPLETE`.
@@ -361,32 +543,174 @@ class Calculation(Payload):
         {'DATE': ['2012-10-19 08:24:00.000000 UTC', '2012-10-19 09:00:00.000000 UTC'],
          'ANGULAR_SEPARATION': [175.17072258, 175.18555938]}
 
+        Note
+        ----
+        The results are transposed in columns once, on the first
+        access (see: :py:attr:`columnar`), and then reused.
+        The same dict is returned on each access: it should not be mutated
+        (copy it first if needed).
+
         """
-        if self.phase != 'COMPLETE':
-            raise CalculationNotCompleted(self.phase)
+        view = self._columnar()
+        results = view.to_dict()
 
-        if self.columns is None or self.values is None:
-            self.columns, self.values = self.api.results_calculation(self.id)
+        if self.release_values and self.values is not None:
+            view.release()
+            self.values = None
+
+        return results
+
+    def _columnar(self):
+        """Columnar view of the results (created once)."""
+        self._load_results()
+
+        if self.columnar is None:
+            self.columnar = ColumnarResults(self.columns, self.values)
+
+        return self.columnar
+
+    def column(self, key):
+        """Gets a single results column, if its phase is `COMPLETE`.
+
+        Only this column is transposed from the results rows
+        (on its first access, then it is reused). The returned list
+        is shared by all the callers and must not be mutated.
+
+        Parameters
+        ----------
+        key: str
+            Column ``outputID``.
+
+        Returns
+        -------
+        list
+            Column values (even for a single time).
+
+        Raises
+        ------
+        CalculationNotCompleted
+            If calculation phase is not `COMPLETE`.
+        KeyError
+            If the column is unknown.
+
+        Example
+        -------
+        >>> calc.column('DISTANCE')  # doctest: +SKIP
+        [764142.63776247, 764265.12137156, ...]
+
+        """
+        return self._columnar().column(key)
+
+    def as_columns(self):
+        """Gets the results of a calculation as typed NumPy arrays per column.
+
+        The dtypes are based on the columns ``type`` (``datetime64``,
+        ``int64``, ``float64`` or ``str``), with the columns ``units``
+        in the dtypes metadata (see: :py:func:`webgeocalc.columns.column_array`).
+        Requires NumPy (``pip install webgeocalc[numpy]``).
+
+        Returns
+        -------
+        dict
+            Column values arrays (by column ``outputID``), even for a single time.
+
+        Raises
+        ------
+        CalculationNotCompleted
+            If calculation phase is not `COMPLETE`.
+
+        Example
+        -------
+        >>> calc.as_columns()['DISTANCE']  # doctest: +SKIP
+        array([764142.63776247, 764265.12137156])
+
+        """
+        view = self._columnar()
+        return as_columns(self.columns, view)
+
+    def results_array(self):
+        """Gets the results of a calculation as a NumPy structured array.
+
+        See: :py:func:`as_columns` and :py:func:`webgeocalc.columns.results_array`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Results structured array (one record per row, one field per column).
+
+        Raises
+        ------
+        CalculationNotCompleted
+            If calculation phase is not `COMPLETE`.
+
+        Example
+        -------
+        >>> calc.results_array()[['DATE', 'DISTANCE']]  # doctest: +SKIP
+        array([('2012-10-19T08:24:00.000000', 764142.63776247), ...],
+              dtype=[('DATE', '<M8[us]'), ('DISTANCE', '<f8')])
+
+        """
+        view = self._columnar()
+        return results_array(self.columns, view)
+
+    def stream_results(self, chunk_size=65536):
+        """Iterate over the results rows of a calculation, if its phase is `COMPLETE`.
+
+        The rows are parsed as they are downloaded and are not kept
+        in memory (nor in the :py:attr:`cache`): the memory usage stays
+        bounded for large calculations (see: :py:func:`webgeocalc.Api.stream_results`).
+
+        Parameters
+        ----------
+        chunk_size: int, optional
+            Size (in bytes) of the downloaded chunks.
+
+        Returns
+        -------
+        iterator
+            Results rows as *dict* based on output columns.
+
+        Raises
+        ------
+        CalculationNotCompleted
+            If calculation phase is not `COMPLETE`.
+
+        Example
+        -------
+        >>> for row in calc.stream_results():  # doctest: +SKIP
+        ...     print(row['DATE'], row['DISTANCE'])
+        2012-10-19 08:24:00.000000 UTC 764142.63776247
+        ...
+
+        """
+        if not self.status.complete and not self._load_cache():
+            raise CalculationNotCompleted(self.phase)
 
-        if len(self.values) == 1:
-            data = self.values[0]
+        if self._loaded():
+            rows = self._columnar().iter_rows()
         else:
-            # Transpose values array
-            data = [[row[i] for row in self.values] for i in range(len(self.columns))]
+            self.columns, rows = self.api.stream_results(self.id, chunk_size)
 
-        return {column.outputID: value for column, value in zip(self.columns, data)}
+        keys = [column.outputID for column in self.columns]
+        return (dict(zip(keys, row)) for row in rows)
 
     def run(self, timeout=30, sleep=1):
         """Submit, update and retrieve calculation results at once.
 
         See: :py:func:`submit`, :py:func:`update` and :py:attr:`results`.
 
+        The calculation is updated quickly after its submission, then
+        the delay between each update backs off up to ``sleep`` seconds
+        (or more if the calculation is deep in the queue).
+        See: :py:class:`~webgeocalc.polling.Polling`.
+
         Parameters
         ----------
         timeout: int, optional
             Auto-update time out (in seconds).
         sleep: int, optional
-            Sleep duration (in seconds) between each update.
+            Maximum sleep duration (in seconds) between each update
+            of a running calculation.
 
         Raises
         ------
@@ -394,21 +718,97 @@ class Calculation(Payload):
             If calculation reach the timeout duration.
 
         """
-        if self.columns is not None and self.values is not None:
+        if self._loaded():
             return self.results
 
-        for _ in range(int(timeout / sleep)):
+        polling = Polling(timeout=timeout, sleep=sleep)
+        polling.check()  # Not submitted (or updated) after the deadline
+
+        while True:
             self.update()
 
-            if self.phase == 'COMPLETE':
+            if self.status.complete:
                 return self.results
 
-            if self.phase in CALCULATION_FAILED_PHASES:
+            if self.status.failed:
+                raise CalculationFailed(self.phase)
+
+            time.sleep(polling.delay(self.status))
+
+    async def run_async(self, timeout=30, sleep=1):
+        """Submit, update and retrieve calculation results in an event loop.
+
+        Awaitable version of :py:func:`run`. The API requests are
+        off-loaded on the event loop executor and the loop is released
+        between each update, so many calculations can be awaited concurrently.
+
+        Parameters
+        ----------
+        timeout: int, optional
+            Auto-update time out (in seconds).
+        sleep: int, optional
+            Maximum sleep duration (in seconds) between each update
+            of a running calculation.
+
+        Raises
+        ------
+        CalculationTimeOut
+            If calculation reach the timeout duration.
+
+        Example
+        -------
+        >>> await asyncio.gather(calc_1.run_async(), calc_2.run_async())  # noqa: E501  # doctest: +SKIP
+        [{'DATE': ..., ...}, {'DATE': ..., ...}]
+
+        """
+        if self._loaded():
+            return self.results
+
+        polling = Polling(timeout=timeout, sleep=sleep)
+        polling.check()  # Not submitted (or updated) after the deadline
+
+        while True:
+            await asyncio.to_thread(self.update)
+
+            if self.status.complete:
+                return await asyncio.to_thread(lambda: self.results)
+
+            if self.status.failed:
                 raise CalculationFailed(self.phase)
 
-            time.sleep(sleep)
+            await asyncio.sleep(polling.delay(self.status))
+
+    def watch(self, timeout=30, poller=None, callback=None):
+        """Submit the calculation and wait for its results in the background.
+
+        The calculation phase is updated by a shared background
+        :py:class:`~webgeocalc.poller.Poller` (the process-wide one by default)
+        instead of a dedicated polling loop.
 
-        raise CalculationTimeOut(timeout, sleep)
+        Parameters
+        ----------
+        timeout: int, optional
+            Time out (in seconds).
+        poller: webgeocalc.poller.Poller, optional
+            Custom calculations poller.
+        callback: callable, optional
+            Function called with the future when the calculation is done.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future resolved with the calculation :py:attr:`results`.
+            See: :py:func:`webgeocalc.poller.Poller.watch`.
+
+        Example
+        -------
+        >>> future = calc.watch()  # doctest: +SKIP
+        >>> future.result()        # doctest: +SKIP
+        {'DATE': ..., ...}
+
+        """
+        return (POLLER if poller is None else poller).watch(
+            self, timeout=timeout, callback=callback)
 
     @parameter(only='CALCULATION_TYPE')
     def calculation_type(self, val):
@@ -0,0 +1,271 @@
+"""Webgeocalc API record and replay cassettes."""
+
+import io
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+
+from urllib3.response import HTTPResponse
+
+from .errors import InteractionNotFound
+
+
+def _body(request):
+    """Request body (decoded JSON if possible)."""
+    body = request.body
+    if body is None:
+        return None
+
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+# Transport headers not valid for the decoded recorded body
+TRANSPORT_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+def _key(method, url, body):
+    """Interaction matching key."""
+    return method, url, json.dumps(body, sort_keys=True, separators=(',', ':'))
+
+
+class Cassette:
+    """Record and replay the API HTTP exchanges.
+
+    In ``record`` mode, the requests are sent to the API and each exchange
+    (request and response) is appended to a JSON cassette file (one
+    interaction per line, the file is a valid JSON list after each exchange).
+    In ``replay``
+    mode, no request is sent: the responses are read from the cassette.
+
+    The identical requests (same method, URL and body, eg. the phase
+    updates of a calculation) are replayed in the recorded order.
+    When they are exhausted, the last response is replayed again.
+
+    Parameters
+    ----------
+    fname: str or pathlib.Path
+        Cassette JSON file.
+    mode: str, optional
+        ``record``, ``replay`` or ``auto`` (replay if the cassette exists,
+        record if not).
+    latency: float or str, optional
+        Simulated latency of the replayed responses: a fixed delay (in seconds)
+        or ``recorded`` to reproduce the recorded latencies (none by default).
+
+    Example
+    -------
+    >>> api = Api(cassette=Cassette('wgc.json', mode='record'))  # doctest: +SKIP
+    >>> api = Api(cassette=Cassette('wgc.json', latency='recorded'))  # doctest: +SKIP
+
+    """
+
+    MODES = ('record', 'replay', 'auto')
+
+    def __init__(self, fname, mode='auto', latency=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Cassette mode must be one of {self.MODES}: '{mode}'")
+
+        self.fname = Path(fname).expanduser()
+        self.latency = latency
+
+        if mode == 'auto':
+            mode = 'replay' if self.fname.exists() else 'record'
+
+        self.mode = mode
+        self.interactions = []
+        self._queues = {}
+        self._lock = threading.Lock()
+
+        if mode == 'replay':
+            self.interactions = json.loads(self.fname.read_text(encoding='utf-8'))
+            for interaction in self.interactions:
+                request = interaction['request']
+                key = _key(request['method'], request['url'], request['body'])
+                self._queues.setdefault(key, deque()).append(interaction)
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}> {self.fname} '
+                f'({self.mode}: {len(self)} interactions)')
+
+    def __len__(self):
+        return len(self.interactions)
+
+    def adapter(self, pool_size=10):
+        """Transport adapter recording or replaying the exchanges.
+
+        Parameters
+        ----------
+        pool_size: int, optional
+            Connection pool size (only used in ``record`` mode).
+
+        Returns
+        -------
+        requests.adapters.HTTPAdapter
+            Adapter to mount on the API session.
+
+        """
+        cls = RecordAdapter if self.mode == 'record' else ReplayAdapter
+        return cls(self, pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def record(self, request, response, elapsed):
+        """Record an exchange and append it to the cassette.
+
+        Parameters
+        ----------
+        request: requests.PreparedRequest
+            Request sent.
+        response: requests.Response
+            Response received.
+        elapsed: float
+            Response latency (in seconds).
+
+        """
+        interaction = {
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'body': _body(request),
+            },
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': {
+                    key: value for key, value in response.headers.items()
+                    if key.lower() not in TRANSPORT_HEADERS
+                },
+                'body': response.content.decode('utf-8'),
+            },
+            'elapsed': elapsed,
+        }
+
+        with self._lock:
+            self.interactions.append(interaction)
+            self._append(json.dumps(interaction))
+
+    def _append(self, line):
+        """Append an interaction line to the cassette (without rewriting it)."""
+        if len(self.interactions) == 1:
+            self.fname.parent.mkdir(parents=True, exist_ok=True)
+            self.fname.write_bytes(f'[\n{line}\n]\n'.encode('utf-8'))
+            return
+
+        with self.fname.open('r+b') as f:
+            f.seek(-len(b'\n]\n'), io.SEEK_END)  # Overwrite the closing bracket
+            f.write(f',\n{line}\n]\n'.encode('utf-8'))
+
+    def play(self, request):
+        """Find the recorded response of a request.
+
+        Parameters
+        ----------
+        request: requests.PreparedRequest
+            Request to replay.
+
+        Returns
+        -------
+        dict
+            Recorded interaction.
+
+        Raises
+        ------
+        InteractionNotFound
+            If the request was not recorded.
+
+        """
+        key = _key(request.method, request.url, _body(request))
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise InteractionNotFound(request.method, request.url)
+
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def delay(self, interaction):
+        """Simulated latency of a replayed interaction (in seconds)."""
+        if self.latency is None:
+            return 0
+        if self.latency == 'recorded':
+            return interaction['elapsed']
+        return float(self.latency)
+
+
+class RecordAdapter(HTTPAdapter):
+    """Transport adapter recording the API exchanges in a cassette."""
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send the request to the API and record the exchange."""
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        self.cassette.record(request, response, time.perf_counter() - start)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter replaying the API exchanges from a cassette."""
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **_):  # pylint: disable=arguments-differ
+        """Replay the recorded response of the request (without any request)."""
+        interaction = self.cassette.play(request)
+
+        delay = self.cassette.delay(interaction)
+        if delay > 0:
+            time.sleep(delay)
+
+        recorded = interaction['response']
+        raw = HTTPResponse(
+            body=io.BytesIO(recorded['body'].encode('utf-8')),
+            headers=recorded['headers'],
+            status=recorded['status'],
+            reason=recorded['reason'],
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+_CASSETTES = {}
+_CASSETTES_LOCK = threading.Lock()
+
+
+def get_cassette(fname):
+    """Shared cassette of a file (in ``auto`` mode).
+
+    All the APIs recording in (or replaying from) the same file share
+    the same cassette: otherwise, each one would record its own exchanges
+    and overwrite the ones of the others.
+
+    Parameters
+    ----------
+    fname: str or pathlib.Path
+        Cassette JSON file.
+
+    Returns
+    -------
+    Cassette
+        Cassette shared by all the callers of the same (resolved) file.
+
+    """
+    path = Path(fname).expanduser().resolve()
+
+    with _CASSETTES_LOCK:
+        if path not in _CASSETTES:
+            _CASSETTES[path] = Cassette(path)
+        return _CASSETTES[path]
@@ -98,10 +98,8 @@ def cli_bodies(argv=None):
         bodies = args.api.bodies(kernel)
 
         if args.name:
-            for body in bodies:
-                for name in args.name:
-                    if name in body:
-                        print(f" - {str(body)}: (id: {int(body)})")
+            for body in _search(args.api.index('bodies', kernel), args.name):
+                print(f" - {str(body)}: (id: {int(body)})")
         else:
             print('\n'.join([f" - {str(body)}: (id: {int(body)})" for body in bodies]))
     else:
@@ -131,10 +129,8 @@ def cli_frames(argv=None):
         frames = args.api.frames(kernel)
 
         if args.name:
-            for frame in frames:
-                for name in args.name:
-                    if name in frame:
-                        print(f" - {str(frame)}: (id: {int(frame)})")
+            for frame in _search(args.api.index('frames', kernel), args.name):
+                print(f" - {str(frame)}: (id: {int(frame)})")
         else:
             print('\n'.join([f" - {str(frame)}: (id: {int(frame)})" for frame in frames]))
     else:
@@ -164,10 +160,8 @@ def cli_instruments(argv=None):
         instruments = args.api.instruments(kernel)
 
         if args.name:
-            for instrument in instruments:
-                for name in args.name:
-                    if name in instrument:
-                        print(f" - {str(instrument)}: (id: {int(instrument)})")
+            for instrument in _search(args.api.index('instruments', kernel), args.name):
+                print(f" - {str(instrument)}: (id: {int(instrument)})")
         else:
             print('\n'.join(
                 [f" - {str(instrument)}: (id: {int(instrument)})"
@@ -176,6 +170,21 @@ def cli_instruments(argv=None):
         parser.print_help()
 
 
+def _search(index, names):
+    """Search items in a catalog index by names or ids (without duplicates)."""
+    items = {}
+    for name in names:
+        try:
+            name = int(name)
+        except ValueError:
+            pass
+
+        for item in index.search(name):
+            items[id(item)] = item
+
+    return list(items.values())
+
+
 def _strip(string, chars='[]="\''):
     for char in chars:
         string = string.replace(char, '')
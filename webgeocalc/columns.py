@@ -0,0 +1,246 @@
+"""Webgeocalc columnar results (and typed NumPy arrays)."""
+
+import time
+from collections.abc import Mapping
+
+
+class ColumnarResults(Mapping):
+    """Columnar view of calculation results.
+
+    Each column is transposed from the rows on its first access only,
+    and then kept (the returned lists are shared, they should not be mutated).
+    With a single row, the values are returned as scalars
+    (as in :py:attr:`webgeocalc.calculation.Calculation.results`).
+    The time spent transposing the columns is accumulated in :py:attr:`elapsed`.
+
+    Parameters
+    ----------
+    columns: [webgeocalc.types.ColumnResult]
+        Results columns.
+    rows: [list]
+        Results rows.
+
+    Example
+    -------
+    >>> from webgeocalc.types import ColumnResult
+    >>> view = ColumnarResults([ColumnResult({'outputID': 'DATE'}),
+    ...                         ColumnResult({'outputID': 'DISTANCE'})],
+    ...                        [['2012-10-19', 764142.64], ['2012-10-20', 764265.12]])
+    >>> view['DISTANCE']
+    [764142.64, 764265.12]
+    >>> list(view)
+    ['DATE', 'DISTANCE']
+
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.size = len(rows)
+        self.elapsed = 0.0
+        self._keys = {column.outputID: i for i, column in enumerate(columns)}
+        self._data = {}
+        self._dict = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self.size} rows: {", ".join(self)}'
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __getitem__(self, key):
+        values = self.column(key)
+        return values[0] if self.size == 1 else values
+
+    def column(self, key):
+        """Column values (transposed on the first access).
+
+        Parameters
+        ----------
+        key: str
+            Column ``outputID``.
+
+        Returns
+        -------
+        list
+            Column values (even with a single row).
+
+        Raises
+        ------
+        KeyError
+            If the column is unknown.
+
+        """
+        if key not in self._data:
+            i = self._keys[key]
+            start = time.perf_counter()
+            self._data[key] = [row[i] for row in self.rows]
+            self.elapsed += time.perf_counter() - start
+        return self._data[key]
+
+    def to_dict(self):
+        """Columns values as a dict (built once, then shared).
+
+        Returns
+        -------
+        dict
+            Columns values (scalars with a single row). The dict and its lists
+            are shared by all the callers, they should not be mutated.
+
+        """
+        if self._dict is None:
+            self._dict = dict(self)
+        return self._dict
+
+    def release(self):
+        """Transpose all the columns and release the rows."""
+        if self.rows is not None:
+            for key in self:
+                self.column(key)
+            self.rows = None
+
+    def iter_rows(self):
+        """Iterate over the rows (rebuilt from the columns if released)."""
+        if self.rows is not None:
+            return iter(self.rows)
+        return map(list, zip(*(self._data[key] for key in self)))
+
+
+def _numpy():
+    """Import NumPy (optional dependency)."""
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise ImportError('The columnar results require NumPy: '
+                          'pip install webgeocalc[numpy]') from None
+    return numpy
+
+
+def _dates(np, values, metadata):
+    """Parse the dates values as ``datetime64[us]`` (if possible)."""
+    # Strip the time scale suffix (eg. `2012-10-19 09:00:00.000000 UTC`)
+    scale = values[0].rsplit(' ', 1)[-1] if values and isinstance(values[0], str) else ''
+    if scale.isalpha():
+        metadata['scale'] = scale
+        values = [value[:-len(scale) - 1] for value in values]
+
+    try:
+        return np.array(values, dtype=np.dtype('datetime64[us]', metadata=metadata))
+    except (TypeError, ValueError):
+        # Unsupported dates formats (eg. Julian dates or day of year)
+        return np.array(values, dtype=np.dtype(str, metadata=metadata))
+
+
+def column_array(column, values):
+    """Convert the values of a results column to a typed NumPy array.
+
+    The dtype depends on the column ``type``:
+
+    - ``DATE``: ``datetime64[us]`` (the time scale suffix is stored in the
+      dtype metadata ``scale``), or ``str`` if the dates format is not ISO-like.
+    - ``NUMBER``: ``int64`` if all the values are integers, ``float64``
+      otherwise (the missing values are ``NaN``).
+    - other types: ``str``.
+
+    The column ``units`` are stored in the dtype metadata ``units``.
+
+    Parameters
+    ----------
+    column: webgeocalc.types.ColumnResult
+        Results column.
+    values: list
+        Column values.
+
+    Returns
+    -------
+    numpy.ndarray
+        Column values array.
+
+    """
+    np = _numpy()
+    kind = getattr(column, 'type', None)
+    metadata = {'units': getattr(column, 'units', '')}
+
+    if kind == 'DATE':
+        return _dates(np, values, metadata)
+
+    if kind == 'NUMBER':
+        if values and all(isinstance(value, int) and not isinstance(value, bool)
+                          for value in values):
+            return np.array(values, dtype=np.dtype('int64', metadata=metadata))
+        return np.array(values, dtype=np.dtype('float64', metadata=metadata))
+
+    return np.array(values, dtype=np.dtype(str, metadata=metadata))
+
+
+def as_columns(columns, rows):
+    """Convert calculation results rows to typed NumPy arrays per column.
+
+    See: :py:func:`column_array`.
+
+    Parameters
+    ----------
+    columns: [webgeocalc.types.ColumnResult]
+        Results columns.
+    rows: [list] or ColumnarResults
+        Results rows (or their columnar view).
+
+    Returns
+    -------
+    dict
+        Column values arrays (by column ``outputID``).
+
+    Example
+    -------
+    >>> from webgeocalc.types import ColumnResult
+    >>> columns = [
+    ...     ColumnResult({'outputID': 'DATE', 'type': 'DATE'}),
+    ...     ColumnResult({'outputID': 'DISTANCE', 'type': 'NUMBER', 'units': 'km'}),
+    ... ]
+    >>> data = as_columns(columns, [['2012-10-19 08:24:00.000000 UTC', 764142.64],
+    ...                             ['2012-10-19 09:00:00.000000 UTC', 764265.12]])
+    >>> data['DATE']
+    array(['2012-10-19T08:24:00.000000', '2012-10-19T09:00:00.000000'],
+          dtype='datetime64[us]')
+    >>> data['DISTANCE']
+    array([764142.64, 764265.12])
+
+    """
+    view = rows if isinstance(rows, ColumnarResults) else ColumnarResults(columns, rows)
+    return {
+        column.outputID: column_array(column, view.column(column.outputID))
+        for column in columns
+    }
+
+
+def results_array(columns, rows):
+    """Convert calculation results rows to a NumPy structured array.
+
+    The fields are the columns ``outputID`` with the dtypes
+    of :py:func:`column_array`.
+
+    Parameters
+    ----------
+    columns: [webgeocalc.types.ColumnResult]
+        Results columns.
+    rows: [list] or ColumnarResults
+        Results rows (or their columnar view).
+
+    Returns
+    -------
+    numpy.ndarray
+        Results structured array (one record per row).
+
+    """
+    np = _numpy()
+    data = as_columns(columns, rows)
+    size = rows.size if isinstance(rows, ColumnarResults) else len(rows)
+
+    array = np.empty(size, dtype=[(key, value.dtype) for key, value in data.items()])
+    for key, value in data.items():
+        array[key] = value
+
+    return array
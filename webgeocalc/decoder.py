@@ -0,0 +1,272 @@
+"""Webgeocalc JSON decoders and streaming results parser."""
+
+import codecs
+import json
+import os
+
+
+def _orjson():
+    """Fast ``orjson`` decoder (if installed)."""
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return orjson.loads  # pylint: disable=no-member
+
+
+def get_decoder(decoder=None):
+    """Get a JSON decoder.
+
+    Parameters
+    ----------
+    decoder: str or callable, optional
+        Decoder name (``json`` or ``orjson``) or function decoding
+        a JSON document (``bytes`` or ``str``). Use ``WGC_JSON_DECODER``
+        global environment variable if present. If not, ``orjson``
+        is used if it is installed (``pip install webgeocalc[fast]``),
+        and the standard :py:mod:`json` module otherwise.
+
+    Returns
+    -------
+    callable
+        JSON decoder.
+
+    Raises
+    ------
+    ValueError
+        If the decoder is unknown.
+    ImportError
+        If ``orjson`` is required but not installed.
+
+    """
+    if callable(decoder):
+        return decoder
+
+    if decoder is None:
+        decoder = os.environ.get('WGC_JSON_DECODER') or None
+
+    if decoder in (None, 'orjson'):
+        loads = _orjson()
+        if loads is not None:
+            return loads
+        if decoder == 'orjson':
+            raise ImportError("The 'orjson' decoder requires: pip install orjson")
+
+    if decoder in (None, 'json'):
+        return json.loads
+
+    raise ValueError(f"Unknown JSON decoder: '{decoder}' (expected: 'json' or 'orjson')")
+
+
+class ResultsParser:
+    """Incremental parser of a calculation results JSON response.
+
+    The response is read chunk by chunk. The top-level fields
+    (``status``, ``columns``...) are decoded as they come and the
+    ``rows`` are yielded one by one, so that only the current
+    chunk is kept in memory.
+
+    The rows available in a chunk are decoded at once with the
+    ``decoder`` (and one by one with the standard :py:mod:`json`
+    scanner when a row is split between two chunks).
+
+    Parameters
+    ----------
+    chunks: iterable
+        Response content chunks (``bytes`` or ``str``).
+    decoder: callable, optional
+        JSON decoder (see: :py:func:`get_decoder`).
+
+    """
+
+    WHITESPACES = ' \t\n\r'
+
+    def __init__(self, chunks, decoder=None):
+        self.fields = {}
+        self.decoder = get_decoder(decoder)
+
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._scanner = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._started = False
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> fields: {list(self.fields)}'
+
+    def _fill(self):
+        """Read the next chunk (``False`` at the end of the response)."""
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+
+        if isinstance(chunk, bytes):
+            chunk = self._utf8.decode(chunk)
+
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """Next non-whitespace character (empty at the end of the response)."""
+        while True:
+            while self._pos < len(self._buffer) and \
+                    self._buffer[self._pos] in self.WHITESPACES:
+                self._pos += 1
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars):
+        """Consume one of the expected characters."""
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f'Invalid JSON results: expected {chars!r} '
+                             f'(got {char!r})')
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode the next JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._scanner.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            # A number at the end of the chunk may continue in the next one
+            if end == len(self._buffer) and not isinstance(value, (str, list, dict)) \
+                    and self._fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def fields_until(self, key='rows'):
+        """Decode the top-level fields until a key.
+
+        Parameters
+        ----------
+        key: str, optional
+            Key to stop at (its value is not decoded).
+
+        Returns
+        -------
+        bool
+            ``True`` if the key was found (the parser is positioned
+            on its value), ``False`` if the response ended before.
+
+        """
+        if not self._started:
+            self._expect('{')
+            self._started = True
+
+        while True:
+            char = self._peek()
+
+            if char == '}':
+                self._pos += 1
+                return False
+
+            if char == ',':
+                self._pos += 1
+                continue
+
+            name = self._value()
+            self._expect(':')
+
+            if name == key:
+                return True
+
+            self.fields[name] = self._value()
+
+    def _batch(self):
+        """Decode at once the complete rows available in the buffer."""
+        end = self._buffer.rfind('],', self._pos)
+        if end < 0:
+            return None
+
+        try:
+            rows = self.decoder('[' + self._buffer[self._pos:end + 1] + ']')
+        except ValueError:
+            return None
+
+        self._pos = end + 1
+        return rows
+
+    def rows(self):
+        """Iterate over the rows.
+
+        Yields
+        ------
+        list
+            Row values.
+
+        """
+        self._expect('[')
+
+        while True:
+            char = self._peek()
+
+            if char == ']':
+                self._pos += 1
+                return
+
+            if char == ',':
+                self._pos += 1
+                continue
+
+            rows = self._batch()
+            if rows is None:
+                yield self._value()
+            else:
+                yield from rows
+
+
+def stream_results(chunks, decoder=None):
+    """Parse incrementally a calculation results JSON response.
+
+    Parameters
+    ----------
+    chunks: iterable
+        Response content chunks (``bytes`` or ``str``).
+    decoder: str or callable, optional
+        JSON decoder (see: :py:func:`get_decoder`).
+
+    Returns
+    -------
+    (dict, iterator)
+        Top-level fields decoded before the ``rows`` (``status``,
+        ``columns``...) and the iterator over the rows.
+        If the ``columns`` come after the ``rows`` in the response,
+        the rows are decoded at once.
+
+    Example
+    -------
+    >>> fields, rows = stream_results([b'{"status": "OK", "columns": [{"outputID": ',
+    ...                                b'"DATE"}], "rows": [["2012-10-19"], ["2012-',
+    ...                                b'10-20"]]}'])
+    >>> fields['columns']
+    [{'outputID': 'DATE'}]
+    >>> list(rows)
+    [['2012-10-19'], ['2012-10-20']]
+
+    """
+    parser = ResultsParser(chunks, decoder=decoder)
+
+    if not parser.fields_until('rows'):
+        return parser.fields, iter(())
+
+    if 'columns' in parser.fields:
+        return parser.fields, parser.rows()
+
+    rows = list(parser.rows())
+    parser.fields_until(None)
+    return parser.fields, iter(rows)
@@ -5,6 +5,32 @@ class APIError(IOError):
     """This exception is raised when the status of the API response is not OK."""
 
 
+class InteractionNotFound(APIError):
+    """This exception is raised when a request was not recorded in the cassette."""
+
+    def __init__(self, method, url):
+        msg = f"Request '{method} {url}' not found in the cassette"
+        super().__init__(msg)
+
+
+class APIUnavailable(APIError):
+    """This exception is raised when no API is available to submit a calculation."""
+
+    def __init__(self, urls):
+        msg = f'No API available to submit the calculation: {urls}'
+        super().__init__(msg)
+
+
+class CircuitOpen(APIError):
+    """This exception is raised when the API circuit breaker is open."""
+
+    def __init__(self, url, retry_in):
+        self.url = url
+        self.retry_in = retry_in
+        msg = f"API circuit open: '{url}' (retry in {retry_in:.1f} s)"
+        super().__init__(msg)
+
+
 class APIResponseError(NotImplementedError):
     """This exception is raised when the format of the API response is not implemented."""
 
@@ -47,6 +73,24 @@ class KernelSetNotFound(ValueError):
         super().__init__(msg)
 
 
+class TooManyItems(ValueError):
+    """This exception is raised when more than one item is found."""
+
+    def __init__(self, name, items, kind='items'):
+        msg = '\n - '.join([
+            f"Too many {kind} contains '{name}' in their names:"
+        ] + [str(item) for item in items])
+        super().__init__(msg)
+
+
+class ItemNotFound(ValueError):
+    """This exception is raised when an item is not found."""
+
+    def __init__(self, name, kind='Item'):
+        msg = f"{kind} '{name}' not found"
+        super().__init__(msg)
+
+
 class CalculationRequiredAttr(AttributeError):
     """This exception is raised when a calculation attribute is required."""
 
@@ -130,11 +174,22 @@ class CalculationFailed(IOError):
 
 
 class CalculationTimeOut(IOError):
-    """This exception is raised when calculation time-out."""
+    """This exception is raised when calculation time-out.
+
+    The number of ``attempts`` is estimated from the ``sleep`` duration
+    if it is not provided (as in the previous versions).
+
+    """
+
+    def __init__(self, timeout, sleep=None, attempts=None):
+        if attempts is None:
+            attempts = int(timeout / sleep) if sleep else 0
+
+        self.timeout = timeout
+        self.attempts = attempts
 
-    def __init__(self, timeout, sleep):
         msg = f'Calculation time-out after {timeout} seconds' + \
-              f' ({int(timeout / sleep)} attempts)'
+              f' ({attempts} attempts)'
         super().__init__(msg)
 
 
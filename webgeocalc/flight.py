@@ -0,0 +1,295 @@
+"""Webgeocalc single-flight calculations registry and lazy caches."""
+
+import threading
+import time
+
+from .phase import CalculationPhase, Phase
+
+
+class _Flight:
+    """In-flight calculation shared by identical payloads."""
+
+    def __init__(self, key):
+        self.key = key
+        self.id = None
+        self.phase = None
+        self.refs = 1
+        self.created = time.monotonic()
+        self.results = None
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+
+
+class SingleFlight:
+    """Registry of the in-flight calculations of an API.
+
+    The first submission of a payload is sent to the API, the
+    identical payloads submitted while it is still in flight
+    are attached to the same calculation ``id`` (without any new request).
+    Its results are downloaded once and shared by all the callers.
+
+    A calculation is released when all the callers retrieved its results
+    (or cancelled it), or as soon as it fails (the next identical payloads
+    are submitted again). Once its results are downloaded, the next
+    identical payloads are not attached to it anymore.
+
+    The callers that give up (eg. after a timeout) never release their
+    calculation, the flights older than ``ttl`` are therefore dropped
+    (with their shared results).
+
+    Parameters
+    ----------
+    ttl: float, optional
+        Maximum lifetime of a calculation in flight (in seconds).
+
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._ids = {}
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {len(self)} calculation(s) in flight'
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def submit(self, key, submit):
+        """Submit a calculation or attach to the identical one in flight.
+
+        Parameters
+        ----------
+        key: str
+            Calculation payload key (see: :py:func:`webgeocalc.cache.payload_key`).
+        submit: callable
+            Function submitting the calculation and returning its
+            ``(calculation-id, phase)``.
+
+        Returns
+        -------
+        (str, webgeocalc.phase.CalculationPhase)
+            Tuple of the calculation phase: ``(calculation-id, phase)``.
+
+        """
+        with self._lock:
+            self._expire()
+            flight = self._keys.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = self._keys[key] = _Flight(key)
+            else:
+                flight.refs += 1
+
+        if leader:
+            try:
+                flight.id, flight.phase = submit()
+            finally:
+                with self._lock:
+                    if flight.id is None:
+                        self._keys.pop(key, None)
+                    else:
+                        self._ids[flight.id] = flight
+                flight.ready.set()
+        else:
+            flight.ready.wait()
+
+            if flight.id is None:  # The leader submission failed
+                return self.submit(key, submit)
+
+        return flight.id, flight.phase
+
+    def phase(self, calculation_id, phase):
+        """Record the last phase of a calculation.
+
+        A failed calculation is released.
+
+        Parameters
+        ----------
+        calculation_id: str
+            Calculation id.
+        phase: webgeocalc.phase.CalculationPhase
+            Calculation phase returned by the API.
+
+        """
+        flight = self._ids.get(calculation_id)
+        if flight is None:
+            return
+
+        flight.phase = phase
+
+        if phase.phase.failed:
+            with self._lock:
+                self._ids.pop(flight.id, None)
+                if self._keys.get(flight.key) is flight:
+                    del self._keys[flight.key]
+
+    def results(self, calculation_id, fetch):
+        """Download the results of a calculation once and share them.
+
+        Parameters
+        ----------
+        calculation_id: str
+            Calculation id.
+        fetch: callable
+            Function downloading the calculation ``(columns, rows)``.
+
+        Returns
+        -------
+        ([webgeocalc.types.ColumnResult], list)
+            Tuple of calculation results: ``(columns, rows)``.
+
+        """
+        flight = self._ids.get(calculation_id)
+        if flight is None:
+            return fetch()
+
+        with flight.lock:
+            if flight.results is None:
+                flight.results = fetch()
+
+        with self._lock:
+            self._expire()
+            # Complete calculation: the next identical payloads are submitted again
+            if self._keys.get(flight.key) is flight:
+                del self._keys[flight.key]
+
+        self._release(flight)
+        return flight.results
+
+    def cancel(self, calculation_id, cancel):
+        """Cancel a calculation only if no other caller is attached to it.
+
+        Otherwise, the caller is only detached from the calculation
+        and a local ``CANCELLED`` phase is returned.
+
+        Parameters
+        ----------
+        calculation_id: str
+            Calculation id.
+        cancel: callable
+            Function cancelling the calculation and returning its
+            ``(calculation-id, phase)``.
+
+        Returns
+        -------
+        (str, webgeocalc.phase.CalculationPhase)
+            Tuple of the calculation phase: ``(calculation-id, phase)``.
+
+        """
+        flight = self._ids.get(calculation_id)
+        if flight is None:
+            return cancel()
+
+        if self._release(flight):
+            return flight.id, CalculationPhase(Phase.CANCELLED)
+
+        return cancel()
+
+    def _expire(self):
+        """Drop the flights older than ``ttl`` (abandoned by their callers)."""
+        now = time.monotonic()
+        for flight in [f for f in self._keys.values() if now - f.created > self.ttl]:
+            del self._keys[flight.key]
+
+        for flight in [f for f in self._ids.values() if now - f.created > self.ttl]:
+            del self._ids[flight.id]
+
+    def _release(self, flight):
+        """Detach a caller and return ``True`` if some callers remain."""
+        with self._lock:
+            flight.refs -= 1
+            if flight.refs > 0:
+                return True
+
+            self._ids.pop(flight.id, None)
+            if self._keys.get(flight.key) is flight:
+                del self._keys[flight.key]
+
+        return False
+
+
+class OnceCache:
+    """Thread-safe lazy cache with single-flight loading.
+
+    The first caller of a missing key loads its value, the concurrent
+    callers of the same key wait for it and share the same value
+    (the different keys are loaded concurrently). If the loading fails,
+    the error is raised to its caller and the next caller loads it again.
+
+    Example
+    -------
+    >>> cache = OnceCache()
+    >>> cache.get('/kernel-sets', lambda: ['Solar System Kernels'])
+    ['Solar System Kernels']
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._loading = {}
+        self._generation = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {len(self)} item(s)'
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, load):
+        """Get a cached value or load it once.
+
+        Parameters
+        ----------
+        key: hashable
+            Cache key.
+        load: callable
+            Function loading the value (called without arguments).
+
+        Returns
+        -------
+        any
+            Cached value.
+
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            lock = self._loading.setdefault(key, threading.Lock())
+            generation = self._generation
+
+        with lock:
+            if key in self._values:
+                return self._values[key]
+
+            value = load()
+
+            with self._lock:
+                if generation == self._generation:
+                    self._values[key] = value
+                    self._loading.pop(key, None)
+
+        return value
+
+    def clear(self):
+        """Clear all the cached values.
+
+        The values still loading are not cached.
+
+        """
+        with self._lock:
+            self._values = {}
+            self._loading = {}
+            self._generation += 1
@@ -0,0 +1,207 @@
+"""Webgeocalc API and calculations hooks."""
+
+import json
+import threading
+import time
+import warnings
+from pathlib import Path
+
+
+class Hooks:
+    """Registry of callbacks called on API or calculations events.
+
+    Each callback is called with a single ``dict`` describing the event
+    (its name is provided in the ``event`` key). A failing callback never
+    interrupts the requests or the calculations, its error is only
+    reported as a :py:class:`RuntimeWarning`.
+
+    Parameters
+    ----------
+    *events: str
+        Supported events names.
+    **callbacks: callable, optional
+        Callbacks registered on the events (by name, ``None`` are ignored).
+
+    Example
+    -------
+    >>> hooks = Hooks('request', 'response')
+    >>> hooks.on('response', lambda info: print(info['endpoint'], info['elapsed']))
+    <function <lambda> at ...>
+
+    """
+
+    def __init__(self, *events, **callbacks):
+        self.events = events
+        self._callbacks = {event: [] for event in events}
+
+        for event, callback in callbacks.items():
+            if callback is not None:
+                self.on(event, callback)
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}> ' + ', '.join(
+            f'{event}: {len(callbacks)}' for event, callbacks in self._callbacks.items()))
+
+    def __bool__(self):
+        return any(self._callbacks.values())
+
+    def _check(self, event):
+        """Check if the event is supported."""
+        if event not in self._callbacks:
+            raise ValueError(f"Unknown event '{event}' (expected: {self.events})")
+
+    def on(self, event, callback=None):
+        """Register a callback on an event.
+
+        Can also be used as a decorator (without ``callback``).
+
+        Parameters
+        ----------
+        event: str
+            Event name.
+        callback: callable, optional
+            Function called with the event ``dict``.
+
+        Returns
+        -------
+        callable
+            Registered callback.
+
+        """
+        self._check(event)
+
+        if callback is None:
+            return lambda func: self.on(event, func)
+
+        self._callbacks[event].append(callback)
+        return callback
+
+    def off(self, event, callback):
+        """Remove a callback from an event."""
+        self._check(event)
+
+        if callback in self._callbacks[event]:
+            self._callbacks[event].remove(callback)
+
+    def emit(self, event, **info):
+        """Call the callbacks registered on an event.
+
+        Parameters
+        ----------
+        event: str
+            Event name.
+        **info:
+            Event details.
+
+        """
+        info['event'] = event
+
+        for callback in list(self._callbacks[event]):
+            try:
+                callback(info)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                warnings.warn(f"Hook {callback!r} failed on '{event}': {err}",
+                              RuntimeWarning)
+
+
+class SpanExporter:
+    """JSON lines spans exporter.
+
+    Record the API requests and the calculations phases as spans
+    (one JSON object per line, with its ``start`` wall-clock time and
+    its ``duration`` in seconds) to build timelines of the runs.
+
+    Parameters
+    ----------
+    fname: str or pathlib.Path
+        JSON lines output file (the spans are appended).
+
+    Example
+    -------
+    >>> exporter = SpanExporter('spans.jsonl')  # doctest: +SKIP
+    >>> exporter.attach(API.hooks, CALCULATION_HOOKS)  # doctest: +SKIP
+
+    """
+
+    def __init__(self, fname):
+        self.fname = Path(fname).expanduser()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self.fname}'
+
+    def __call__(self, info):
+        """Export the span of an event."""
+        span = getattr(self, f'_{info["event"]}_span')(info)
+        span['thread'] = threading.get_ident()
+
+        with self._lock, self.fname.open('a', encoding='utf-8') as f:
+            f.write(json.dumps(span, default=str) + '\n')
+
+    def attach(self, *hooks):
+        """Export the spans of API and/or calculations hooks.
+
+        Parameters
+        ----------
+        *hooks: webgeocalc.hooks.Hooks
+            API hooks (see: :py:attr:`webgeocalc.Api.hooks`)
+            or calculations hooks (see: :py:obj:`CALCULATION_HOOKS`).
+
+        """
+        for registry in hooks:
+            for event in ('response', 'error', 'submit', 'phase', 'results'):
+                if event in registry.events:
+                    registry.on(event, self)
+
+    @staticmethod
+    def _request_span(info, **kwargs):
+        """API request span."""
+        return {
+            'kind': 'request',
+            'name': f'{info["method"]} {info["endpoint"]}',
+            'start': time.time() - info['elapsed'],
+            'duration': info['elapsed'],
+            'url': info['url'],
+            'status': info['status'],
+            'attempt': info['attempt'],
+            **kwargs,
+        }
+
+    def _response_span(self, info):
+        """Successful API request span."""
+        return self._request_span(info, size=info['size'],
+                                  result_type=info['result_type'])
+
+    def _error_span(self, info):
+        """Failed API request span."""
+        return self._request_span(info, error=repr(info['error']))
+
+    @staticmethod
+    def _calculation_span(info, name, duration, **kwargs):
+        """Calculation span."""
+        return {
+            'kind': 'calculation',
+            'name': name,
+            'start': time.time() - duration,
+            'duration': duration,
+            'calculation': info['id'],
+            **kwargs,
+        }
+
+    def _submit_span(self, info):
+        """Calculation submission span."""
+        return self._calculation_span(info, 'submit', info['elapsed'],
+                                      cached=info['cached'])
+
+    def _phase_span(self, info):
+        """Calculation previous phase span."""
+        return self._calculation_span(info, str(info['previous']), info['elapsed'])
+
+    def _results_span(self, info):
+        """Calculation results span."""
+        return self._calculation_span(info, 'results', info['elapsed'],
+                                      cached=info['cached'])
+
+
+# Hooks shared by all the calculations
+CALCULATION_HOOKS = Hooks('submit', 'phase', 'results')
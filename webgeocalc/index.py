@@ -0,0 +1,101 @@
+"""Webgeocalc API items lookup index."""
+
+
+class Index:
+    """Lookup index of API items (kernel sets, bodies, frames or instruments).
+
+    Map the items ``id``, exact ``name`` and lowercase ``name``
+    to the items positions, to resolve them without scanning the whole list
+    (the items are only accessed on the matches).
+    The partial ``name`` searches are scanned once and memoized.
+
+    Parameters
+    ----------
+    items: [webgeocalc.types.ResultType]
+        List of API items.
+    keys: iterable, optional
+        Items ``(id, name)`` pairs (in the same order). If not provided,
+        they are extracted from the items with ``int`` and ``str``.
+
+    """
+
+    def __init__(self, items, keys=None):
+        self.items = items
+        self.ids = {}
+        self.names = {}
+        self.lower_names = {}
+        self._lower = []
+
+        if keys is None:
+            keys = ((int(item), str(item)) for item in items)
+
+        for pos, (item_id, name) in enumerate(keys):
+            self.ids.setdefault(item_id, []).append(pos)
+            self.names.setdefault(name, []).append(pos)
+            self.lower_names.setdefault(name.lower(), []).append(pos)
+            self._lower.append(name.lower())
+
+        self._searches = {}
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {len(self)} items'
+
+    def __len__(self):
+        return len(self.items)
+
+    def _get(self, positions):
+        """Items at some positions."""
+        return [self.items[pos] for pos in positions]
+
+    def search(self, key):
+        """Search items by ``id`` or by case-insensitive partial ``name``.
+
+        Parameters
+        ----------
+        key: int or str
+            Item ``id`` or (partial) ``name``.
+
+        Returns
+        -------
+        [webgeocalc.types.ResultType]
+            List of matching items (in the original order).
+
+        """
+        if isinstance(key, int):
+            return self._get(self.ids.get(key, []))
+
+        key = key.lower()
+        if key not in self._searches:
+            self._searches[key] = [
+                pos for pos, name in enumerate(self._lower) if key in name
+            ]
+
+        return self._get(self._searches[key])
+
+    def find(self, key):
+        """Find items by ``id`` or ``name``.
+
+        The exact ``name`` matches (case-sensitive then case-insensitive)
+        take precedence over the partial matches.
+
+        Parameters
+        ----------
+        key: int or str
+            Item ``id`` or (partial) ``name``.
+
+        Returns
+        -------
+        [webgeocalc.types.ResultType]
+            List of matching items.
+
+        """
+        if isinstance(key, int):
+            return self._get(self.ids.get(key, []))
+
+        if key in self.names:
+            return self._get(self.names[key])
+
+        if key.lower() in self.lower_names:
+            return self._get(self.lower_names[key.lower()])
+
+        return self.search(key)
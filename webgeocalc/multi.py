@@ -0,0 +1,331 @@
+"""Webgeocalc multiple APIs load balancing and failover."""
+
+import threading
+import time
+
+import requests
+
+from .api import Api
+from .breaker import server_failure
+from .errors import APIUnavailable, CircuitOpen, KernelSetNotFound, TooManyKernelSets
+from .phase import Phase
+
+
+class _Backend:
+    """API load and health observed by a multiple APIs object."""
+
+    def __init__(self, api):
+        self.api = api
+        self.in_flight = 0
+        self.queue = 0
+        self.latency = None
+        self.down_until = 0
+        self.kernel_sets = {}
+
+    def healthy(self, now):
+        """Check if the API is not in its failure cool down period."""
+        return now >= self.down_until
+
+    def score(self):
+        """Expected wait of a new calculation (lower is better)."""
+        return (self.queue + self.in_flight + 1) * (self.latency or 0)
+
+    def observe(self, latency, smoothing):
+        """Record a submission latency (exponential moving average)."""
+        self.latency = latency if self.latency is None \
+            else smoothing * latency + (1 - smoothing) * self.latency
+
+    def as_dict(self, now):
+        """Backend status summary."""
+        return {
+            'healthy': self.healthy(now),
+            'in_flight': self.in_flight,
+            'queue': self.queue,
+            'latency': self.latency,
+        }
+
+
+class _Route:
+    """API running a calculation."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.created = time.monotonic()
+        self.running = True
+
+
+class MultiApi:
+    """Load balancing and failover between multiple WebGeoCalc APIs.
+
+    The calculations are submitted to the compatible API with the
+    lowest expected wait, estimated from its observed queue depth
+    (queue position reported on its last submission), the number of
+    calculations still in flight on it and its submission latency. If an API is
+    unhealthy (connection errors, ``429`` or ``5XX`` responses after
+    the retries), it is skipped during a ``cooldown`` period and the
+    calculation is submitted to the next API (as well as when its
+    circuit breaker is open).
+
+    The kernel sets ``id`` differ between the servers: the calculations
+    payloads are built with the kernel sets of the first API and
+    are mapped to the other APIs by their exact ``caption``. An API missing
+    one of these kernel sets (or with an ambiguous ``caption``) is not used
+    for this calculation.
+
+    The phase updates, results and cancellations are sent to the API
+    running the calculation. A calculation is no longer counted in flight
+    once its phase is ``COMPLETE`` (or failed), and its route is dropped
+    when its results are retrieved, when it is cancelled or, if it was
+    abandoned (eg. timed out), after ``ttl`` seconds.
+    The metadata, kernel sets, bodies, frames and
+    instruments requests are answered by the first API.
+
+    Parameters
+    ----------
+    *apis: str or webgeocalc.Api
+        APIs root URLs or objects (at least one).
+    cooldown: float, optional
+        Delay (in seconds) before an unhealthy API is used again.
+    smoothing: float, optional
+        Smoothing factor of the latency moving average (between 0 and 1).
+    ttl: float, optional
+        Maximum lifetime of a calculation route (in seconds).
+
+    Example
+    -------
+    >>> api = MultiApi(JPL_API, ESA_API)  # doctest: +SKIP
+    >>> run_many([StateVector(api=api, ...) for _ in range(100)])  # doctest: +SKIP
+    >>> api.status()  # doctest: +SKIP
+    {'https://wgc2.jpl.nasa.gov:8443/webgeocalc/api': {'healthy': True, ...}, ...}
+
+    """
+
+    def __init__(self, *apis, cooldown=30, smoothing=0.2, ttl=3600):
+        if not apis:
+            raise ValueError('At least one API is required')
+
+        self.apis = [api if isinstance(api, Api) else Api(api) for api in apis]
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.ttl = ttl
+
+        self._backends = [_Backend(api) for api in self.apis]
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return ', '.join(api.url for api in self.apis)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self}'
+
+    def __getattr__(self, attr):
+        # Metadata and catalogs requests are answered by the first API
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.apis[0], attr)
+
+    def __getitem__(self, key):
+        return self.apis[0][key]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """Close all the APIs sessions."""
+        for api in self.apis:
+            api.close()
+
+    def status(self):
+        """Observed health and load of each API.
+
+        Returns
+        -------
+        dict
+            ``healthy``, ``in_flight``, ``queue`` and ``latency`` (in seconds)
+            of each API (by URL).
+
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {b.api.url: b.as_dict(now) for b in self._backends}
+
+    def _candidates(self):
+        """Healthy APIs sorted by expected wait."""
+        now = time.monotonic()
+        with self._lock:
+            backends = [b for b in self._backends if b.healthy(now)]
+            return sorted(backends, key=_Backend.score)
+
+    def _kernel_set_id(self, backend, kernel_set_id):
+        """Map a kernel set ``id`` of the first API to another API."""
+        if backend.api is self.apis[0]:
+            return kernel_set_id
+
+        if kernel_set_id not in backend.kernel_sets:
+            caption = str(self.apis[0].kernel_set(kernel_set_id))
+
+            # Exact caption only (not the partial matches of `Api.kernel_set`)
+            index = backend.api.index('kernel-sets')
+            kernel_sets = [index.items[pos] for pos in index.names.get(caption, [])]
+            if not kernel_sets:
+                raise KernelSetNotFound(caption)
+            if len(kernel_sets) > 1:
+                raise TooManyKernelSets(caption, kernel_sets)
+
+            backend.kernel_sets[kernel_set_id] = int(kernel_sets[0])
+
+        return backend.kernel_sets[kernel_set_id]
+
+    def _payload(self, backend, payload):
+        """Calculation payload with the kernel sets of an API."""
+        if 'kernels' not in payload:
+            return payload
+
+        return {**payload, 'kernels': [
+            {**kernel, 'id': self._kernel_set_id(backend, kernel['id'])}
+            if kernel.get('type') == 'KERNEL_SET' else kernel
+            for kernel in payload['kernels']
+        ]}
+
+    def _observe(self, backend, phase):
+        """Record the queue depth reported on a submission."""
+        with self._lock:
+            backend.queue = (phase.position or 0) if phase.phase is Phase.QUEUED else 0
+
+    def _done(self, route):
+        """Stop counting a calculation in flight (once)."""
+        if route.running:
+            route.running = False
+            route.backend.in_flight -= 1
+
+    def _complete(self, calculation_id):
+        """Stop counting a complete calculation in flight (its route is kept)."""
+        with self._lock:
+            route = self._routes.get(calculation_id)
+            if route is not None:
+                self._done(route)
+
+    def _release(self, calculation_id):
+        """Release a calculation route."""
+        with self._lock:
+            route = self._routes.pop(calculation_id, None)
+            if route is not None:
+                self._done(route)
+
+    def _expire(self):
+        """Release the routes older than ``ttl`` (abandoned calculations)."""
+        now = time.monotonic()
+        for calculation_id, route in list(self._routes.items()):
+            if now - route.created > self.ttl:
+                del self._routes[calculation_id]
+                self._done(route)
+
+    def _route(self, calculation_id):
+        """API running a calculation."""
+        with self._lock:
+            route = self._routes.get(calculation_id)
+        return route.backend if route is not None else self._backends[0]
+
+    def _forward(self, method, calculation_id, *args):
+        """Send a final calculation request to its API and release its route.
+
+        The route is kept on the transient failures (the request
+        can be sent again to the same API).
+
+        """
+        backend = self._route(calculation_id)
+        try:
+            result = getattr(backend.api, method)(calculation_id, *args)
+        except (requests.exceptions.RequestException, CircuitOpen):
+            raise
+        except Exception:
+            self._release(calculation_id)
+            raise
+
+        self._release(calculation_id)
+        return result
+
+    def new_calculation(self, payload):
+        """Submit a new calculation on the best available API.
+
+        See: :py:func:`webgeocalc.Api.new_calculation`.
+
+        Raises
+        ------
+        APIUnavailable
+            If no compatible API is available.
+
+        """
+        error = None
+        for backend in self._candidates():
+            try:
+                backend_payload = self._payload(backend, payload)
+                start = time.perf_counter()
+                calculation_id, phase = backend.api.new_calculation(backend_payload)
+            except (KernelSetNotFound, TooManyKernelSets):
+                continue
+            except CircuitOpen as err:
+                error = err
+                continue
+            except requests.exceptions.RequestException as err:
+                if not server_failure(err):
+                    raise
+                error = err
+                with self._lock:
+                    backend.down_until = time.monotonic() + self.cooldown
+                continue
+
+            with self._lock:
+                self._expire()
+                backend.observe(time.perf_counter() - start, self.smoothing)
+                backend.in_flight += 1
+                self._routes[calculation_id] = _Route(backend)
+
+            self._observe(backend, phase)
+            return calculation_id, phase
+
+        raise APIUnavailable(str(self)) from error
+
+    def phase_calculation(self, calculation_id):
+        """Gets the phase of a calculation on its API.
+
+        See: :py:func:`webgeocalc.Api.phase_calculation`.
+
+        """
+        backend = self._route(calculation_id)
+        calculation_id, phase = backend.api.phase_calculation(calculation_id)
+
+        if phase.phase.failed:
+            self._release(calculation_id)
+        elif phase.phase is Phase.COMPLETE:
+            self._complete(calculation_id)
+
+        return calculation_id, phase
+
+    def cancel_calculation(self, calculation_id):
+        """Cancels a calculation on its API.
+
+        See: :py:func:`webgeocalc.Api.cancel_calculation`.
+
+        """
+        return self._forward('cancel_calculation', calculation_id)
+
+    def results_calculation(self, calculation_id):
+        """Gets the results of a calculation on its API.
+
+        See: :py:func:`webgeocalc.Api.results_calculation`.
+
+        """
+        return self._forward('results_calculation', calculation_id)
+
+    def stream_results(self, calculation_id, chunk_size=65536):
+        """Stream the results of a calculation from its API.
+
+        See: :py:func:`webgeocalc.Api.stream_results`.
+
+        """
+        return self._forward('stream_results', calculation_id, chunk_size)
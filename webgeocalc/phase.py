@@ -0,0 +1,165 @@
+"""Webgeocalc calculation phases."""
+
+import time
+from enum import Enum
+
+from .vars import CALCULATION_FAILED_PHASES
+
+
+class Phase(str, Enum):
+    """Calculation phase enum."""
+
+    NOT_SUBMITTED = 'NOT SUBMITTED'
+    QUEUED = 'QUEUED'
+    STARTING = 'STARTING'
+    LOADING_KERNELS = 'LOADING_KERNELS'
+    CALCULATING = 'CALCULATING'
+    COMPLETE = 'COMPLETE'
+    FAILED = 'FAILED'
+    CANCELLED = 'CANCELLED'
+    DISPATCHED = 'DISPATCHED'
+    EXPIRED = 'EXPIRED'
+    UNKNOWN = 'UNKNOWN'
+
+    def __str__(self):
+        return self.value
+
+    @classmethod
+    def _missing_(cls, value):
+        return cls.UNKNOWN
+
+    @property
+    def failed(self):
+        """Calculation failed phase (see ``CALCULATION_FAILED_PHASES``)."""
+        return self.value in CALCULATION_FAILED_PHASES
+
+
+def _phase_str(phase, position, raw=None):
+    """Phase string representation with its queue position.
+
+    The unknown phases are represented with their raw API phase name.
+
+    """
+    if phase is Phase.QUEUED and position is not None:
+        return f'{phase} | POSITION: {position}'
+    if phase is Phase.UNKNOWN and raw:
+        return raw
+    return str(phase)
+
+
+class CalculationPhase(str):
+    """Calculation phase returned by the API.
+
+    Behave like the phase string (``'QUEUED | POSITION: 6'``) but also
+    provide the structured phase enum, the queue position and the progress.
+    A phase unknown by :py:class:`Phase` is ``UNKNOWN`` but keeps its
+    ``raw`` API name (used in its string representation).
+
+    Parameters
+    ----------
+    phase: str or Phase
+        Calculation phase name.
+    position: int, optional
+        Position in the queue (only for ``QUEUED`` calculations).
+    progress: float, optional
+        Calculation progress (if reported by the API).
+
+    """
+
+    def __new__(cls, phase, position=None, progress=None):
+        """Create the phase string with its structured attributes."""
+        raw = str(phase)
+        phase = Phase(phase)
+        obj = super().__new__(cls, _phase_str(phase, position, raw))
+        obj.phase = phase
+        obj.raw = raw
+        obj.position = position
+        obj.progress = progress
+        return obj
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self}'
+
+    @classmethod
+    def from_result(cls, result):
+        """Create the phase from the ``result`` of an API JSON response."""
+        return cls(result['phase'], position=result.get('position'),
+                   progress=result.get('progress'))
+
+
+class CalculationStatus:
+    """Structured calculation status.
+
+    Track the phase enum, the queue position and the progress of a calculation
+    and the (monotonic clock) timestamps of each phase transition.
+
+    """
+
+    def __init__(self):
+        self.phase = Phase.NOT_SUBMITTED
+        self.raw = str(self.phase)
+        self.position = None
+        self.progress = None
+        self.transitions = [(self.phase, time.monotonic())]
+
+    def __str__(self):
+        return _phase_str(self.phase, self.position, self.raw)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self}'
+
+    @property
+    def complete(self):
+        """Calculation complete phase."""
+        return self.phase is Phase.COMPLETE
+
+    @property
+    def failed(self):
+        """Calculation failed phase."""
+        return self.phase.failed
+
+    def update(self, phase):
+        """Update the calculation status.
+
+        Parameters
+        ----------
+        phase: str, Phase or CalculationPhase
+            New calculation phase.
+
+        """
+        if not isinstance(phase, CalculationPhase):
+            phase = CalculationPhase(phase)
+
+        if phase.phase is not self.phase:
+            self.transitions.append((phase.phase, time.monotonic()))
+
+        self.phase = phase.phase
+        self.raw = phase.raw
+        self.position = phase.position
+        self.progress = phase.progress
+
+    def duration(self, phase):
+        """Time spent (in seconds) in a phase.
+
+        If the calculation is still in this phase, the duration
+        is counted up to now.
+
+        Parameters
+        ----------
+        phase: str or Phase
+            Phase name.
+
+        Returns
+        -------
+        float
+            Cumulated duration of the phase (``0`` if never reached).
+
+        """
+        phase = Phase(phase)
+        ends = [t for _, t in self.transitions[1:]] + [time.monotonic()]
+
+        return sum(
+            end - start
+            for (name, start), end in zip(self.transitions, ends)
+            if name is phase
+        )
@@ -0,0 +1,190 @@
+"""Webgeocalc shared calculations poller."""
+
+import threading
+import time
+from concurrent import futures
+
+from .errors import CalculationFailed, CircuitOpen
+from .polling import Polling
+
+
+class _Watched:
+    """Calculation watched by the poller."""
+
+    def __init__(self, calculation, future, polling):
+        self.calculation = calculation
+        self.future = future
+        self.polling = polling
+        self.due = time.monotonic()
+
+
+class Poller:
+    """Background poller shared by the in-flight calculations.
+
+    A single background thread updates the phase of all the watched
+    calculations, instead of one polling loop per calculation.
+    Each calculation is updated according to its own adaptive
+    :py:class:`~webgeocalc.polling.Polling` policy and the thread
+    only wakes up when the next updates are due.
+    The updates due at the same time are sent with a small pool
+    of workers (re-using the pooled connections of each API).
+    While the circuit breaker of an API is open, the updates of its
+    calculations are deferred (up to their time out).
+
+    The thread is started when the first calculation is watched
+    and stops when no calculation remains in flight.
+
+    Parameters
+    ----------
+    interval: float, optional
+        Maximum sleep duration (in seconds) between two updates
+        of a running calculation.
+    workers: int, optional
+        Maximum number of concurrent phase requests in a polling round.
+
+    """
+
+    def __init__(self, interval=1, workers=4):
+        self.interval = interval
+        self.workers = workers
+        self._watched = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {len(self)} calculation(s) in flight'
+
+    def __len__(self):
+        with self._lock:
+            return len(self._watched)
+
+    def watch(self, calculation, timeout=30, callback=None):
+        """Watch a calculation until its results are available.
+
+        The calculation is submitted first if it was not already.
+
+        Parameters
+        ----------
+        calculation: webgeocalc.Calculation
+            Calculation to watch.
+        timeout: int, optional
+            Time out (in seconds) of the calculation.
+        callback: callable, optional
+            Function called with the future when the calculation is done.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future resolved with the calculation results once its phase
+            is ``COMPLETE``. It holds a
+            :py:class:`~webgeocalc.errors.CalculationFailed` error if the
+            phase ends in ``CALCULATION_FAILED_PHASES``, a
+            :py:class:`~webgeocalc.errors.CalculationTimeOut` error after
+            the timeout or the error raised during the updates (API errors,
+            unexpected responses...).
+
+        Raises
+        ------
+        IOError
+            If the calculation submission failed.
+
+        """
+        if calculation.id is None:
+            calculation.submit()
+
+        future = futures.Future()
+        future.set_running_or_notify_cancel()
+
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        with self._lock:
+            self._watched.append(
+                _Watched(calculation, future, Polling(timeout=timeout,
+                                                      sleep=self.interval))
+            )
+            self._wakeup.set()
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name='webgeocalc-poller', daemon=True)
+                self._thread.start()
+
+        return future
+
+    def _loop(self):
+        """Background thread (the pending futures are failed if it crashes)."""
+        try:
+            self._rounds()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            with self._lock:
+                for watched in self._watched:
+                    if not watched.future.done():
+                        watched.future.set_exception(err)
+                self._watched = []
+        finally:
+            # Let the next watched calculation start a new thread
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _rounds(self):
+        """Polling loop of the background thread."""
+        with futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                with self._lock:
+                    self._wakeup.clear()
+                    self._watched = [
+                        watched for watched in self._watched
+                        if not watched.future.done()
+                    ]
+                    if not self._watched:
+                        self._thread = None
+                        return
+
+                    now = time.monotonic()
+                    due = [watched for watched in self._watched if watched.due <= now]
+                    wait = min(watched.due for watched in self._watched) - now
+
+                if due:
+                    list(executor.map(self._poll, due))
+                else:
+                    self._wakeup.wait(wait)
+
+    @staticmethod
+    def _poll(watched):
+        """Update a calculation phase and resolve its future if done."""
+        calculation, future = watched.calculation, watched.future
+        try:
+            status = calculation.status
+
+            if not status.complete:
+                calculation.update()
+                status = calculation.status
+
+            if status.complete:
+                future.set_result(calculation.results)
+
+            elif status.failed:
+                future.set_exception(CalculationFailed(calculation.phase))
+
+            else:
+                watched.due = time.monotonic() + watched.polling.delay(status)
+
+        except CircuitOpen as err:
+            # API outage: defer the update until the circuit is probed again
+            # (not immediately while a half-open probe is still in flight)
+            if watched.polling.remaining > 0:
+                watched.due = time.monotonic() + min(max(err.retry_in, 0.1),
+                                                     watched.polling.remaining)
+            else:
+                future.set_exception(err)
+
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            # API errors, unexpected responses or failing hooks
+            future.set_exception(err)
+
+
+# Process-wide poller
+POLLER = Poller()
@@ -0,0 +1,112 @@
+"""Webgeocalc calculation polling policy."""
+
+import random
+import time
+
+from .errors import CalculationTimeOut
+from .phase import Phase
+
+
+class Polling:
+    """Adaptive and deadline-based polling policy of a calculation.
+
+    The calculation is polled quickly after its submission, then the
+    delay between each update grows exponentially (with a random jitter)
+    up to :py:attr:`sleep`. While the calculation is ``QUEUED``, the delay
+    is also scaled to its queue position and can grow up to
+    :py:attr:`max_queued`. The backoff restarts on every phase change.
+
+    The time out is a real deadline based on a monotonic clock.
+
+    Parameters
+    ----------
+    timeout: float, optional
+        Time out (in seconds) after the creation of the policy.
+    sleep: float, optional
+        Maximum delay (in seconds) between two updates of a running calculation.
+    initial: float, optional
+        First delay (in seconds) after each phase change.
+    factor: float, optional
+        Exponential backoff growth factor.
+    jitter: float, optional
+        Relative random jitter applied on each delay.
+    per_position: float, optional
+        Minimal delay (in seconds) per position in the queue.
+    max_queued: float, optional
+        Maximum delay (in seconds) between two updates of a queued calculation.
+
+    """
+
+    def __init__(self, timeout=30, sleep=1, initial=0.1, factor=2, jitter=0.1,
+                 per_position=0.5, max_queued=10):
+        self.timeout = timeout
+        self.sleep = sleep
+        self.initial = min(initial, sleep)
+        self.factor = factor
+        self.jitter = jitter
+        self.per_position = per_position
+        self.max_queued = max(max_queued, sleep)
+
+        self.deadline = time.monotonic() + timeout
+        self.attempts = 0
+        self._phase = None
+        self._step = 0
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}> {self.attempts} attempt(s) '
+                f'({self.remaining:.3f} s remaining)')
+
+    @property
+    def remaining(self):
+        """Remaining time (in seconds) before the deadline."""
+        return max(self.deadline - time.monotonic(), 0)
+
+    def check(self):
+        """Check that the deadline is not reached yet.
+
+        Raises
+        ------
+        CalculationTimeOut
+            If the deadline is reached.
+
+        """
+        if self.remaining <= 0:
+            raise CalculationTimeOut(self.timeout, attempts=self.attempts)
+
+    def delay(self, status):
+        """Delay before the next update of a calculation.
+
+        Parameters
+        ----------
+        status: webgeocalc.phase.CalculationStatus or webgeocalc.phase.CalculationPhase
+            Current calculation phase and queue position.
+
+        Returns
+        -------
+        float
+            Delay (in seconds), bounded by the remaining time before the deadline.
+
+        Raises
+        ------
+        CalculationTimeOut
+            If the deadline is reached.
+
+        """
+        self.attempts += 1
+        self.check()
+
+        if status.phase is not self._phase:
+            self._phase, self._step = status.phase, 0
+
+        delay = self.initial * self.factor ** self._step
+        self._step += 1
+
+        if status.phase is Phase.QUEUED:
+            position = status.position or 0
+            delay = min(max(delay, position * self.per_position), self.max_queued)
+        else:
+            delay = min(delay, self.sleep)
+
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)  # nosec B311
+
+        return min(delay, self.remaining)
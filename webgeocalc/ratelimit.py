@@ -0,0 +1,67 @@
+"""Webgeocalc API requests rate limiter."""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket rate limiter.
+
+    The bucket holds up to :py:attr:`burst` tokens and is refilled
+    at :py:attr:`rate` tokens per second. Each request consumes a token
+    and waits for it if the bucket is empty. The tokens are reserved
+    in the order of the requests, the limiter can be shared by any
+    number of threads.
+
+    Parameters
+    ----------
+    rate: float
+        Sustained number of requests per second.
+    burst: int, optional
+        Maximum number of requests sent at once after an idle period.
+
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError(f'Rate must be positive: {rate}')
+
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self.rate} req/s (burst: {self.burst})'
+
+    def reserve(self):
+        """Reserve a token.
+
+        Returns
+        -------
+        float
+            Delay (in seconds) before the token is available.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.tokens + (now - self._last) * self.rate, self.burst)
+            self._last = now
+
+            self.tokens -= 1
+            return max(-self.tokens / self.rate, 0)
+
+    def acquire(self):
+        """Wait for a token.
+
+        Returns
+        -------
+        float
+            Time waited (in seconds).
+
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
@@ -0,0 +1,166 @@
+"""Webgeocalc API requests retry policy."""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from urllib3.exceptions import NewConnectionError
+
+
+def _not_sent(error):
+    """Check if the request failed before reaching the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class Retry:
+    """Retry policy of the transient API failures.
+
+    The failed requests are sent again after an exponential
+    backoff (with a random jitter). The ``Retry-After`` header
+    of the API response takes precedence when it is provided.
+
+    The idempotent requests (``GET``: phase updates, results and
+    catalogs) are retried on connection errors, time outs and on the
+    transient HTTP errors (:py:attr:`statuses`). The other requests
+    (``POST: /calculation/new``) are retried conservatively, only when the
+    server did not receive them (connection not established) or explicitly
+    refused them (:py:attr:`unsafe_statuses`), to never submit
+    a calculation twice.
+
+    Parameters
+    ----------
+    total: int, optional
+        Maximum number of retries per request (``0`` to disable the retries).
+    backoff: float, optional
+        First retry delay (in seconds).
+    factor: float, optional
+        Exponential backoff growth factor.
+    max_backoff: float, optional
+        Maximum retry delay (in seconds), including the ``Retry-After`` delays.
+    jitter: float, optional
+        Relative random jitter applied on each backoff delay.
+    statuses: tuple, optional
+        HTTP status codes retried for the idempotent requests.
+    unsafe_statuses: tuple, optional
+        HTTP status codes retried for the non-idempotent requests.
+
+    """
+
+    IDEMPOTENT = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, total=3, backoff=0.5, factor=2, max_backoff=30, jitter=0.1,
+                 statuses=(429, 502, 503, 504), unsafe_statuses=(429,)):
+        self.total = total
+        self.backoff = backoff
+        self.factor = factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+        self.unsafe_statuses = unsafe_statuses
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> total: {self.total}'
+
+    def retryable(self, method, attempt, response=None, error=None):
+        """Check if a failed request can be retried.
+
+        Parameters
+        ----------
+        method: str
+            HTTP method.
+        attempt: int
+            Number of retries already performed.
+        response: requests.Response, optional
+            API response (if received).
+        error: requests.exceptions.RequestException, optional
+            Request error (if no response was received).
+
+        Returns
+        -------
+        bool
+            ``True`` if the request can be sent again.
+
+        """
+        if attempt >= self.total:
+            return False
+
+        idempotent = method.upper() in self.IDEMPOTENT
+
+        if response is not None:
+            statuses = self.statuses if idempotent else self.unsafe_statuses
+            return response.status_code in statuses
+
+        if idempotent:
+            return isinstance(error, (requests.exceptions.ConnectionError,
+                                      requests.exceptions.Timeout))
+
+        return _not_sent(error)
+
+    def delay(self, attempt, response=None):
+        """Delay before the next retry.
+
+        Parameters
+        ----------
+        attempt: int
+            Number of retries already performed.
+        response: requests.Response, optional
+            API response with an optional ``Retry-After`` header.
+
+        Returns
+        -------
+        float
+            Delay (in seconds), bounded by :py:attr:`max_backoff`.
+
+        """
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        delay = self.backoff * self.factor ** attempt
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)  # nosec B311
+
+        return min(delay, self.max_backoff)
+
+    @staticmethod
+    def retry_after(response):
+        """Parse the ``Retry-After`` response header.
+
+        Parameters
+        ----------
+        response: requests.Response or None
+            API response.
+
+        Returns
+        -------
+        float or None
+            Delay (in seconds) requested by the server (``None`` if not provided).
+
+        """
+        if response is None:
+            return None
+
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        return max(date.timestamp() - time.time(), 0)
+
+
+# Default retry policy
+RETRY = Retry()
@@ -0,0 +1,137 @@
+"""Webgeocalc API requests statistics."""
+
+import re
+import threading
+
+
+# Latency histogram buckets upper bounds (in seconds)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float('inf'))
+
+
+def endpoint(url):
+    """Normalized API endpoint of a request URL.
+
+    The calculations and kernel sets ids are replaced by ``{id}``
+    to track the requests of each endpoint together.
+
+    Parameters
+    ----------
+    url: str
+        Request URL (relative to the API root URL).
+
+    Returns
+    -------
+    str
+        API endpoint (eg. ``/calculation/{id}/results``).
+
+    Example
+    -------
+    >>> endpoint('/calculation/0788aba2-d4e5-4028-9ef1-4867ad5385e0/results')
+    '/calculation/{id}/results'
+
+    """
+    if url == '/calculation/new':
+        return url
+
+    url = re.sub(r'^/calculation/[^/]+', '/calculation/{id}', url)
+    return re.sub(r'^/kernel-set/[^/]+', '/kernel-set/{id}', url)
+
+
+class EndpointStats:
+    """Requests statistics of an API endpoint."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latency = 0
+        self.min_latency = None
+        self.max_latency = None
+        self.histogram = [0] * len(LATENCY_BUCKETS)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self.count} request(s)'
+
+    def record(self, latency, nbytes=0, error=False, retry=False):
+        """Record a request."""
+        self.count += 1
+        self.errors += bool(error)
+        self.retries += bool(retry)
+        self.bytes += nbytes
+        self.latency += latency
+        self.min_latency = latency if self.min_latency is None \
+            else min(self.min_latency, latency)
+        self.max_latency = latency if self.max_latency is None \
+            else max(self.max_latency, latency)
+
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.histogram[i] += 1
+                break
+
+    def as_dict(self):
+        """Statistics summary."""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'latency': {
+                'total': self.latency,
+                'mean': self.latency / self.count if self.count else None,
+                'min': self.min_latency,
+                'max': self.max_latency,
+            },
+            'histogram': dict(zip(LATENCY_BUCKETS, self.histogram)),
+        }
+
+
+class ApiStats:
+    """Requests statistics of an API, per endpoint.
+
+    Each HTTP request sent to the API (including the retries)
+    is recorded with its latency, response size and outcome.
+    The statistics can be shared by multiple threads.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {len(self._endpoints)} endpoint(s)'
+
+    def record(self, url, latency, nbytes=0, error=False, retry=False):
+        """Record a request.
+
+        Parameters
+        ----------
+        url: str
+            Request URL (relative to the API root URL).
+        latency: float
+            Request duration (in seconds).
+        nbytes: int, optional
+            Response size (in bytes).
+        error: bool, optional
+            Failed request (connection error or HTTP error).
+        retry: bool, optional
+            Retried request.
+
+        """
+        key = endpoint(url)
+        with self._lock:
+            if key not in self._endpoints:
+                self._endpoints[key] = EndpointStats()
+            self._endpoints[key].record(latency, nbytes=nbytes, error=error, retry=retry)
+
+    def as_dict(self):
+        """Statistics summary of each endpoint."""
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self._endpoints.items()}
+
+    def reset(self):
+        """Reset all the statistics."""
+        with self._lock:
+            self._endpoints = {}
@@ -0,0 +1,365 @@
+"""Webgeocalc local API stand-in server (for tests and load tests)."""
+
+import heapq
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+API_PATH = '/webgeocalc/api'
+
+KERNEL_SETS = [{
+    'caption': 'Solar System Kernels',
+    'sclkId': '0',
+    'description': 'Generic kernels for planets, satellites, and some asteroids.',
+    'kernelSetId': '1',
+    'missionId': 'gen',
+}, {
+    'caption': 'Cassini Huygens',
+    'sclkId': '-82',
+    'description': 'Archived CASSINI kernels covering from 1997-10-15 to 2017-09-15.',
+    'kernelSetId': '5',
+    'missionId': 'cassini',
+}]
+
+CATALOGS = {
+    'bodies': ('BodyData', [
+        {'id': 10, 'name': 'SUN'},
+        {'id': 399, 'name': 'EARTH'},
+        {'id': 606, 'name': 'TITAN'},
+        {'id': -82, 'name': 'CASSINI'},
+    ]),
+    'frames': ('FrameData', [
+        {'id': 1, 'name': 'J2000', 'centerBodyID': 0, 'frameClass': 1},
+        {'id': 10044, 'name': 'IAU_TITAN', 'centerBodyID': 606, 'frameClass': 2},
+    ]),
+    'instruments': ('InstrumentData', [
+        {'id': -82360, 'name': 'CASSINI_ISS_NAC'},
+        {'id': -82361, 'name': 'CASSINI_ISS_WAC'},
+    ]),
+}
+
+COLUMNS = [
+    {'name': 'UTC calendar date', 'type': 'DATE', 'outputID': 'DATE', 'units': ''},
+    {'name': 'Distance (km)', 'type': 'NUMBER', 'outputID': 'DISTANCE', 'units': 'km'},
+]
+
+
+class _Calculation:
+    """Calculation submitted to the local server."""
+
+    def __init__(self, index, start, failed):
+        self.id = str(uuid.uuid4())
+        self.index = index
+        self.start = start
+        self.failed = failed
+        self.cancelled = False
+
+
+class LocalServer:
+    """Local WebGeoCalc API stand-in server.
+
+    Serve the WebGeoCalc API endpoints (metadata, kernel sets, bodies,
+    frames, instruments and calculations) from an in-process threaded
+    HTTP server, to test and load test the clients without any remote API.
+
+    The calculations are processed in their submission order by
+    a fixed number of simulated ``workers``. The extra calculations
+    wait ``QUEUED`` (with their queue position), then each calculation
+    goes through the ``phases`` (``phase_duration`` seconds each) before
+    being ``COMPLETE`` (or ``FAILED``).
+
+    Parameters
+    ----------
+    host: str, optional
+        Server host.
+    port: int, optional
+        Server port (a free port is used by default).
+    workers: int, optional
+        Number of calculations processed at once.
+    max_queue: int, optional
+        Maximum number of queued calculations. When the queue is full,
+        the submissions are rejected with a ``429`` response (not limited
+        by default).
+    phases: tuple, optional
+        Phases of the running calculations.
+    phase_duration: float, optional
+        Duration (in seconds) of each phase.
+    latency: float, optional
+        Latency (in seconds) added to each response.
+    failure_rate: float, optional
+        Fraction of the calculations ending ``FAILED``.
+    error_rate: float, optional
+        Fraction of the requests rejected with a transient ``503`` response.
+    rows: int, optional
+        Number of rows in the calculations results.
+    seed: int, optional
+        Random seed of the failures and errors.
+
+    Example
+    -------
+    >>> with LocalServer(workers=8, rows=1_000) as server:  # doctest: +SKIP
+    ...     api = Api(server.url)
+    ...     run_many([StateVector(api=api, ...) for _ in range(10_000)])
+
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, workers=4, max_queue=None,
+                 phases=('STARTING', 'LOADING_KERNELS', 'CALCULATING'),
+                 phase_duration=0.01, latency=0, failure_rate=0, error_rate=0,
+                 rows=1, seed=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.phases = phases
+        self.phase_duration = phase_duration
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.error_rate = error_rate
+        self.rows = rows
+
+        self.calculations = {}
+        self.requests = 0
+
+        self._random = random.Random(seed)  # nosec B311
+        self._lock = threading.Lock()
+        self._starts = []
+        self._free = [0.0] * workers
+        self._results = None
+
+        self.httpd = ThreadingHTTPServer((host, port), _handler(self))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self.url}'
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def url(self):
+        """API root URL."""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}{API_PATH}'
+
+    def start(self):
+        """Start the server in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                            kwargs={'poll_interval': 0.05}, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    @property
+    def duration(self):
+        """Processing duration of a calculation (in seconds)."""
+        return len(self.phases) * self.phase_duration
+
+    def _queued(self, now):
+        """Index of the first calculation not started."""
+        return bisect_right(self._starts, now)
+
+    def submit(self):
+        """Submit a new calculation.
+
+        Returns
+        -------
+        _Calculation or None
+            New calculation (``None`` if the queue is full).
+
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if self.max_queue is not None and \
+                    len(self._starts) - self._queued(now) >= self.max_queue:
+                return None
+
+            start = max(now, heapq.heappop(self._free))
+            heapq.heappush(self._free, start + self.duration)
+
+            calculation = _Calculation(len(self._starts), start,
+                                       self._random.random() < self.failure_rate)
+            self._starts.append(start)
+            self.calculations[calculation.id] = calculation
+
+        return calculation
+
+    def phase(self, calculation):
+        """Current phase of a calculation.
+
+        Returns
+        -------
+        dict
+            Calculation ``result`` (``phase`` and ``position`` if ``QUEUED``).
+
+        """
+        now = time.monotonic()
+
+        if calculation.cancelled:
+            return {'phase': 'CANCELLED'}
+
+        if now < calculation.start:
+            with self._lock:
+                position = calculation.index - self._queued(now) + 1
+            return {'phase': 'QUEUED', 'position': position}
+
+        step = int((now - calculation.start) / self.phase_duration) \
+            if self.phase_duration > 0 else len(self.phases)
+
+        if step < len(self.phases):
+            return {'phase': self.phases[step], 'progress': step / len(self.phases)}
+
+        return {'phase': 'FAILED' if calculation.failed else 'COMPLETE'}
+
+    def results(self):
+        """Calculations results columns and rows."""
+        if self._results is None:
+            self._results = {
+                'columns': COLUMNS,
+                'rows': [
+                    [f'2000-01-01 00:00:{i % 60:02d}.000000 UTC', 1e6 + i]
+                    for i in range(self.rows)
+                ],
+            }
+        return self._results
+
+    def error(self):
+        """Random transient error."""
+        with self._lock:
+            self.requests += 1
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+
+def _ok(**data):
+    """API successful response."""
+    return {'status': 'OK', 'message': 'The request was successful.', **data}
+
+
+def _err(description):
+    """API error response."""
+    return {'status': 'ERROR', 'error': {'shortDescription': description}}
+
+
+# API endpoints (method, path pattern and handler)
+ROUTES = (
+    ('GET', r'/?', 'metadata'),
+    ('GET', r'/kernel-sets', 'kernel_sets'),
+    ('GET', r'/kernel-set/(\d+)/(bodies|frames|instruments)', 'catalog'),
+    ('POST', r'/calculation/new', 'new'),
+    ('GET', r'/calculation/([^/]+?)(/cancel|/results)?', 'calculation'),
+)
+
+
+def _handler(server):  # noqa: C901
+    """Build the HTTP requests handler of a local server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        """Local WebGeoCalc API requests handler."""
+
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+        wbufsize = -1  # Headers and body sent at once (flushed by the handler)
+
+        def reply(self, data, status=200, headers=None):
+            """Send a JSON response."""
+            body = json.dumps(data).encode('utf-8')
+
+            if server.latency:
+                time.sleep(server.latency)
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def route(self, method):
+            """Route a request to its endpoint."""
+            if method == 'POST':
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+            if server.error():
+                return self.reply(_err('Service unavailable'), status=503)
+
+            path = self.path.removeprefix(API_PATH)
+
+            for route_method, pattern, name in ROUTES:
+                match = re.fullmatch(pattern, path)
+                if route_method == method and match:
+                    return getattr(self, name)(*match.groups())
+
+            return self.reply(_err('Not found'), status=404)
+
+        def metadata(self):
+            """API metadata."""
+            return self.reply({'version': 'local', 'build_id': 'local'})
+
+        def kernel_sets(self):
+            """Kernel sets catalog."""
+            return self.reply(_ok(resultType='KernelSetDetails', items=KERNEL_SETS))
+
+        def catalog(self, _, catalog):
+            """Kernel set bodies, frames or instruments catalog."""
+            result_type, items = CATALOGS[catalog]
+            return self.reply(_ok(resultType=result_type, items=items))
+
+        def new(self):
+            """Submit a new calculation."""
+            calculation = server.submit()
+            if calculation is None:
+                return self.reply(_err('Too many calculations queued'), status=429,
+                                  headers={'Retry-After': '1'})
+
+            return self.reply(_ok(calculationId=calculation.id,
+                                  result=server.phase(calculation)))
+
+        def calculation(self, calculation_id, action):
+            """Calculation phase, cancellation or results."""
+            calculation = server.calculations.get(calculation_id)
+            if calculation is None:
+                return self.reply(_err('Calculation not found'), status=404)
+
+            if action == '/cancel':
+                calculation.cancelled = True
+
+            result = server.phase(calculation)
+
+            if action != '/results':
+                return self.reply(_ok(calculationId=calculation.id, result=result))
+
+            if result['phase'] != 'COMPLETE':
+                return self.reply(_err(f"Calculation phase: {result['phase']}"))
+
+            return self.reply(_ok(calculationId=calculation.id, **server.results()))
+
+        def do_GET(self):  # noqa: N802  # pylint: disable=invalid-name
+            """GET requests."""
+            self.route('GET')
+
+        def do_POST(self):  # noqa: N802  # pylint: disable=invalid-name
+            """POST requests."""
+            self.route('POST')
+
+        def log_message(self, *_):  # pylint: disable=arguments-differ
+            """Silent logs."""
+
+    return Handler
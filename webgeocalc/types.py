@@ -1,6 +1,9 @@
 """WebGeoCalc columns and results types."""
 
+from collections.abc import Sequence
+
 from .errors import ResultAttributeError, ResultTypeError
+from .index import Index
 
 
 def get_type(classname):
@@ -10,11 +13,34 @@ def get_type(classname):
     return TYPES[classname]
 
 
-class ColumnResult:
-    """Column result generic object."""
+_KEYS = {}
+_NO_EXTRA = {}
+
+
+class _Record:
+    """Compact record of a JSON object.
+
+    The known :py:attr:`FIELDS` of each type are stored in ``__slots__``
+    (direct attributes, without any ``__dict__``). The other JSON fields
+    (if any) are kept in a small ``dict``, and the keys order is stored in
+    a tuple shared by all the records with the same keys.
+
+    """
+
+    __slots__ = ('_keys', '_extra')
+    FIELDS = ()
 
     def __init__(self, json):
-        self._json = json
+        extra = {}
+        for key, value in json.items():
+            if key in self.FIELDS:
+                setattr(self, key, value)
+            else:
+                extra[key] = value
+
+        keys = tuple(json)
+        self._keys = _KEYS.setdefault(keys, keys)
+        self._extra = extra or _NO_EXTRA
 
     def __str__(self):
         return self.name
@@ -23,28 +49,42 @@ class ColumnResult:
         return f"<{self.__class__.__name__}> {str(self)}"
 
     def __getattr__(self, attr):
-        if attr not in self._json.keys():
+        # Only called for the missing fields and the extra JSON fields
+        if attr.startswith('_') or attr not in self._extra:
             raise ResultAttributeError(self, attr)
-        return self._json[attr]
+        return self._extra[attr]
 
     def keys(self):
         """JSON keys."""
-        return self._json.keys()
+        return self._keys
 
     def values(self):
         """JSON values."""
-        return self._json.values()
+        return tuple(getattr(self, key) for key in self._keys)
 
     def items(self):
         """JSON items."""
-        return self._json.items()
+        return tuple(zip(self._keys, self.values()))
 
 
-class ResultType(ColumnResult):
+class ColumnResult(_Record):
+    """Column result generic object."""
+
+    __slots__ = FIELDS = ('name', 'type', 'units', 'outputID')
+
+
+class ResultType(_Record):
     """Result Type object for item generic interface."""
 
+    __slots__ = ()
+    ID_FIELD = 'id'
+    NAME_FIELD = 'name'
+
+    def __str__(self):
+        return getattr(self, self.NAME_FIELD)
+
     def __int__(self):
-        return int(self.id)
+        return int(getattr(self, self.ID_FIELD))
 
     def __repr__(self):
         return f"<{self.__class__.__name__}> {str(self)} (id: {int(self)})"
@@ -59,23 +99,100 @@ class ResultType(ColumnResult):
 class KernelSetDetails(ResultType):
     """Kernel set details."""
 
-    def __int__(self):
-        return int(self.kernelSetId)
-
-    def __str__(self):
-        return self.caption
+    __slots__ = FIELDS = ('caption', 'sclkId', 'description', 'kernelSetId', 'missionId')
+    ID_FIELD = 'kernelSetId'
+    NAME_FIELD = 'caption'
 
 
 class BodyData(ResultType):
     """Body data."""
 
+    __slots__ = FIELDS = ('id', 'name')
+
 
 class FrameData(ResultType):
     """Frame data."""
 
+    __slots__ = FIELDS = ('id', 'name', 'centerBodyID', 'frameClass')
+
 
 class InstrumentData(ResultType):
     """Instrument data."""
 
+    __slots__ = FIELDS = ('id', 'name')
+
+
+class ResultItems(Sequence):
+    """Lazy sequence of API items.
+
+    The items objects are only created when they are accessed
+    (and then kept). The :py:attr:`lookup` index is built
+    on the raw JSON items, without creating all the objects.
+
+    Parameters
+    ----------
+    dtype: type
+        Items type (:obj:`ResultType` subclass).
+    items: [dict]
+        JSON items.
+
+    """
+
+    __hash__ = None
+
+    def __init__(self, dtype, items):
+        self.dtype = dtype
+        self._json = items
+        self._items = [None] * len(items)
+        self._lookup = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __len__(self):
+        return len(self._json)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self.dtype(self._json[index])
+        return item
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, ResultItems)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    @property
+    def lookup(self):
+        """Items lookup index (built on the first access)."""
+        if self._lookup is None:
+            self._lookup = Index(self, keys=(
+                (int(item[self.dtype.ID_FIELD]), str(item[self.dtype.NAME_FIELD]))
+                for item in self._json
+            ))
+        return self._lookup
+
+    def find(self, key):
+        """Find items by ``id`` or ``name``.
+
+        See: :py:func:`webgeocalc.index.Index.find`.
+
+        Parameters
+        ----------
+        key: int or str
+            Item ``id`` or (partial) ``name``.
+
+        Returns
+        -------
+        [webgeocalc.types.ResultType]
+            List of matching items.
+
+        """
+        return self.lookup.find(key)
+
 
 TYPES = globals()